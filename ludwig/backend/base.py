@@ -16,19 +16,37 @@
 
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from typing import Union
 
 from ludwig.data.cache.manager import CacheManager
-from ludwig.data.dataframe.pandas import PANDAS
+from ludwig.data.dataframe.pandas import MultiprocessingEngine, PANDAS, PandasEngine
 from ludwig.data.dataset.base import DatasetManager
 from ludwig.data.dataset.pandas import PandasDatasetManager
 from ludwig.models.ecd import ECD
+from ludwig.utils.misc_utils import get_from_registry
 from ludwig.utils.torch_utils import initialize_pytorch
 
+_local_engine_registry = {
+    "pandas": PandasEngine,
+    "multiprocessing": MultiprocessingEngine,
+}
+
+
+def get_local_df_engine(processor=None):
+    if processor is None:
+        return PANDAS
+
+    processor_kwargs = processor.copy()
+    dtype = processor_kwargs.pop("type", "pandas")
+    engine_cls = get_from_registry(dtype, _local_engine_registry)
+
+    return engine_cls(**processor_kwargs)
+
 
 class Backend(ABC):
-    def __init__(self, dataset_manager: DatasetManager, cache_dir: str = None):
+    def __init__(self, dataset_manager: DatasetManager, cache_dir: str = None, cache_max_size: Union[int, str] = None):
         self._dataset_manager = dataset_manager
-        self._cache_manager = CacheManager(self._dataset_manager, cache_dir)
+        self._cache_manager = CacheManager(self._dataset_manager, cache_dir, cache_max_size)
 
     @property
     def cache(self):
@@ -84,9 +102,11 @@ class Backend(ABC):
 
 
 class LocalPreprocessingMixin:
+    _df_engine = PANDAS
+
     @property
     def df_engine(self):
-        return PANDAS
+        return self._df_engine
 
     @property
     def supports_multiprocessing(self):
@@ -132,8 +152,12 @@ class RemoteTrainingMixin:
 
 
 class LocalBackend(LocalPreprocessingMixin, LocalTrainingMixin, Backend):
-    def __init__(self, **kwargs):
-        super().__init__(dataset_manager=PandasDatasetManager(self), **kwargs)
+    def __init__(self, processor=None, hdf5_chunk_cache_size=None, cache_format="hdf5", **kwargs):
+        dataset_manager = PandasDatasetManager(
+            self, hdf5_chunk_cache_size=hdf5_chunk_cache_size, cache_format=cache_format
+        )
+        super().__init__(dataset_manager=dataset_manager, **kwargs)
+        self._df_engine = get_local_df_engine(processor)
 
     def initialize(self):
         pass
@@ -16,7 +16,7 @@
 
 import time
 
-from ludwig.backend.base import Backend, LocalPreprocessingMixin
+from ludwig.backend.base import Backend, get_local_df_engine, LocalPreprocessingMixin
 from ludwig.data.dataset.pandas import PandasDatasetManager
 from ludwig.models.ecd import ECD
 from ludwig.models.predictor import Predictor
@@ -26,8 +26,12 @@ from ludwig.utils.torch_utils import initialize_pytorch
 
 
 class HorovodBackend(LocalPreprocessingMixin, Backend):
-    def __init__(self, **kwargs):
-        super().__init__(dataset_manager=PandasDatasetManager(self), **kwargs)
+    def __init__(self, processor=None, hdf5_chunk_cache_size=None, cache_format="hdf5", **kwargs):
+        dataset_manager = PandasDatasetManager(
+            self, hdf5_chunk_cache_size=hdf5_chunk_cache_size, cache_format=cache_format
+        )
+        super().__init__(dataset_manager=dataset_manager, **kwargs)
+        self._df_engine = get_local_df_engine(processor)
         self._horovod = None
 
     def initialize(self):
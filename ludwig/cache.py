@@ -0,0 +1,104 @@
+#! /usr/bin/env python
+# Copyright (c) 2022 Predibase, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import argparse
+import datetime
+import logging
+import sys
+from typing import List
+
+from ludwig.data.cache.manager import CACHE_LOCK_FILE, CacheManager
+from ludwig.globals import LUDWIG_VERSION
+from ludwig.utils.fs_utils import file_lock
+from ludwig.utils.print_utils import logging_level_registry, print_ludwig
+
+logger = logging.getLogger(__name__)
+
+
+def _format_size(size: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def list_cache(cache_dir: str) -> List[dict]:
+    """Lists the entries of a cache directory, most recently used first."""
+    with file_lock(cache_dir, lock_file=CACHE_LOCK_FILE):
+        entries = CacheManager(None, cache_dir).list_entries(cache_dir)
+
+    for entry in entries:
+        last_access = datetime.datetime.fromtimestamp(entry["last_access"]).isoformat(sep=" ", timespec="seconds")
+        logger.info(f"{entry['key']}\t{_format_size(entry['size'])}\t{last_access}\t{len(entry['files'])} files")
+    logger.info(f"Total: {_format_size(sum(entry['size'] for entry in entries))} in {len(entries)} entries")
+    return entries
+
+
+def prune_cache(cache_dir: str, max_size: str) -> List[dict]:
+    """Evicts the least recently used entries of a cache directory until it fits in `max_size`."""
+    with file_lock(cache_dir, lock_file=CACHE_LOCK_FILE):
+        evicted = CacheManager(None, cache_dir).evict(cache_dir, max_size)
+
+    logger.info(f"Evicted {_format_size(sum(entry['size'] for entry in evicted))} in {len(evicted)} entries")
+    return evicted
+
+
+def cli(sys_argv):
+    parser = argparse.ArgumentParser(
+        description="This command inspects and prunes a directory of preprocessed data caches.",
+        prog="ludwig cache",
+        usage="%(prog)s [options]",
+    )
+    sub_parsers = parser.add_subparsers(dest="command", help="list and prune cache entries")
+
+    parser_list = sub_parsers.add_parser("list", help="list cache entries, most recently used first")
+    parser_list.add_argument("cache_dir", help="cache directory")
+
+    parser_prune = sub_parsers.add_parser("prune", help="evict the least recently used cache entries")
+    parser_prune.add_argument("cache_dir", help="cache directory")
+    parser_prune.add_argument(
+        "-s",
+        "--max_size",
+        required=True,
+        help="size the cache directory is pruned to, in bytes or with a K, M, G or T suffix, 0 to clear it",
+    )
+
+    parser.add_argument(
+        "-l",
+        "--logging_level",
+        default="info",
+        help="the level of logging to use",
+        choices=["critical", "error", "warning", "info", "debug", "notset"],
+    )
+
+    args = parser.parse_args(sys_argv)
+
+    logging.getLogger("ludwig").setLevel(logging_level_registry[args.logging_level])
+    global logger
+    logger = logging.getLogger("ludwig.cache")
+
+    print_ludwig(f"Cache {args.command}", LUDWIG_VERSION)
+
+    if args.command == "list":
+        list_cache(args.cache_dir)
+    elif args.command == "prune":
+        prune_cache(args.cache_dir, args.max_size)
+    else:
+        raise ValueError(f"Unrecognized command: {args.command}")
+
+
+if __name__ == "__main__":
+    cli(sys.argv[1:])
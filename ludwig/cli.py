@@ -60,6 +60,7 @@ Available sub-commands:
    synthesize_dataset    Creates synthetic data for testing purposes
    init_config           Initialize a user config from a dataset and targets
    render_config         Renders the fully populated config with all defaults set
+   cache                 Lists and prunes the entries of a preprocessed data cache directory
 """,
         )
         parser.add_argument("command", help="Subcommand to run")
@@ -163,6 +164,11 @@ Available sub-commands:
 
         datasets.cli(sys.argv[2:])
 
+    def cache(self):
+        from ludwig import cache
+
+        cache.cli(sys.argv[2:])
+
 
 def main():
     ludwig.contrib.preload(sys.argv)
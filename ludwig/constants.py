@@ -134,6 +134,7 @@ RAY = "ray"
 PROC_COLUMN = "proc_column"
 
 CHECKSUM = "checksum"
+DATASET_CHECKSUM = "dataset_checksum"
 
 HDF5 = "hdf5"
 PARQUET = "parquet"
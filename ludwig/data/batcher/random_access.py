@@ -13,17 +13,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import collections
 import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+import numpy as np
+import torch
 
 from ludwig.data.batcher.base import Batcher
 
 
 class RandomAccessBatcher(Batcher):
-    def __init__(self, dataset, sampler, batch_size=128, ignore_last=False):
+    def __init__(self, dataset, sampler, batch_size=128, ignore_last=False, prefetch_batches=0, pin_memory=False):
         # store our dataset as well
         self.dataset = dataset
         self.sampler = sampler
-        self.sample_it = iter(self.sampler)
+
+        # when prefetching, the next `prefetch_batches` batches are assembled by a
+        # background thread pool while the current batch is being consumed
+        self.prefetch_batches = prefetch_batches
+        # batches are only pinned by the prefetching threads: on the main thread
+        # pinning is just an extra synchronous copy
+        self.pin_memory = pin_memory and prefetch_batches > 0
+        self.executor = ThreadPoolExecutor(max_workers=prefetch_batches) if prefetch_batches > 0 else None
+        self.pending = collections.deque()
 
         self.ignore_last = ignore_last
         self.batch_size = batch_size
@@ -31,22 +45,20 @@ class RandomAccessBatcher(Batcher):
         self.steps_per_epoch = self._compute_steps_per_epoch()
         self.index = 0
         self.step = 0
+        self.batch_it = self.sampler.iter_batches(self.batch_size)
 
     def next_batch(self):
         if self.last_batch():
             raise StopIteration()
 
-        indices = []
-        for _ in range(self.batch_size):
-            try:
-                indices.append(next(self.sample_it))
-                self.index += 1
-            except StopIteration:
-                break
-
-        sub_batch = {}
-        for features_name in self.dataset.features:
-            sub_batch[features_name] = self.dataset.get(features_name, indices)
+        if self.executor is None:
+            sub_batch = self._fetch_batch(next(self.batch_it))
+        else:
+            self._prefetch()
+            sub_batch = self.pending.popleft().result()
+            # schedule the following batches before handing this one to the caller
+            self._prefetch()
+        self.index += min(self.batch_size, self.total_size - self.index)
 
         self.step += 1
         return sub_batch
@@ -60,7 +72,49 @@ class RandomAccessBatcher(Batcher):
         self.index = 0
         self.step = 0
         self.sampler.set_epoch(epoch)
-        self.sample_it = iter(self.sampler)
+        self._cancel_pending()
+        self.batch_it = self.sampler.iter_batches(self.batch_size)
+
+    def close(self):
+        """Stops the background prefetching threads, if any."""
+        if self.executor is not None:
+            self._cancel_pending()
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def _fetch_batch(self, indices):
+        # indices is either a slice or an array of indices, so each feature is fetched
+        # with a single slicing / fancy indexing operation rather than row by row
+        sub_batch = {}
+        for features_name in self.dataset.features:
+            sub_batch[features_name] = self.dataset.get(features_name, indices)
+            if self.pin_memory:
+                sub_batch[features_name] = _to_pinned_memory(sub_batch[features_name])
+        return sub_batch
+
+    def _prefetch(self):
+        while len(self.pending) < self.prefetch_batches:
+            indices = next(self.batch_it, None)
+            if indices is None:
+                break
+            self.pending.append(self.executor.submit(self._fetch_batch, indices))
+
+    def _cancel_pending(self):
+        while self.pending:
+            self.pending.popleft().cancel()
 
     def _compute_steps_per_epoch(self):
         return int(math.ceil(self.total_size / self.batch_size))
+
+
+def _to_pinned_memory(array: np.ndarray) -> Union[torch.Tensor, np.ndarray]:
+    """Copies the array into a page-locked tensor so the host to device copy can be done with DMA.
+
+    The tensor itself is returned rather than a NumPy view of it, so that its memory is not reused by the pinned memory
+    allocator while a non-blocking copy from it is still in flight. Arrays of types not supported by torch (e.g.
+    strings) are returned unchanged.
+    """
+    try:
+        return torch.from_numpy(np.ascontiguousarray(array)).pin_memory()
+    except TypeError:
+        return array
@@ -1,28 +1,104 @@
 import logging
 import os
 import re
+import time
 import uuid
 from pathlib import Path
+from typing import Dict, List, Optional, Union
 
-from ludwig.constants import CHECKSUM, META, TEST, TRAINING, VALIDATION
-from ludwig.data.cache.util import calculate_checksum
+import pandas as pd
+from fsspec.implementations.local import LocalFileSystem
+
+from ludwig.constants import CHECKSUM, META, NAME, TEST, TRAINING, VALIDATION
+from ludwig.data.cache.util import (
+    calculate_checksum,
+    calculate_dataset_checksum,
+    calculate_feature_checksum,
+    get_row_preprocessing,
+)
 from ludwig.utils import data_utils
-from ludwig.utils.fs_utils import delete, path_exists
+from ludwig.utils.fs_utils import delete, get_fs_and_path, makedirs, open_file, path_exists
+from ludwig.utils.misc_utils import hash_dict
 
 logger = logging.getLogger(__name__)
 
+# Lock file guarding a cache directory against concurrent preprocessing and pruning
+CACHE_LOCK_FILE = ".lock_preprocessing"
+
+# Marker file of the directories dedicated to the cache, the only ones entries are evicted from
+CACHE_DIR_MARKER = ".ludwig_cache"
+
+# Files written to a dedicated cache directory, named after the key of their entry: the checksum of the dataset and
+# config, or a random uuid for in-memory datasets
+CACHE_FILE_PATTERN = re.compile(
+    r"^(?P<key>\w{22}|[0-9a-f]{32})\."
+    rf"(?:{META}\.json|(?:{TRAINING}|{VALIDATION}|{TEST})\.(?:hdf5|npy|parquet)"
+    r"|feature_meta\.json|feature_data\.(?:hdf5|npy))$"
+)
+
+# Column of the feature cache data holding the index of the rows the processed columns belong to
+FEATURE_INDEX_COLUMN = "__index__"
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
 
 def alphanum(v):
     """Filters a string to only its alphanumeric characters."""
     return re.sub(r"\W+", "", v)
 
 
+def parse_size(size: Union[int, str]) -> int:
+    """Returns a number of bytes given as an integer or as a string like "500M" or "20GB"."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", size, flags=re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Invalid size {size}, expected a number of bytes optionally followed by K, M, G or T")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def touch(paths):
+    """Marks cache files as just accessed.
+
+    On local file systems the access time is updated, leaving the modification time untouched. Other file systems
+    do not track accesses, so their files keep their modification time as last access.
+    """
+    now = time.time()
+    for path in paths:
+        fs, fs_path = get_fs_and_path(path)
+        if isinstance(fs, LocalFileSystem):
+            os.utime(fs_path, (now, os.stat(fs_path).st_mtime))
+
+
+def mark_cache_directory(cache_dir):
+    """Marks a directory as dedicated to the cache, allowing its entries to be evicted."""
+    makedirs(cache_dir, exist_ok=True)
+    marker_fp = os.path.join(cache_dir, CACHE_DIR_MARKER)
+    if not path_exists(marker_fp):
+        with open_file(marker_fp, "w"):
+            pass
+
+
+def is_cache_directory(cache_dir):
+    return path_exists(os.path.join(cache_dir, CACHE_DIR_MARKER))
+
+
+def _get_last_access(fs, path):
+    if isinstance(fs, LocalFileSystem):
+        stat = os.stat(path)
+        return max(stat.st_atime, stat.st_mtime)
+    return fs.modified(path).timestamp()
+
+
 class DatasetCache:
-    def __init__(self, config, checksum, cache_map, dataset_manager):
+    def __init__(self, config, checksum, cache_map, dataset_manager, dataset_checksum=None, cache_dir=None):
         self.config = config
         self.checksum = checksum
         self.cache_map = cache_map
         self.dataset_manager = dataset_manager
+        self.dataset_checksum = dataset_checksum
+        # directory dedicated to the cache the entry is written to, if any
+        self.cache_dir = cache_dir
 
     def get(self):
         training_set_metadata_fp = self.cache_map[META]
@@ -38,10 +114,15 @@ class DatasetCache:
         cached_validation_set = self.cache_map[VALIDATION] if path_exists(self.cache_map[VALIDATION]) else None
 
         valid = self.checksum == cache_training_set_metadata.get(CHECKSUM) and cached_training_set is not None
+        if valid:
+            touch(fname for fname in self.cache_map.values() if path_exists(fname))
 
         return valid, cache_training_set_metadata, cached_training_set, cached_test_set, cached_validation_set
 
     def put(self, training_set, test_set, validation_set, training_set_metadata):
+        if self.cache_dir is not None:
+            mark_cache_directory(self.cache_dir)
+
         logger.info("Writing preprocessed training set cache")
         training_set = self.dataset_manager.save(
             self.cache_map[TRAINING],
@@ -83,10 +164,88 @@ class DatasetCache:
                 delete(fname, recursive=True)
 
 
+class FeatureCache:
+    """Cache of the metadata and processed columns of individual features of a dataset.
+
+    Entries are keyed by the checksum of the raw dataset and of everything that determines how a single feature is
+    preprocessed, so that a config change only forces the features it actually touches to be preprocessed again.
+    Metadata is looked up first, while building the metadata of the dataset, and the processed columns of the features
+    that hit are then loaded while building the data. They are stored in the cache format of the datasets, in a
+    directory dedicated to the cache, so that entries are evicted along with the dataset entries.
+    """
+
+    def __init__(self, dataset_checksum, cache_dir, data_format="hdf5"):
+        self.dataset_checksum = dataset_checksum
+        self.cache_dir = cache_dir
+        self.data_format = data_format
+        self._keys = {}
+        self._hits = set()
+
+    def get_metadata(self, feature_config, preprocessing_parameters, feature_configs, global_preprocessing_parameters):
+        """Returns the cached metadata of the feature, or None on a miss.
+
+        The preprocessing of the other `feature_configs` and the global preprocessing parameters are part of the key as
+        far as they change the rows the feature is built from.
+        """
+        row_preprocessing = get_row_preprocessing(feature_config, feature_configs, global_preprocessing_parameters)
+        key = calculate_feature_checksum(
+            self.dataset_checksum, feature_config, preprocessing_parameters, row_preprocessing
+        )
+        self._keys[feature_config[NAME]] = key
+
+        metadata_fp, data_fp = self._get_cache_paths(key)
+        if not path_exists(metadata_fp) or not path_exists(data_fp):
+            return None
+
+        logger.info(f"Using cached preprocessed data for feature {feature_config[NAME]}")
+        self._hits.add(feature_config[NAME])
+        touch([metadata_fp, data_fp])
+        return data_utils.load_json(metadata_fp)
+
+    def get_data(self, feature_config):
+        """Returns the cached processed columns of a feature whose metadata was found in the cache."""
+        if feature_config[NAME] not in self._hits:
+            return None
+
+        _, data_fp = self._get_cache_paths(self._keys[feature_config[NAME]])
+        if self.data_format == "npy":
+            data = data_utils.from_numpy_dataset(data_utils.load_numpy_columns(data_fp, mmap_mode=None))
+        else:
+            data = data_utils.load_hdf5(data_fp)
+        data = data.set_index(FEATURE_INDEX_COLUMN).rename_axis(None)
+        return {column: data[column] for column in data.columns}
+
+    def put(self, feature_config, feature_metadata, proc_cols):
+        if feature_config[NAME] not in self._keys or feature_config[NAME] in self._hits:
+            return
+
+        metadata_fp, data_fp = self._get_cache_paths(self._keys[feature_config[NAME]])
+        makedirs(self.cache_dir, exist_ok=True)
+        # the index is kept to align the columns with the rows of the other features when loading them
+        data = pd.DataFrame(proc_cols)
+        data[FEATURE_INDEX_COLUMN] = data.index
+        if self.data_format == "npy":
+            data_utils.save_numpy_columns(data_fp, data)
+        else:
+            data_utils.save_hdf5(data_fp, data)
+        # the metadata is written last, as it marks the entry as complete
+        data_utils.save_json(metadata_fp, feature_metadata)
+
+    def _get_cache_paths(self, key):
+        stem = os.path.join(self.cache_dir, alphanum(key))
+        data_ext = "npy" if self.data_format == "npy" else "hdf5"
+        return f"{stem}.feature_meta.json", f"{stem}.feature_data.{data_ext}"
+
+
 class CacheManager:
-    def __init__(self, dataset_manager, cache_dir=None):
+    def __init__(self, dataset_manager, cache_dir=None, max_size=None):
         self._dataset_manager = dataset_manager
         self._cache_dir = cache_dir
+        self._max_size = parse_size(max_size) if max_size is not None else None
+        if self._max_size is not None and cache_dir is None:
+            # without a cache_dir, processed data is written next to the raw datasets, which are never evicted
+            logger.warning("The maximum size of the cache only applies to a dedicated cache_dir, ignoring it")
+            self._max_size = None
 
     def get_dataset_cache(self, config, dataset=None, training_set=None, test_set=None, validation_set=None):
         if dataset is not None:
@@ -97,7 +256,8 @@ class CacheManager:
                 TEST: self.get_cache_path(dataset, key, TEST),
                 VALIDATION: self.get_cache_path(dataset, key, VALIDATION),
             }
-            return DatasetCache(config, key, cache_map, self._dataset_manager)
+            dataset_checksum = self.get_dataset_checksum(config, dataset)
+            return DatasetCache(config, key, cache_map, self._dataset_manager, dataset_checksum, self._cache_dir)
         else:
             key = self.get_cache_key(training_set, config)
             cache_map = {
@@ -106,7 +266,23 @@ class CacheManager:
                 TEST: self.get_cache_path(test_set, key, TEST),
                 VALIDATION: self.get_cache_path(validation_set, key, VALIDATION),
             }
-            return DatasetCache(config, key, cache_map, self._dataset_manager)
+            dataset_checksum = self.get_dataset_checksum(config, training_set, validation_set, test_set)
+            return DatasetCache(config, key, cache_map, self._dataset_manager, dataset_checksum, self._cache_dir)
+
+    def get_feature_cache(self, dataset_checksum):
+        # features are only cached in a dedicated cache_dir, where their entries are evicted like the datasets
+        if dataset_checksum is None or self._cache_dir is None:
+            return None
+        return FeatureCache(dataset_checksum, self._cache_dir, self.data_format)
+
+    def get_dataset_checksum(self, config, *datasets):
+        """Returns a checksum of the contents of the dataset files, or None if any dataset is held in memory."""
+        if not all(dataset is None or isinstance(dataset, str) for dataset in datasets):
+            return None
+        checksums = [
+            calculate_dataset_checksum(dataset, config) if dataset is not None else None for dataset in datasets
+        ]
+        return hash_dict(checksums, max_length=None).decode("ascii")
 
     def get_cache_key(self, dataset, config):
         if not isinstance(dataset, str):
@@ -143,3 +319,68 @@ class CacheManager:
     @property
     def data_format(self):
         return self._dataset_manager.data_format
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def list_entries(self, cache_dir: str) -> List[Dict]:
+        """Returns the entries of a cache directory, most recently used first.
+
+        An entry groups the files sharing a cache key, with their total size in bytes and the last time any of them
+        was accessed.
+        """
+        fs, path = get_fs_and_path(cache_dir)
+        if not fs.exists(path):
+            return []
+
+        entries = {}
+        for file_info in fs.ls(path, detail=True):
+            file_path = file_info["name"]
+            match = CACHE_FILE_PATTERN.match(os.path.basename(file_path.rstrip("/")))
+            if match is None:
+                continue
+
+            size = fs.du(file_path) if file_info["type"] == "directory" else file_info["size"]
+            last_access = _get_last_access(fs, file_path)
+            entry = entries.setdefault(match.group("key"), {"key": match.group("key"), "files": [], "size": 0})
+            entry["files"].append(os.path.join(cache_dir, os.path.basename(file_path.rstrip("/"))))
+            entry["size"] += size
+            entry["last_access"] = max(entry.get("last_access", last_access), last_access)
+
+        return sorted(entries.values(), key=lambda entry: entry["last_access"], reverse=True)
+
+    def evict(self, cache_dir: str, max_size: Optional[Union[int, str]] = None, keep=()) -> List[Dict]:
+        """Deletes the least recently used entries of a cache directory until it fits in `max_size` bytes.
+
+        Defaults to the maximum size of this cache manager, in which case nothing is evicted if it is unbounded. Entries
+        holding any of the files in `keep` are never evicted. Only directories dedicated to the cache, as marked when it
+        writes to them, can be evicted from. Callers are expected to hold the lock of the directory. Returns the evicted
+        entries.
+        """
+        max_size = parse_size(max_size) if max_size is not None else self._max_size
+        if max_size is None:
+            return []
+        if not is_cache_directory(cache_dir):
+            raise ValueError(
+                f"Refusing to evict files from {cache_dir}, which is not a cache directory: only directories "
+                f"configured as cache_dir, holding a {CACHE_DIR_MARKER} file, are evicted from"
+            )
+
+        keep = {os.path.basename(fname) for fname in keep}
+        entries = self.list_entries(cache_dir)
+        total_size = sum(entry["size"] for entry in entries)
+
+        evicted = []
+        for entry in reversed(entries):
+            if total_size <= max_size:
+                break
+            if any(os.path.basename(fname) in keep for fname in entry["files"]):
+                continue
+
+            logger.info(f"Evicting cache entry {entry['key']} ({entry['size']} bytes) from {cache_dir}")
+            for fname in entry["files"]:
+                delete(fname, recursive=True)
+            total_size -= entry["size"]
+            evicted.append(entry)
+        return evicted
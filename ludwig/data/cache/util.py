@@ -1,17 +1,146 @@
+import hashlib
+
+import numpy as np
+
 import ludwig
-from ludwig.constants import NAME, PREPROCESSING, TYPE
-from ludwig.utils.fs_utils import checksum
-from ludwig.utils.misc_utils import hash_dict
+from ludwig.constants import COLUMN, DROP_ROW, NAME, PREPROCESSING, PROC_COLUMN, TYPE
+from ludwig.utils.fs_utils import checksum, get_fs_and_path
+from ludwig.utils.misc_utils import get_from_registry, hash_dict
+
+PARQUET_MAGIC = b"PAR1"
+
+
+def _update_with_file_blocks(h, f, size, num_blocks, block_size):
+    if size <= num_blocks * block_size:
+        h.update(f.read())
+        return
+
+    for offset in np.linspace(0, size - block_size, num_blocks, dtype=np.int64):
+        f.seek(int(offset))
+        h.update(f.read(block_size))
+
+
+def _update_with_parquet_footer(h, f, size):
+    """Hashes the footer of a Parquet file, which holds its schema, row counts and column chunk statistics.
+
+    Returns False if the file is not a Parquet file.
+    """
+    if size < 12:
+        return False
+    f.seek(size - 8)
+    tail = f.read(8)
+    footer_length = int.from_bytes(tail[:4], "little")
+    if tail[4:] != PARQUET_MAGIC or footer_length > size - 12:
+        return False
+    f.seek(size - 8 - footer_length)
+    h.update(f.read(footer_length))
+    return True
+
+
+def fingerprint(url, num_blocks=16, block_size=64 * 1024):
+    """Returns a cheap checksum of a file, or of all the files of a directory.
+
+    Combines the size and modification time of each file with the hash of its footer for Parquet files, or of
+    `num_blocks` evenly spaced blocks of `block_size` bytes otherwise, so that only a small bounded portion of each
+    file is read.
+    """
+    fs, path = get_fs_and_path(url)
+    paths = sorted(fs.find(path)) if fs.isdir(path) else [path]
+
+    h = hashlib.md5()
+    for file_path in paths:
+        size = fs.size(file_path)
+        try:
+            modified = fs.modified(file_path)
+        except (NotImplementedError, AttributeError):
+            modified = None
+        h.update(f"{file_path}:{size}:{modified}".encode())
+
+        with fs.open(file_path, "rb") as f:
+            if not _update_with_parquet_footer(h, f, size):
+                f.seek(0)
+                _update_with_file_blocks(h, f, size, num_blocks, block_size)
+    return h.hexdigest()
+
+
+def full_checksum(url, block_size=16 * 1024 * 1024):
+    """Returns the hash of the whole content of a file, or of all the files of a directory."""
+    fs, path = get_fs_and_path(url)
+    paths = sorted(fs.find(path)) if fs.isdir(path) else [path]
+
+    h = hashlib.md5()
+    for file_path in paths:
+        with fs.open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+# Ways of computing the checksum of raw datasets, selected by the `cache_checksum`
+# global preprocessing parameter:
+#   - metadata: file system metadata of the file (size, modification time, etag)
+#   - fingerprint: file metadata and a hash of a bounded sample of the content
+#   - full: hash of the whole content
+dataset_checksum_registry = {
+    "metadata": checksum,
+    "fingerprint": fingerprint,
+    "full": full_checksum,
+}
+
+
+def calculate_dataset_checksum(dataset, config):
+    checksum_method = config.get("preprocessing", {}).get("cache_checksum", "metadata")
+    return get_from_registry(checksum_method, dataset_checksum_registry)(dataset)
 
 
 def calculate_checksum(original_dataset, config):
     features = config.get("input_features", []) + config.get("output_features", []) + config.get("features", [])
     info = {
         "ludwig_version": ludwig.globals.LUDWIG_VERSION,
-        "dataset_checksum": checksum(original_dataset),
+        "dataset_checksum": calculate_dataset_checksum(original_dataset, config),
         "global_preprocessing": config["preprocessing"],
         "feature_names": [feature[NAME] for feature in features],
         "feature_types": [feature[TYPE] for feature in features],
         "feature_preprocessing": [feature.get(PREPROCESSING, {}) for feature in features],
     }
     return hash_dict(info, max_length=None).decode("ascii")
+
+
+# global preprocessing parameters deciding which rows end up in each split of the dataset
+SPLIT_PREPROCESSING_PARAMETERS = ["force_split", "split_probabilities", "stratify"]
+
+
+def get_row_preprocessing(feature, features, global_preprocessing_parameters):
+    """Returns the preprocessing, global or of other features, that changes the rows a feature is built from.
+
+    Rows missing a value of a `drop_row` feature are dropped from the whole dataset, the split decides which rows go
+    to each subset, and features sharing a column fill its missing values before the feature reads it.
+    """
+
+    def merged_preprocessing(f):
+        return {**global_preprocessing_parameters.get(f[TYPE], {}), **f.get(PREPROCESSING, {})}
+
+    return {
+        "split": {name: global_preprocessing_parameters.get(name) for name in SPLIT_PREPROCESSING_PARAMETERS},
+        "drop_row_columns": sorted(
+            {f[COLUMN] for f in features if merged_preprocessing(f).get("missing_value_strategy") == DROP_ROW}
+        ),
+        "shared_column_preprocessing": [
+            [f[TYPE], merged_preprocessing(f)]
+            for f in features
+            if f[COLUMN] == feature[COLUMN] and f[PROC_COLUMN] != feature[PROC_COLUMN]
+        ],
+    }
+
+
+def calculate_feature_checksum(dataset_checksum, feature, preprocessing_parameters, row_preprocessing=None):
+    info = {
+        "ludwig_version": ludwig.globals.LUDWIG_VERSION,
+        "dataset_checksum": dataset_checksum,
+        "feature_column": feature[COLUMN],
+        "feature_type": feature[TYPE],
+        "feature_proc_column": feature[PROC_COLUMN],
+        "feature_preprocessing": preprocessing_parameters,
+        "row_preprocessing": row_preprocessing,
+    }
+    return hash_dict(info, max_length=None).decode("ascii")
@@ -13,11 +13,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
+import logging
+import multiprocessing
+import os
+import pickle
+
 import numpy as np
 import pandas as pd
 
 from ludwig.data.dataframe.base import DataFrameEngine
 
+logger = logging.getLogger(__name__)
+
 
 class PandasEngine(DataFrameEngine):
     def __init__(self, **kwargs):
@@ -71,3 +79,84 @@ class PandasEngine(DataFrameEngine):
 
 
 PANDAS = PandasEngine()
+
+
+def _map_values(map_fn, series):
+    return series.map(map_fn)
+
+
+def _apply_rows(apply_fn, df):
+    return df.apply(apply_fn, axis=1)
+
+
+def _is_picklable(obj):
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+class MultiprocessingEngine(PandasEngine):
+    """Pandas engine that splits series and dataframes into contiguous partitions mapped by a local process pool.
+
+    Each partition is pickled to a worker along with the map function, and the mapped partitions are concatenated
+    back in their original order. Workers are started with `forkserver` (or `spawn` where it is unavailable) rather
+    than forked, as forking once torch has started its thread pools can deadlock, and are kept until `close` is
+    called. Map functions that cannot be pickled, such as lambdas and closures, and inputs smaller than
+    `min_partition_size` rows per worker are processed serially.
+    """
+
+    def __init__(self, parallelism=None, min_partition_size=1000, **kwargs):
+        super().__init__(**kwargs)
+        self._parallelism = parallelism or os.cpu_count()
+        self._min_partition_size = min_partition_size
+        self._pool = None
+
+    def map_objects(self, series, map_fn, meta=None):
+        return self._map_partitions(series, functools.partial(_map_values, map_fn))
+
+    def map_partitions(self, series, map_fn, meta=None):
+        return self._map_partitions(series, map_fn)
+
+    def apply_objects(self, df, apply_fn, meta=None):
+        return self._map_partitions(df, functools.partial(_apply_rows, apply_fn))
+
+    def _map_partitions(self, data, map_fn):
+        num_partitions = min(self._parallelism, len(data) // max(self._min_partition_size, 1))
+        if num_partitions <= 1:
+            return map_fn(data)
+        if not _is_picklable(map_fn):
+            logger.debug(f"Mapping {map_fn} serially, as it cannot be pickled to the worker processes")
+            return map_fn(data)
+
+        bounds = np.linspace(0, len(data), num_partitions + 1, dtype=int)
+        partitions = [data.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        return pd.concat(self._get_pool().map(map_fn, partitions, chunksize=1))
+
+    def _get_pool(self):
+        if self._pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = multiprocessing.get_context(start_method).Pool(self._parallelism)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __getstate__(self):
+        # the worker processes stay with the engine they were started by
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    @property
+    def parallelism(self):
+        return self._parallelism
+
+    def set_parallelism(self, parallelism):
+        if parallelism and parallelism != self._parallelism:
+            self.close()
+            self._parallelism = parallelism
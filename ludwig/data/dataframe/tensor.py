@@ -0,0 +1,109 @@
+#! /usr/bin/env python
+# Copyright (c) 2022 Predibase, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, take
+from pandas.api.indexers import check_array_indexer
+from pandas.api.types import is_integer
+
+
+class TensorDtype(ExtensionDtype):
+    """Dtype of the pandas columns whose rows are the equally shaped entries of a single numpy array."""
+
+    _metadata = ("shape", "element_dtype")
+    kind = "O"
+    type = np.ndarray
+
+    def __init__(self, shape, element_dtype):
+        self.shape = tuple(shape)
+        self.element_dtype = np.dtype(element_dtype)
+
+    @property
+    def name(self):
+        return f"tensor[{self.element_dtype}, {self.shape}]"
+
+    @classmethod
+    def construct_array_type(cls):
+        return TensorArray
+
+
+class TensorArray(ExtensionArray):
+    """Pandas column backed by an array of shape (N, ...), whose rows are the column values.
+
+    Columns like in-memory images keep their preallocated array through the preprocessing, so that it is handed
+    to the dataset as is instead of being stacked back from a column of separate arrays.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        if values.ndim < 1:
+            raise ValueError(f"TensorArray needs an array with at least one dimension, got shape {values.shape}")
+        self._tensor = values
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(scalars, TensorArray):
+            values = scalars._tensor
+        else:
+            values = np.stack([np.asarray(scalar) for scalar in scalars])
+        if isinstance(dtype, TensorDtype):
+            values = values.astype(dtype.element_dtype, copy=False)
+        return cls(values.copy() if copy else values)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        raise NotImplementedError("TensorArray does not support factorization")
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        return cls(np.concatenate([array._tensor for array in to_concat]))
+
+    @property
+    def dtype(self):
+        return TensorDtype(self._tensor.shape[1:], self._tensor.dtype)
+
+    @property
+    def nbytes(self):
+        return self._tensor.nbytes
+
+    def to_tensor(self):
+        """Returns the array of shape (N, ...) backing the column, without a copy."""
+        return self._tensor
+
+    def __len__(self):
+        return len(self._tensor)
+
+    def __getitem__(self, item):
+        if is_integer(item):
+            return self._tensor[item]
+        item = check_array_indexer(self, item)
+        return type(self)(self._tensor[item])
+
+    def __array__(self, dtype=None):
+        rows = np.empty(len(self), dtype=object)
+        rows[:] = list(self._tensor)
+        return rows if dtype is None else rows.astype(dtype)
+
+    def isna(self):
+        return np.zeros(len(self), dtype=bool)
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        indices = np.asarray(indices, dtype=np.intp)
+        if allow_fill and np.any(indices < 0):
+            raise ValueError("TensorArray cannot hold missing values")
+        return type(self)(take(self._tensor, indices, allow_fill=False))
+
+    def copy(self):
+        return type(self)(self._tensor.copy())
@@ -25,7 +25,16 @@ class Dataset(ABC):
 
     @contextlib.contextmanager
     @abstractmethod
-    def initialize_batcher(self, batch_size=128, should_shuffle=True, seed=0, ignore_last=False, horovod=None):
+    def initialize_batcher(
+        self,
+        batch_size=128,
+        should_shuffle=True,
+        seed=0,
+        ignore_last=False,
+        horovod=None,
+        prefetch_batches=0,
+        pin_memory=False,
+    ):
         raise NotImplementedError()
 
 
@@ -14,6 +14,8 @@
 # limitations under the License.
 # ==============================================================================
 import contextlib
+import os
+import threading
 
 import numpy as np
 
@@ -22,17 +24,46 @@ from ludwig.data.batcher.random_access import RandomAccessBatcher
 from ludwig.data.dataset.base import Dataset, DatasetManager
 from ludwig.data.sampler import DistributedSampler
 from ludwig.utils import data_utils
-from ludwig.utils.data_utils import DATA_TRAIN_HDF5_FP, to_numpy_dataset
-from ludwig.utils.fs_utils import download_h5
+from ludwig.utils.data_utils import DATA_TRAIN_HDF5_FP, NUMPY_HDF5_FNAME, read_hdf5_rows, to_numpy_dataset
+from ludwig.utils.fs_utils import open_h5, path_exists, rename
 from ludwig.utils.misc_utils import get_proc_features
 
+# Formats of the processed data cache: a single HDF5 file, or a directory of memory-mapped .npy files per column
+CACHE_FORMATS = {"hdf5", "npy"}
+
+
+class _MemoryMappedColumn:
+    """Stands in for a memory-mapped column when pickled, so that copies of a dataset sent to other processes map
+    the same file instead of carrying its content."""
+
+    def __init__(self, column: np.memmap):
+        self.filename = column.filename
+        self.mode = column.mode
+
+    def load(self) -> np.memmap:
+        return np.load(self.filename, mmap_mode=self.mode, allow_pickle=False)
+
 
 class PandasDataset(Dataset):
-    def __init__(self, dataset, features, data_hdf5_fp):
+    def __init__(self, dataset, features, data_hdf5_fp, hdf5_chunk_cache_size=None):
         self.features = features
         self.data_hdf5_fp = data_hdf5_fp
-        self.size = len(dataset)
-        self.dataset = to_numpy_dataset(dataset)
+        self.hdf5_chunk_cache_size = hdf5_chunk_cache_size
+        if isinstance(dataset, dict):
+            # numpy datasets, like the memory-mapped columns of the npy cache, are used as they are
+            self.size = len(next(iter(dataset.values()), []))
+            self.dataset = dataset
+        else:
+            self.size = len(dataset)
+            self.dataset = to_numpy_dataset(dataset)
+
+        # the HDF5 file of features that are not loaded in memory is opened
+        # lazily once per process and kept open across batches
+        self._h5_file = None
+        self._h5_pid = None
+        self._h5_lock = threading.Lock()
+        # the file is closed once the last batcher reading from it exits
+        self._num_batchers = 0
 
     def get(self, proc_column, idx=None):
         if idx is None:
@@ -42,22 +73,87 @@ class PandasDataset(Dataset):
             or PREPROCESSING not in self.features[proc_column]
             or "in_memory" not in self.features[proc_column]["preprocessing"]
         ):
-            return self.dataset[proc_column][idx]
+            return self._get_rows(proc_column, idx)
         if self.features[proc_column][PREPROCESSING]["in_memory"]:
-            return self.dataset[proc_column][idx]
+            return self._get_rows(proc_column, idx)
 
         sub_batch = self.dataset[proc_column][idx]
-
-        indices = np.empty((3, len(sub_batch)), dtype=np.int64)
-        indices[0, :] = sub_batch
-        indices[1, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[0])]
-
-        with download_h5(self.data_hdf5_fp) as h5_file:
-            im_data = h5_file[proc_column + "_data"][indices[0, :], :, :]
-        indices[2, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[1])]
-        return im_data[indices[2, :]]
+        return read_hdf5_rows(self._get_h5_file()[proc_column + "_data"], sub_batch)
+
+    def _get_rows(self, proc_column, idx):
+        rows = self.dataset[proc_column][idx]
+        if isinstance(rows, np.memmap):
+            # slices of memory-mapped columns are read-only views of the file, copy them into a regular batch
+            rows = np.array(rows)
+        return rows
+
+    def _get_h5_file(self):
+        with self._h5_lock:
+            # HDF5 handles cannot be shared with forked processes, so each
+            # process opens its own handle to the file
+            if self._h5_file is None or self._h5_pid != os.getpid():
+                kwargs = {}
+                if self.hdf5_chunk_cache_size is not None:
+                    kwargs["rdcc_nbytes"] = self.hdf5_chunk_cache_size
+                self._h5_file = open_h5(self.data_hdf5_fp, **kwargs)
+                self._h5_pid = os.getpid()
+            return self._h5_file
+
+    def close(self):
+        """Closes the HDF5 file of the features that are not loaded in memory, reopened if they are read again."""
+        with self._h5_lock:
+            self._close_h5_file()
+
+    def _close_h5_file(self):
+        # handles inherited from the process that forked this one are left to it
+        if self._h5_file is not None and self._h5_pid == os.getpid():
+            self._h5_file.close()
+        self._h5_file = None
+        self._h5_pid = None
+
+    def __del__(self):
+        if getattr(self, "_h5_file", None) is not None:
+            self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_h5_file"] = None
+        state["_h5_pid"] = None
+        state["_num_batchers"] = 0
+        del state["_h5_lock"]
+        state["dataset"] = {
+            column: _MemoryMappedColumn(data) if isinstance(data, np.memmap) and data.filename else data
+            for column, data in self.dataset.items()
+        }
+        return state
+
+    def __setstate__(self, state):
+        state["dataset"] = {
+            column: data.load() if isinstance(data, _MemoryMappedColumn) else data
+            for column, data in state["dataset"].items()
+        }
+        self.__dict__.update(state)
+        self._h5_lock = threading.Lock()
+
+    def to_memory_mapped(self, data_dir) -> "PandasDataset":
+        """Returns a copy of the dataset whose columns are memory-mapped from .npy files written to `data_dir`, so
+        that it is pickled as references to the files rather than with its content.
+
+        Columns that are already memory-mapped and columns of Python objects, which cannot be memory-mapped, are kept
+        as they are.
+        """
+        columns = {
+            column: data
+            for column, data in self.dataset.items()
+            if not isinstance(data, np.memmap) and data.dtype != object
+        }
+        if not columns:
+            return self
+        data_utils.save_numpy_columns(data_dir, columns)
+        dataset = {**self.dataset, **data_utils.load_numpy_columns(data_dir)}
+        return PandasDataset(
+            dataset, self.features, self.data_hdf5_fp, hdf5_chunk_cache_size=self.hdf5_chunk_cache_size
+        )
 
     def get_dataset(self):
         return self.dataset
@@ -66,20 +162,66 @@ class PandasDataset(Dataset):
         return self.size
 
     @contextlib.contextmanager
-    def initialize_batcher(self, batch_size=128, should_shuffle=True, seed=0, ignore_last=False, horovod=None):
+    def initialize_batcher(
+        self,
+        batch_size=128,
+        should_shuffle=True,
+        seed=0,
+        ignore_last=False,
+        horovod=None,
+        prefetch_batches=0,
+        pin_memory=False,
+    ):
         sampler = DistributedSampler(len(self), shuffle=should_shuffle, seed=seed, horovod=horovod)
-        batcher = RandomAccessBatcher(self, sampler, batch_size=batch_size, ignore_last=ignore_last)
-        yield batcher
+        batcher = RandomAccessBatcher(
+            self,
+            sampler,
+            batch_size=batch_size,
+            ignore_last=ignore_last,
+            prefetch_batches=prefetch_batches,
+            pin_memory=pin_memory,
+        )
+        with self._h5_lock:
+            self._num_batchers += 1
+        try:
+            yield batcher
+        finally:
+            batcher.close()
+            with self._h5_lock:
+                self._num_batchers -= 1
+                if self._num_batchers == 0:
+                    self._close_h5_file()
 
 
 class PandasDatasetManager(DatasetManager):
-    def __init__(self, backend):
+    def __init__(self, backend, hdf5_chunk_cache_size=None, cache_format="hdf5"):
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(f"Invalid cache format {cache_format}, expected one of {sorted(CACHE_FORMATS)}")
         self.backend = backend
+        self.hdf5_chunk_cache_size = hdf5_chunk_cache_size
+        self.cache_format = cache_format
 
     def create(self, dataset, config, training_set_metadata):
-        return PandasDataset(dataset, get_proc_features(config), training_set_metadata.get(DATA_TRAIN_HDF5_FP))
+        return PandasDataset(
+            dataset,
+            get_proc_features(config),
+            training_set_metadata.get(DATA_TRAIN_HDF5_FP),
+            hdf5_chunk_cache_size=self.hdf5_chunk_cache_size,
+        )
 
     def save(self, cache_path, dataset, config, training_set_metadata, tag):
+        if self.cache_format == "npy":
+            data_utils.save_numpy_columns(cache_path, dataset)
+            if tag == TRAINING:
+                # features that are not loaded in memory write their data to an HDF5 file next to the entry, which is
+                # moved in with the columns so that it is deleted and evicted along with them
+                data_hdf5_fp = os.path.join(cache_path, NUMPY_HDF5_FNAME)
+                side_hdf5_fp = os.path.splitext(cache_path)[0] + ".hdf5"
+                if path_exists(side_hdf5_fp):
+                    rename(side_hdf5_fp, data_hdf5_fp)
+                training_set_metadata[DATA_TRAIN_HDF5_FP] = data_hdf5_fp
+            return data_utils.load_numpy_columns(cache_path)
+
         data_utils.save_hdf5(cache_path, dataset)
         if tag == TRAINING:
             training_set_metadata[DATA_TRAIN_HDF5_FP] = cache_path
@@ -90,4 +232,4 @@ class PandasDatasetManager(DatasetManager):
 
     @property
     def data_format(self):
-        return "hdf5"
+        return self.cache_format
@@ -65,7 +65,16 @@ class RayDataset(Dataset):
         return pipe
 
     @contextlib.contextmanager
-    def initialize_batcher(self, batch_size=128, should_shuffle=True, seed=0, ignore_last=False, horovod=None):
+    def initialize_batcher(
+        self,
+        batch_size=128,
+        should_shuffle=True,
+        seed=0,
+        ignore_last=False,
+        horovod=None,
+        prefetch_batches=0,
+        pin_memory=False,
+    ):
         yield RayDatasetBatcher(
             self.ds.repeat().iter_datasets(),
             self.features,
@@ -121,7 +130,16 @@ class RayDatasetShard(Dataset):
         self.dataset_iter = dataset_shard.iter_datasets()
 
     @contextlib.contextmanager
-    def initialize_batcher(self, batch_size=128, should_shuffle=True, seed=0, ignore_last=False, horovod=None):
+    def initialize_batcher(
+        self,
+        batch_size=128,
+        should_shuffle=True,
+        seed=0,
+        ignore_last=False,
+        horovod=None,
+        prefetch_batches=0,
+        pin_memory=False,
+    ):
         yield RayDatasetBatcher(
             self.dataset_iter,
             self.features,
@@ -14,8 +14,9 @@
 # limitations under the License.
 # ==============================================================================
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -26,6 +27,7 @@ from ludwig.constants import (
     BFILL,
     CHECKSUM,
     COLUMN,
+    DATASET_CHECKSUM,
     DROP_ROW,
     FFILL,
     FILL_WITH_CONST,
@@ -33,6 +35,7 @@ from ludwig.constants import (
     FILL_WITH_MEAN,
     FILL_WITH_MODE,
     FULL,
+    META,
     NAME,
     NUMBER,
     PAD,
@@ -46,6 +49,7 @@ from ludwig.constants import (
     TYPE,
     VALIDATION,
 )
+from ludwig.data.cache.manager import CACHE_LOCK_FILE, FeatureCache
 from ludwig.data.concatenate_datasets import concatenate_df, concatenate_files
 from ludwig.data.dataset.base import Dataset
 from ludwig.encoders.registry import get_encoder_cls
@@ -61,12 +65,14 @@ from ludwig.utils.data_utils import (
     EXCEL_FORMATS,
     FEATHER_FORMATS,
     figure_data_format,
+    from_numpy_dataset,
     FWF_FORMATS,
     get_split_path,
     HDF5_FORMATS,
     HTML_FORMATS,
     JSON_FORMATS,
     JSONL_FORMATS,
+    NUMPY_COLUMNS_FORMATS,
     ORC_FORMATS,
     override_in_memory_flag,
     PARQUET_FORMATS,
@@ -993,6 +999,72 @@ class HDF5Preprocessor(DataFormatPreprocessor):
         return training_set, test_set, validation_set, training_set_metadata
 
 
+class NumpyColumnsPreprocessor(DataFormatPreprocessor):
+    """Preprocessed data cached as a directory of .npy files, one per column, that are memory-mapped on load."""
+
+    @staticmethod
+    def preprocess_for_training(
+        features,
+        dataset=None,
+        training_set=None,
+        validation_set=None,
+        test_set=None,
+        training_set_metadata=None,
+        skip_save_processed_input=False,
+        preprocessing_params=default_preprocessing_parameters,
+        backend=LOCAL_BACKEND,
+        random_seed=default_random_seed,
+        callbacks=None,
+    ):
+        return NumpyColumnsPreprocessor.prepare_processed_data(
+            features,
+            dataset,
+            training_set,
+            validation_set,
+            test_set,
+            training_set_metadata,
+            skip_save_processed_input,
+            preprocessing_params,
+            backend,
+            random_seed,
+        )
+
+    @staticmethod
+    def preprocess_for_prediction(dataset, features, preprocessing_params, training_set_metadata, backend, callbacks):
+        dataset = from_numpy_dataset(data_utils.load_numpy_columns(dataset, mmap_mode=None))
+        return dataset, training_set_metadata, None
+
+    @staticmethod
+    def prepare_processed_data(
+        features,
+        dataset=None,
+        training_set=None,
+        validation_set=None,
+        test_set=None,
+        training_set_metadata=None,
+        skip_save_processed_input=False,
+        preprocessing_params=default_preprocessing_parameters,
+        backend=LOCAL_BACKEND,
+        random_seed=default_random_seed,
+    ):
+        if training_set is None:
+            raise ValueError("`training_set` must be not None")
+
+        if not training_set_metadata:
+            raise ValueError("When providing npy data, training_set_metadata must not be None.")
+
+        logger.info(f"Loading data from: {training_set}")
+        training_set = data_utils.load_numpy_columns(training_set)
+
+        if validation_set is not None:
+            validation_set = data_utils.load_numpy_columns(validation_set)
+
+        if test_set is not None:
+            test_set = data_utils.load_numpy_columns(test_set)
+
+        return training_set, test_set, validation_set, training_set_metadata
+
+
 data_format_preprocessor_registry = {
     **{fmt: DictPreprocessor for fmt in DICT_FORMATS},
     **{fmt: DataFramePreprocessor for fmt in DATAFRAME_FORMATS},
@@ -1011,6 +1083,7 @@ data_format_preprocessor_registry = {
     **{fmt: SPSSPreprocessor for fmt in SPSS_FORMATS},
     **{fmt: StataPreprocessor for fmt in STATA_FORMATS},
     **{fmt: HDF5Preprocessor for fmt in HDF5_FORMATS},
+    **{fmt: NumpyColumnsPreprocessor for fmt in NUMPY_COLUMNS_FORMATS},
 }
 
 
@@ -1050,20 +1123,32 @@ def build_dataset(
     for callback in callbacks or []:
         callback.on_build_metadata_start(dataset_df, mode)
 
-    logger.debug("build metadata")
-    metadata = build_metadata(metadata, dataset_cols, feature_configs, global_preprocessing_parameters, backend)
+    # Features of datasets read from files are cached individually in the cache_dir during
+    # training, so that only the features whose preprocessing changed are built again
+    feature_cache = None
+    if mode == "training" and not df_engine.partitioned:
+        feature_cache = backend.cache.get_feature_cache(metadata.get(DATASET_CHECKSUM))
+
+    # tokens cached while building the metadata of a feature are reused when building its data
+    with strings_utils.token_id_caching():
+        logger.debug("build metadata")
+        metadata = build_metadata(
+            metadata, dataset_cols, feature_configs, global_preprocessing_parameters, backend, feature_cache
+        )
 
-    for callback in callbacks or []:
-        callback.on_build_metadata_end(dataset_df, mode)
+        for callback in callbacks or []:
+            callback.on_build_metadata_end(dataset_df, mode)
 
-    for callback in callbacks or []:
-        callback.on_build_data_start(dataset_df, mode)
+        for callback in callbacks or []:
+            callback.on_build_data_start(dataset_df, mode)
 
-    logger.debug("build data")
-    proc_cols = build_data(dataset_cols, feature_configs, metadata, backend, skip_save_processed_input)
+        logger.debug("build data")
+        proc_cols = build_data(
+            dataset_cols, feature_configs, metadata, backend, skip_save_processed_input, feature_cache
+        )
 
-    for callback in callbacks or []:
-        callback.on_build_data_end(dataset_df, mode)
+        for callback in callbacks or []:
+            callback.on_build_data_end(dataset_df, mode)
 
     logger.debug("get split")
     split = get_split(
@@ -1131,6 +1216,7 @@ def build_metadata(
     feature_configs: List[Dict[str, Any]],
     global_preprocessing_parameters: Dict[str, Any],
     backend: Backend,
+    feature_cache: Optional[FeatureCache] = None,
 ) -> Dict[str, Any]:
     for feature_config in feature_configs:
         if feature_config[NAME] in metadata:
@@ -1148,6 +1234,15 @@ def build_metadata(
                     preprocessing_parameters, resolve_pointers(encoder_fpp, feature_config, "feature.")
                 )
 
+        # features cached on disk are the ones whose data is entirely held in the processed columns
+        if feature_cache is not None and preprocessing_parameters.get("in_memory", True):
+            cached_metadata = feature_cache.get_metadata(
+                feature_config, preprocessing_parameters, feature_configs, global_preprocessing_parameters
+            )
+            if cached_metadata is not None:
+                metadata[feature_config[NAME]] = cached_metadata
+                continue
+
         fill_value = precompute_fill_value(dataset_cols, feature_config, preprocessing_parameters, backend)
 
         if fill_value is not None:
@@ -1174,6 +1269,7 @@ def build_data(
     training_set_metadata: Dict,
     backend: Backend,
     skip_save_processed_input: bool,
+    feature_cache: Optional[FeatureCache] = None,
 ) -> Dict[str, DataFrame]:
     """Preprocesses the input dataframe columns, handles missing values, and potentially adds metadata to
     training_set_metadata.
@@ -1184,6 +1280,7 @@ def build_data(
         training_set_metadata: Training set metadata. Additional fields may be added.
         backend: Backend for data processing.
         skip_save_processed_input: (bool) Whether to skip saving the processed input.
+        feature_cache: Cache the processed data of each feature is read from and written to.
 
     Returns:
         Dictionary of (feature name) -> (processed data).
@@ -1192,15 +1289,22 @@ def build_data(
     for feature_config in feature_configs:
         preprocessing_parameters = training_set_metadata[feature_config[NAME]][PREPROCESSING]
         handle_missing_values(input_cols, feature_config, preprocessing_parameters)
-        get_from_registry(feature_config[TYPE], base_type_registry).add_feature_data(
-            feature_config,
-            input_cols,
-            proc_cols,
-            training_set_metadata,
-            preprocessing_parameters,
-            backend,
-            skip_save_processed_input,
-        )
+
+        feature_proc_cols = feature_cache.get_data(feature_config) if feature_cache is not None else None
+        if feature_proc_cols is None:
+            feature_proc_cols = {}
+            get_from_registry(feature_config[TYPE], base_type_registry).add_feature_data(
+                feature_config,
+                input_cols,
+                feature_proc_cols,
+                training_set_metadata,
+                preprocessing_parameters,
+                backend,
+                skip_save_processed_input,
+            )
+            if feature_cache is not None:
+                feature_cache.put(feature_config, training_set_metadata[feature_config[NAME]], feature_proc_cols)
+        proc_cols.update(feature_proc_cols)
 
     return proc_cols
 
@@ -1278,32 +1382,51 @@ def get_split(
         split = dataset_df[SPLIT]
     else:
         set_random_seed(random_seed)
-        if stratify is None or stratify not in dataset_df:
-            if backend.df_engine.partitioned:
-                # This approach is very inefficient for partitioned backends, which
-                # can split by partition
-                return None
-
-            split = (
-                dataset_df.index.to_series()
-                .map(lambda x: np.random.choice(3, 1, p=split_probabilities))
-                .astype(np.int8)
-            )
+        if stratify is not None and stratify not in dataset_df:
+            stratify = None
+
+        if backend.df_engine.partitioned:
+            # Each partition is split independently with its own random stream,
+            # so stratification is only approximate across partitions
+            def split_partition(df, partition_info=None):
+                partition_number = partition_info["number"] if partition_info else 0
+                rng = np.random.default_rng((random_seed, partition_number))
+                return _draw_split(df, split_probabilities, stratify, rng)
+
+            split = backend.df_engine.map_partitions(dataset_df, split_partition, meta=(SPLIT, "int8"))
         else:
-            split = np.zeros(len(dataset_df))
-            for val in dataset_df[stratify].unique():
-                # TODO dask: find a way to better parallelize this operation
-                idx_list = dataset_df.index[dataset_df[stratify] == val].tolist()
-                array_lib = backend.df_engine.array_lib
-                val_list = array_lib.random.choice(
-                    3,
-                    len(idx_list),
-                    p=split_probabilities,
-                ).astype(np.int8)
-                split[idx_list] = val_list
+            rng = np.random.default_rng(random_seed)
+            split = _draw_split(dataset_df, split_probabilities, stratify, rng)
     return split
 
 
+def _draw_split(df, split_probabilities, stratify, rng):
+    """Assigns each row of `df` to train (0), validation (1) or test (2).
+
+    Without `stratify` every row is drawn independently. With `stratify`, rows are randomly ordered within each group of
+    equal `stratify` values and split by systematic sampling, so every group is divided as close to
+    `split_probabilities` as its size allows.
+    """
+    cum_probabilities = np.cumsum(split_probabilities)
+    cum_probabilities /= cum_probabilities[-1]
+
+    if stratify is None:
+        fractions = rng.random(len(df))
+    else:
+        groups = df.groupby(stratify, sort=False, dropna=False).ngroup().values
+        group_sizes = np.bincount(groups)
+        # rank of every row within its group, in random order
+        permutation = rng.permutation(len(df))
+        permuted_groups = pd.Series(groups[permutation])
+        ranks = np.empty(len(df), dtype=np.int64)
+        ranks[permutation] = permuted_groups.groupby(permuted_groups).cumcount().values
+        offsets = rng.random(len(group_sizes))
+        fractions = (ranks + offsets[groups]) / group_sizes[groups]
+
+    split = np.searchsorted(cum_probabilities, fractions, side="right").astype(np.int8)
+    return pd.Series(np.minimum(split, 2), index=df.index, name=SPLIT)
+
+
 def load_hdf5(hdf5_file_path, features, split_data=True, shuffle_training=False):
     # TODO dask: this needs to work with DataFrames
     logger.info(f"Loading data from: {hdf5_file_path}")
@@ -1358,7 +1481,7 @@ def preprocess_for_training(
         lock_path = backend.cache.get_cache_directory(dataset)
     except (TypeError, ValueError):
         lock_path = None
-    with file_lock(lock_path, lock_file=".lock_preprocessing"):
+    with file_lock(lock_path, lock_file=CACHE_LOCK_FILE):
         # if training_set_metadata is a string, assume it's a path to load the json
         training_set_metadata = training_set_metadata or {}
         if training_set_metadata and isinstance(training_set_metadata, str):
@@ -1396,6 +1519,8 @@ def preprocess_for_training(
                     cache.delete()
 
         training_set_metadata[CHECKSUM] = cache.checksum
+        if data_format in CACHEABLE_FORMATS and backend.cache.can_cache(skip_save_processed_input):
+            training_set_metadata[DATASET_CHECKSUM] = cache.dataset_checksum
         data_format_processor = get_from_registry(data_format, data_format_preprocessor_registry)
 
         if cached or data_format == "hdf5":
@@ -1435,6 +1560,7 @@ def preprocess_for_training(
             if backend.cache.can_cache(skip_save_processed_input):
                 logger.debug("cache processed data")
                 processed = cache.put(*processed)
+                backend.cache.evict(os.path.dirname(cache.cache_map[META]), keep=cache.cache_map.values())
             training_set, test_set, validation_set, training_set_metadata = processed
 
         logger.debug("create training dataset")
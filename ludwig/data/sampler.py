@@ -15,6 +15,7 @@
 # ==============================================================================
 
 import math
+from typing import Iterator, Union
 
 import numpy as np
 
@@ -33,21 +34,50 @@ class DistributedSampler:
         self.seed = seed
 
     def __iter__(self):
+        return iter(self.get_indices().tolist())
+
+    def get_indices(self) -> np.ndarray:
+        """Returns the indices of the samples assigned to this replica for the current epoch."""
         if self.shuffle:
             # deterministically shuffle based on epoch and seed
-            indices = np.random.RandomState(seed=self.seed + self.epoch).permutation(self.dataset_size).tolist()
+            indices = np.random.RandomState(seed=self.seed + self.epoch).permutation(self.dataset_size)
         else:
-            indices = list(range(self.dataset_size))
+            indices = np.arange(self.dataset_size)
 
         # add extra samples to make it evenly divisible
-        indices += indices[: (self.total_size - len(indices))]
+        indices = np.concatenate([indices, indices[: (self.total_size - len(indices))]])
         assert len(indices) == self.total_size
 
         # subsample
         indices = indices[self.rank : self.total_size : self.num_replicas]
         assert len(indices) == self.num_samples
 
-        return iter(indices)
+        return indices
+
+    def iter_batches(self, batch_size: int) -> Iterator[Union[slice, np.ndarray]]:
+        """Yields the indices of this replica in batches of at most `batch_size` samples.
+
+        Each batch is either a `slice` or a NumPy array of indices, both of which can be used to index a NumPy array
+        directly. When shuffling is disabled, batches are yielded as (strided) slices whenever possible, so fetching
+        a batch is a view over the underlying data rather than a gather.
+
+        :param batch_size: (int) maximum number of indices in each batch
+        """
+        if self.shuffle:
+            indices = self.get_indices()
+            for start in range(0, self.num_samples, batch_size):
+                yield indices[start : start + batch_size]
+            return
+
+        for start in range(0, self.num_samples, batch_size):
+            stop = min(start + batch_size, self.num_samples)
+            first = self.rank + start * self.num_replicas
+            last = self.rank + (stop - 1) * self.num_replicas
+            if last < self.dataset_size:
+                yield slice(first, last + 1, self.num_replicas)
+            else:
+                # the padding samples wrap around to the beginning of the dataset
+                yield np.arange(first, last + 1, self.num_replicas) % self.dataset_size
 
     def __len__(self):
         return self.num_samples
@@ -20,6 +20,7 @@ import torch
 
 from ludwig.constants import BAG
 from ludwig.encoders.base import Encoder
+from ludwig.encoders.generic_encoders import EmbedBagEncoder
 from ludwig.encoders.registry import register_encoder
 from ludwig.modules.embedding_modules import EmbedWeighted
 from ludwig.modules.fully_connected_modules import FCStack
@@ -99,3 +100,9 @@ class BagEmbedWeightedEncoder(Encoder):
         hidden = self.fc_stack(hidden)
 
         return hidden
+
+
+@register_encoder("embedding_bag", BAG)
+class BagEmbedBagEncoder(EmbedBagEncoder):
+    """Aggregates the embeddings of the elements of each bag, where repeated indices weight their embedding by the
+    token frequency when aggregating with sum."""
@@ -14,12 +14,14 @@
 # limitations under the License.
 # ==============================================================================
 import logging
+from typing import Any, Dict, List, Optional
 
 import torch
 
 from ludwig.constants import BINARY, CATEGORY, NUMBER, VECTOR
 from ludwig.encoders.base import Encoder
 from ludwig.encoders.registry import register_encoder
+from ludwig.modules.embedding_modules import EmbedBag
 from ludwig.modules.fully_connected_modules import FCStack
 
 logger = logging.getLogger(__name__)
@@ -98,3 +100,88 @@ class DenseEncoder(Encoder):
     @property
     def output_shape(self) -> torch.Size:
         return torch.Size([self.fc_stack.layers[-1]["output_size"]])
+
+
+class EmbedBagEncoder(Encoder):
+    """Base of the encoders aggregating the embeddings of the padded lists of indices set and bag features are
+    stored as, without densifying them.
+
+    Subclasses are registered for the feature types they encode.
+    """
+
+    index_list_inputs = True
+
+    def __init__(
+        self,
+        vocab: List[str],
+        embedding_size: int = 50,
+        representation: str = "dense",
+        embeddings_trainable: bool = True,
+        pretrained_embeddings: Optional[str] = None,
+        force_embedding_size: bool = False,
+        embeddings_on_cpu: bool = False,
+        aggregation_function: str = "sum",
+        max_set_size: int = 1,
+        fc_layers=None,
+        num_fc_layers: int = 0,
+        output_size: int = 10,
+        use_bias: bool = True,
+        weights_initializer: str = "xavier_uniform",
+        bias_initializer: str = "zeros",
+        norm: Optional[str] = None,
+        norm_params: Optional[Dict[str, Any]] = None,
+        activation: str = "relu",
+        dropout: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__()
+        logger.debug(f" {self.name}")
+
+        logger.debug("  EmbedBag")
+        self.embed_bag = EmbedBag(
+            vocab,
+            embedding_size,
+            representation=representation,
+            embeddings_trainable=embeddings_trainable,
+            pretrained_embeddings=pretrained_embeddings,
+            force_embedding_size=force_embedding_size,
+            embeddings_on_cpu=embeddings_on_cpu,
+            dropout=dropout,
+            embedding_initializer=weights_initializer,
+            aggregation_function=aggregation_function,
+            max_set_size=max_set_size,
+        )
+        logger.debug("  FCStack")
+        self.fc_stack = FCStack(
+            self.embed_bag.output_shape[-1],
+            layers=fc_layers,
+            num_layers=num_fc_layers,
+            default_output_size=output_size,
+            default_use_bias=use_bias,
+            default_weights_initializer=weights_initializer,
+            default_bias_initializer=bias_initializer,
+            default_norm=norm,
+            default_norm_params=norm_params,
+            default_activation=activation,
+            default_dropout=dropout,
+        )
+
+    @property
+    def input_shape(self) -> torch.Size:
+        return self.embed_bag.input_shape
+
+    @property
+    def output_shape(self) -> torch.Size:
+        return self.fc_stack.output_shape
+
+    def forward(self, inputs: torch.Tensor) -> torch.Tensor:
+        """
+        :param inputs: The inputs fed into the encoder.
+               Shape: [batch x max set size], type torch.int32, padded with -1.
+
+        :param return: embeddings of shape [batch x output size], type torch.float32
+        """
+        hidden = self.embed_bag(inputs)
+        hidden = self.fc_stack(hidden)
+
+        return hidden
@@ -20,6 +20,7 @@ import torch
 
 from ludwig.constants import SET
 from ludwig.encoders.base import Encoder
+from ludwig.encoders.generic_encoders import EmbedBagEncoder
 from ludwig.encoders.registry import register_encoder
 from ludwig.modules.embedding_modules import EmbedSet
 from ludwig.modules.fully_connected_modules import FCStack
@@ -103,3 +104,8 @@ class SetSparseEncoder(Encoder):
     @property
     def output_shape(self) -> torch.Size:
         return self.fc_stack.output_shape
+
+
+@register_encoder("embedding_bag", SET)
+class SetEmbedBagEncoder(EmbedBagEncoder):
+    """Aggregates the embeddings of the distinct elements of each set."""
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
+import io
 import logging
 import os
 import sys
@@ -51,6 +53,24 @@ from ludwig.utils.misc_utils import set_default_value, set_default_values
 logger = logging.getLogger(__name__)
 
 
+def _read_audio(path, src_path):
+    import soundfile
+
+    if isinstance(path, bytes):
+        # contents of the audio file, e.g., uploaded to a server
+        return soundfile.read(io.BytesIO(path))
+    filepath = get_abs_path(src_path, path)
+    return soundfile.read(filepath)
+
+
+def _transform_audio(row, **kwargs):
+    return AudioFeatureMixin._transform_to_feature(audio=row[0], sampling_rate_in_hz=row[1], **kwargs)
+
+
+def _get_audio_stats(row, max_length_in_s):
+    return AudioFeatureMixin._get_stats(audio=row[0], sampling_rate_in_hz=row[1], max_length_in_s=max_length_in_s)
+
+
 class AudioFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def type():
@@ -154,7 +174,7 @@ class AudioFeatureMixin(BaseFeatureMixin):
         backend,
     ):
         try:
-            import soundfile
+            import soundfile  # noqa: F401
         except ImportError:
             logger.error(
                 " soundfile is not installed. "
@@ -163,17 +183,12 @@ class AudioFeatureMixin(BaseFeatureMixin):
             )
             sys.exit(-1)
 
-        def read_audio(path):
-            filepath = get_abs_path(src_path, path)
-            return soundfile.read(filepath)
-
         df_engine = backend.df_engine
-        raw_audio = df_engine.map_objects(column, read_audio)
+        raw_audio = df_engine.map_objects(column, functools.partial(_read_audio, src_path=src_path))
         processed_audio = df_engine.map_objects(
             raw_audio,
-            lambda row: AudioFeatureMixin._transform_to_feature(
-                audio=row[0],
-                sampling_rate_in_hz=row[1],
+            functools.partial(
+                _transform_audio,
                 audio_feature_dict=audio_feature_dict,
                 feature_dim=feature_dim,
                 max_length=max_length,
@@ -183,12 +198,7 @@ class AudioFeatureMixin(BaseFeatureMixin):
         )
 
         audio_stats = df_engine.map_objects(
-            raw_audio,
-            lambda row: AudioFeatureMixin._get_stats(
-                audio=row[0],
-                sampling_rate_in_hz=row[1],
-                max_length_in_s=audio_file_length_limit_in_s,
-            ),
+            raw_audio, functools.partial(_get_audio_stats, max_length_in_s=audio_file_length_limit_in_s)
         )
 
         def reduce(series):
@@ -342,7 +352,7 @@ class AudioFeatureMixin(BaseFeatureMixin):
             break
         if SRC in metadata:
             src_path = os.path.dirname(os.path.abspath(metadata.get(SRC)))
-        if src_path is None and not os.path.isabs(first_path):
+        if src_path is None and isinstance(first_path, str) and not os.path.isabs(first_path):
             raise ValueError("Audio file paths must be absolute")
 
         num_audio_utterances = len(input_df[feature_config[COLUMN]])
@@ -13,17 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import logging
-from collections import Counter
 
-import numpy as np
 import torch
 
 from ludwig.constants import BAG, COLUMN, FILL_WITH_CONST, MISSING_VALUE_STRATEGY_OPTIONS, NAME, PROC_COLUMN, TIED
 from ludwig.features.base_feature import BaseFeatureMixin, InputFeature
-from ludwig.features.feature_utils import set_str_to_idx
+from ludwig.features.feature_utils import pad_index_lists, set_str_to_idx
 from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.strings_utils import create_vocabulary, tokenizer_registry, UNKNOWN_SYMBOL
+from ludwig.utils.torch_utils import index_lists_to_dense
 
 logger = logging.getLogger(__name__)
 
@@ -78,14 +78,11 @@ class BagFeatureMixin(BaseFeatureMixin):
 
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters, backend):
-        def to_vector(set_str):
-            bag_vector = np.zeros((len(metadata["str2idx"]),), dtype=np.float32)
-            col_counter = Counter(set_str_to_idx(set_str, metadata["str2idx"], preprocessing_parameters["tokenizer"]))
-
-            bag_vector[list(col_counter.keys())] = list(col_counter.values())
-            return bag_vector
-
-        return backend.df_engine.map_objects(column, to_vector)
+        # repeated elements are kept, so their counts are recovered when densifying
+        to_indices = functools.partial(
+            set_str_to_idx, feature_dict=metadata["str2idx"], tokenizer_name=preprocessing_parameters["tokenizer"]
+        )
+        return pad_index_lists(backend.df_engine.map_objects(column, to_indices), backend)
 
     @staticmethod
     def add_feature_data(
@@ -103,6 +100,7 @@ class BagFeatureMixin(BaseFeatureMixin):
 class BagInputFeature(BagFeatureMixin, InputFeature):
     encoder = "embed"
     vocab = []
+    max_set_size = 1
 
     def __init__(self, feature, encoder_obj=None):
         super().__init__(feature)
@@ -111,18 +109,27 @@ class BagInputFeature(BagFeatureMixin, InputFeature):
             self.encoder_obj = encoder_obj
         else:
             self.encoder_obj = self.initialize_encoder(feature)
+        # EmbeddingBag based encoders look up the padded lists of indices directly
+        self.index_list_inputs = getattr(self.encoder_obj, "index_list_inputs", False)
 
     def forward(self, inputs):
         assert isinstance(inputs, torch.Tensor)
-        # assert inputs.dtype == tf.bool # this fails
+        assert inputs.dtype in [torch.int32, torch.int64]
 
+        if not self.index_list_inputs:
+            # bags are stored as lists of indices and only densified to counts one batch at a time
+            inputs = index_lists_to_dense(inputs, len(self.vocab))
         encoder_output = self.encoder_obj(inputs)
 
         return {"encoder_output": encoder_output}
 
+    @property
+    def input_dtype(self):
+        return torch.int32
+
     @property
     def input_shape(self) -> torch.Size:
-        return torch.Size([len(self.vocab)])
+        return torch.Size([self.max_set_size])
 
     @property
     def output_shape(self) -> torch.Size:
@@ -131,6 +138,7 @@ class BagInputFeature(BagFeatureMixin, InputFeature):
     @staticmethod
     def update_config_with_metadata(input_feature, feature_metadata, *args, **kwargs):
         input_feature["vocab"] = feature_metadata["idx2str"]
+        input_feature["max_set_size"] = feature_metadata["max_set_size"]
 
     @staticmethod
     def populate_defaults(input_feature):
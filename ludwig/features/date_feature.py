@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import logging
 from datetime import date, datetime
 from typing import Any, Dict
@@ -31,6 +32,11 @@ logger = logging.getLogger(__name__)
 DATE_VECTOR_LENGTH = 9
 
 
+def _date_to_array(date_value, datetime_format, preprocessing_parameters):
+    date_list = DateFeatureMixin.date_to_list(date_value, datetime_format, preprocessing_parameters)
+    return np.array(date_list, dtype=np.int16)
+
+
 class DateFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def type():
@@ -109,8 +115,8 @@ class DateFeatureMixin(BaseFeatureMixin):
         datetime_format = preprocessing_parameters["datetime_format"]
         proc_df[feature_config[PROC_COLUMN]] = backend.df_engine.map_objects(
             input_df[feature_config[COLUMN]],
-            lambda x: np.array(
-                DateFeatureMixin.date_to_list(x, datetime_format, preprocessing_parameters), dtype=np.int16
+            functools.partial(
+                _date_to_array, datetime_format=datetime_format, preprocessing_parameters=preprocessing_parameters
             ),
         )
         return proc_df
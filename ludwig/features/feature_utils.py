@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import re
 from typing import Dict, List, Tuple
 
@@ -48,6 +49,28 @@ def set_str_to_idx(set_string, feature_dict, tokenizer_name):
     return np.array(out, dtype=np.int32)
 
 
+def set_str_to_unique_idx(set_string, feature_dict, tokenizer_name):
+    return np.unique(set_str_to_idx(set_string, feature_dict, tokenizer_name))
+
+
+def _pad_indices(indices, max_size):
+    padded = np.full(max_size, -1, dtype=np.int32)
+    padded[: len(indices)] = indices
+    return padded
+
+
+def pad_index_lists(column, backend):
+    """Pads the index lists of a column with -1 to the length of the longest one.
+
+    Sets and bags are stored this way, as [num rows x max size] indices rather than [num rows x vocab size] dense
+    vectors, and are only densified one batch at a time by their features.
+    """
+    lengths = backend.df_engine.map_objects(column, len)
+    # the maximum of an empty column is NaN
+    max_size = max(int(np.nan_to_num(backend.df_engine.compute(lengths.max()))), 1)
+    return backend.df_engine.map_objects(column, functools.partial(_pad_indices, max_size=max_size))
+
+
 def sanitize(name):
     """Replaces invalid id characters."""
     return re.sub("\\W|^(?=\\d)", "_", name)
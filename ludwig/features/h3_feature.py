@@ -30,6 +30,10 @@ H3_VECTOR_LENGTH = MAX_H3_RESOLUTION + 4
 H3_PADDING_VALUE = 7
 
 
+def _h3_to_array(h3_int):
+    return np.array(H3FeatureMixin.h3_to_list(h3_int), dtype=np.uint8)
+
+
 class H3FeatureMixin(BaseFeatureMixin):
     @staticmethod
     def type():
@@ -74,11 +78,8 @@ class H3FeatureMixin(BaseFeatureMixin):
         column = input_df[feature_config[COLUMN]]
         if column.dtype == object:
             column = column.map(int)
-        column = column.map(H3FeatureMixin.h3_to_list)
 
-        proc_df[feature_config[PROC_COLUMN]] = backend.df_engine.map_objects(
-            column, lambda x: np.array(x, dtype=np.uint8)
-        )
+        proc_df[feature_config[PROC_COLUMN]] = backend.df_engine.map_objects(column, _h3_to_array)
         return proc_df
 
 
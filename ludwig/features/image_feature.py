@@ -14,12 +14,14 @@
 # limitations under the License.
 # ==============================================================================
 import logging
+import multiprocessing
 import os
 from functools import partial
-from multiprocessing import Pool
+from multiprocessing import Pool, shared_memory
 from typing import Optional, Tuple, Union
 
 import numpy as np
+import pandas as pd
 import requests
 import torch
 import torchvision
@@ -45,9 +47,10 @@ from ludwig.constants import (
     TRAINING,
     WIDTH,
 )
+from ludwig.data.dataframe.tensor import TensorArray
 from ludwig.features.base_feature import BaseFeatureMixin, InputFeature
 from ludwig.utils.data_utils import get_abs_path
-from ludwig.utils.fs_utils import has_remote_protocol, upload_h5
+from ludwig.utils.fs_utils import has_remote_protocol, makedirs, upload_h5
 from ludwig.utils.image_utils import (
     get_gray_default_image,
     get_image_from_path,
@@ -71,6 +74,85 @@ image_scaling_registry = {
 }
 
 
+# size of the blocks of images written at once to the HDF5 cache
+IMAGE_HDF5_SLAB_BYTES = 64 * 1024 * 1024
+
+
+def _map_images(read_image_and_resize, img_entries, num_processes, chunksize=16):
+    """Yields `read_image_and_resize` applied to each entry, in order.
+
+    Images are decoded and resized by a pool of `num_processes` workers when more than one is requested and are
+    yielded as soon as they are ready, so callers never need the whole processed dataset in memory.
+    """
+    if num_processes > 1:
+        with Pool(num_processes) as pool:
+            logger.debug(f"Using {num_processes} processes for preprocessing images")
+            yield from pool.imap(read_image_and_resize, img_entries, chunksize=chunksize)
+    else:
+        yield from map(read_image_and_resize, img_entries)
+
+
+# Set in each worker of _read_images_into_array by _init_shared_image_worker
+_worker_image_task = None
+
+
+def _init_shared_image_worker(read_image_and_resize, shm_name, shape, dtype):
+    global _worker_image_task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    images = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    # the shared memory handle is kept with the array so that its buffer stays mapped in the worker
+    _worker_image_task = (read_image_and_resize, images, shm)
+
+
+def _read_image_into_shared_array(indexed_img_entry):
+    read_image_and_resize, images, _ = _worker_image_task
+    i, img_entry = indexed_img_entry
+    res = read_image_and_resize(img_entry)
+    if res is None:
+        return False
+    images[i] = res
+    return True
+
+
+def _read_images_into_array(
+    read_image_and_resize, img_entries, num_processes, default_image, dtype=np.uint8, chunksize=16
+):
+    """Returns a preallocated array of shape (N, C, H, W) filled with the processed images, in order.
+
+    Images that cannot be read are replaced by `default_image`. With more than one process, the workers write the
+    images straight into a shared memory block they attach to by name, so decoded images are never pickled back to
+    the calling process.
+    """
+    shape = (len(img_entries),) + default_image.shape
+    if num_processes <= 1:
+        images = np.empty(shape, dtype=dtype)
+        for i, res in enumerate(_map_images(read_image_and_resize, img_entries, num_processes, chunksize)):
+            images[i] = res if res is not None else default_image
+        return images
+
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+    shared_images = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        initargs = (read_image_and_resize, shm.name, shape, np.dtype(dtype).str)
+        with multiprocessing.get_context(start_method).Pool(
+            num_processes, initializer=_init_shared_image_worker, initargs=initargs
+        ) as pool:
+            logger.debug(f"Using {num_processes} processes for preprocessing images")
+            indexed_img_entries = enumerate(img_entries)
+            for i, read in enumerate(pool.imap(_read_image_into_shared_array, indexed_img_entries, chunksize)):
+                if not read:
+                    shared_images[i] = default_image
+        # the block is released before returning, so the images are copied out of it once
+        images = shared_images.copy()
+    finally:
+        # the view on the block has to go before the block can be closed
+        del shared_images
+        shm.close()
+        shm.unlink()
+    return images
+
+
 class ImageFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def type():
@@ -383,10 +465,15 @@ class ImageFeatureMixin(BaseFeatureMixin):
                     for img_entry in input_df[feature_config[COLUMN]]
                 ]
 
-                with Pool(num_processes) as pool:
-                    logger.debug(f"Using {num_processes} processes for preprocessing images")
-                    res = pool.map(read_image_and_resize, all_img_entries)
-                    proc_df[feature_config[PROC_COLUMN]] = [x if x is not None else default_image for x in res]
+                # images given as tensors keep their dtype, decoded files are uint8
+                dtype = first_img_entry.numpy().dtype if isinstance(first_img_entry, torch.Tensor) else np.uint8
+                images = _read_images_into_array(
+                    read_image_and_resize, all_img_entries, num_processes, default_image, dtype=dtype
+                )
+                # the column is backed by the array itself, which the dataset then uses without stacking it
+                proc_df[feature_config[PROC_COLUMN]] = pd.Series(
+                    TensorArray(images), index=input_df[feature_config[COLUMN]].index
+                )
             else:
                 # If we're not running multiple processes and we are only processing one
                 # image just use this faster shortcut, bypassing multiprocessing.Pool.map
@@ -410,15 +497,25 @@ class ImageFeatureMixin(BaseFeatureMixin):
                 for img_entry in input_df[feature_config[COLUMN]]
             ]
 
-            data_fp = backend.cache.get_cache_path(metadata.get(SRC), metadata.get(CHECKSUM), TRAINING)
+            if not backend.supports_multiprocessing:
+                num_processes = 1
+
+            data_fp = backend.cache.get_cache_path(metadata.get(SRC), metadata.get(CHECKSUM), TRAINING, "hdf5")
+            makedirs(os.path.dirname(data_fp), exist_ok=True)
             with upload_h5(data_fp) as h5_file:
-                # todo future add multiprocessing/multithreading
                 image_dataset = h5_file.create_dataset(
                     feature_config[PROC_COLUMN] + "_data", (num_images, num_channels, height, width), dtype=np.uint8
                 )
-                for i, img_entry in enumerate(all_img_entries):
-                    res = read_image_and_resize(img_entry)
-                    image_dataset[i, :height, :width, :] = res if res is not None else default_image
+                processed_images = _map_images(read_image_and_resize, all_img_entries, num_processes)
+
+                # images are buffered and written in contiguous slabs by this process only
+                slab_size = max(1, min(num_images, IMAGE_HDF5_SLAB_BYTES // default_image.nbytes))
+                slab = np.empty((slab_size, num_channels, height, width), dtype=np.uint8)
+                for start in range(0, num_images, slab_size):
+                    stop = min(start + slab_size, num_images)
+                    for i, res in zip(range(stop - start), processed_images):
+                        slab[i] = res if res is not None else default_image
+                    image_dataset[start:stop] = slab[: stop - start]
                 h5_file.flush()
 
             proc_df[feature_config[PROC_COLUMN]] = np.arange(num_images)
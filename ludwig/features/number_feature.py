@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import logging
 import random
 from typing import Any, Dict, List, Union
@@ -52,8 +53,9 @@ logger = logging.getLogger(__name__)
 class ZScoreTransformer(nn.Module):
     def __init__(self, mean: float = None, std: float = None, **kwargs: dict):
         super().__init__()
-        self.mu = mean
-        self.sigma = std
+        # plain floats rather than numpy scalars, so the module can be scripted
+        self.mu = float(mean) if mean is not None else mean
+        self.sigma = float(std) if std is not None else std
 
     def transform(self, x: np.ndarray) -> np.ndarray:
         return self._transform(x)
@@ -62,10 +64,10 @@ class ZScoreTransformer(nn.Module):
         return self._inverse_transform(x)
 
     def transform_inference(self, x: torch.Tensor) -> torch.Tensor:
-        return self._transform(x)
+        return (x - self.mu) / self.sigma
 
     def inverse_transform_inference(self, x: torch.Tensor) -> torch.Tensor:
-        return self._inverse_transform(x)
+        return x * self.sigma + self.mu
 
     def _transform(self, x: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
         return (x - self.mu) / self.sigma
@@ -85,9 +87,9 @@ class ZScoreTransformer(nn.Module):
 class MinMaxTransformer(nn.Module):
     def __init__(self, min: float = None, max: float = None, **kwargs: dict):
         super().__init__()
-        self.min_value = min
-        self.max_value = max
-        self.range = None if min is None or max is None else max - min
+        self.min_value = float(min) if min is not None else min
+        self.max_value = float(max) if max is not None else max
+        self.range = None if min is None or max is None else self.max_value - self.min_value
 
     def transform(self, x: np.ndarray) -> np.ndarray:
         return self._transform(x)
@@ -96,10 +98,12 @@ class MinMaxTransformer(nn.Module):
         return self._inverse_transform(x)
 
     def transform_inference(self, x: torch.Tensor) -> torch.Tensor:
-        return self._transform(x)
+        return (x - self.min_value) / self.range
 
     def inverse_transform_inference(self, x: torch.Tensor) -> torch.Tensor:
-        return self._inverse_transform(x)
+        if self.range is None:
+            raise ValueError("Numeric transformer needs to be instantiated with " "min and max values.")
+        return x * self.range + self.min_value
 
     def _transform(self, x: Union[np.ndarray, torch.Tensor]):
         return (x - self.min_value) / self.range
@@ -179,6 +183,11 @@ def get_transformer(metadata, preprocessing_parameters):
     )(**metadata)
 
 
+def _transform_series(series: pd.Series, numeric_transformer: nn.Module) -> pd.Series:
+    series.update(numeric_transformer.transform(series.values))
+    return series
+
+
 class _NumberPreprocessing(torch.nn.Module):
     def __init__(self, metadata: Dict[str, Any]):
         super().__init__()
@@ -268,10 +277,8 @@ class NumberFeatureMixin(BaseFeatureMixin):
         backend,
         skip_save_processed_input,
     ):
-        def normalize(series: pd.Series) -> pd.Series:
-            numeric_transformer = get_transformer(metadata[feature_config[NAME]], preprocessing_parameters)
-            series.update(numeric_transformer.transform(series.values))
-            return series
+        numeric_transformer = get_transformer(metadata[feature_config[NAME]], preprocessing_parameters)
+        normalize = functools.partial(_transform_series, numeric_transformer=numeric_transformer)
 
         input_series = input_df[feature_config[COLUMN]].astype(np.float32)
         proc_df[feature_config[PROC_COLUMN]] = backend.df_engine.map_partitions(input_series, normalize)
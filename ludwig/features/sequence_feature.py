@@ -49,7 +49,9 @@ from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.strings_utils import (
     build_sequence_matrix,
     create_vocabulary,
+    get_token_id_cache,
     PADDING_SYMBOL,
+    pop_token_id_cache,
     SpecialSymbol,
     tokenizer_registry,
     UNKNOWN_SYMBOL,
@@ -87,6 +89,7 @@ class SequenceFeatureMixin(BaseFeatureMixin):
             "tokenizer": "space",
             "lowercase": False,
             "vocab_file": None,
+            "cache_token_ids": False,
             "missing_value_strategy": FILL_WITH_CONST,
             "fill_value": UNKNOWN_SYMBOL,
         }
@@ -102,6 +105,7 @@ class SequenceFeatureMixin(BaseFeatureMixin):
             "tokenizer": {"type": "string", "enum": sorted(list(tokenizer_registry.keys()))},
             "lowercase": {"type": "boolean"},
             "vocab_file": {"type": ["string", "null"]},
+            "cache_token_ids": {"type": "boolean"},
             "missing_value_strategy": {"type": "string", "enum": MISSING_VALUE_STRATEGY_OPTIONS},
             "fill_value": {"type": "string"},
             "computed_fill_value": {"type": "string"},
@@ -114,6 +118,9 @@ class SequenceFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters, backend):
         column = column.astype(str)
+        token_cache = None
+        if preprocessing_parameters["cache_token_ids"]:
+            token_cache = get_token_id_cache(column.name, preprocessing_parameters["tokenizer"])
         idx2str, str2idx, str2freq, max_length, _, _, _ = create_vocabulary(
             column,
             preprocessing_parameters["tokenizer"],
@@ -123,6 +130,7 @@ class SequenceFeatureMixin(BaseFeatureMixin):
             unknown_symbol=preprocessing_parameters["unknown_symbol"],
             padding_symbol=preprocessing_parameters["padding_symbol"],
             processor=backend.df_engine,
+            token_cache=token_cache,
         )
         max_length = min(preprocessing_parameters["sequence_length_limit"], max_length)
         return {
@@ -146,6 +154,7 @@ class SequenceFeatureMixin(BaseFeatureMixin):
             lowercase=preprocessing_parameters["lowercase"],
             tokenizer_vocab_file=preprocessing_parameters["vocab_file"],
             processor=backend.df_engine,
+            token_cache=pop_token_id_cache(column.name, preprocessing_parameters["tokenizer"]),
         )
         return sequence_data
 
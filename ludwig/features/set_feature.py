@@ -13,10 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import logging
 from typing import Dict
 
-import numpy as np
 import torch
 
 from ludwig.constants import (
@@ -39,10 +39,11 @@ from ludwig.constants import (
     TYPE,
 )
 from ludwig.features.base_feature import BaseFeatureMixin, InputFeature, OutputFeature, PredictModule
-from ludwig.features.feature_utils import set_str_to_idx
+from ludwig.features.feature_utils import pad_index_lists, set_str_to_unique_idx
 from ludwig.utils import output_feature_utils
 from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.strings_utils import create_vocabulary, tokenizer_registry, UNKNOWN_SYMBOL
+from ludwig.utils.torch_utils import index_lists_to_dense
 
 logger = logging.getLogger(__name__)
 
@@ -113,14 +114,12 @@ class SetFeatureMixin(BaseFeatureMixin):
 
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters, backend):
-        def to_dense(x):
-            feature_vector = set_str_to_idx(x, metadata["str2idx"], preprocessing_parameters["tokenizer"])
-
-            set_vector = np.zeros((len(metadata["str2idx"]),))
-            set_vector[feature_vector] = 1
-            return set_vector.astype(np.bool)
-
-        return backend.df_engine.map_objects(column, to_dense)
+        to_indices = functools.partial(
+            set_str_to_unique_idx,
+            feature_dict=metadata["str2idx"],
+            tokenizer_name=preprocessing_parameters["tokenizer"],
+        )
+        return pad_index_lists(backend.df_engine.map_objects(column, to_indices), backend)
 
     @staticmethod
     def add_feature_data(
@@ -138,6 +137,7 @@ class SetFeatureMixin(BaseFeatureMixin):
 class SetInputFeature(SetFeatureMixin, InputFeature):
     encoder = "embed"
     vocab = []
+    max_set_size = 1
 
     def __init__(self, feature, encoder_obj=None):
         super().__init__(feature)
@@ -146,26 +146,32 @@ class SetInputFeature(SetFeatureMixin, InputFeature):
             self.encoder_obj = encoder_obj
         else:
             self.encoder_obj = self.initialize_encoder(feature)
+        # EmbeddingBag based encoders look up the padded lists of indices directly
+        self.index_list_inputs = getattr(self.encoder_obj, "index_list_inputs", False)
 
     def forward(self, inputs):
         assert isinstance(inputs, torch.Tensor)
-        assert inputs.dtype in [torch.bool, torch.int64]
+        assert inputs.dtype in [torch.int32, torch.int64]
 
+        if not self.index_list_inputs:
+            # sets are stored as lists of indices and only densified one batch at a time
+            inputs = index_lists_to_dense(inputs, len(self.vocab)) > 0
         encoder_output = self.encoder_obj(inputs)
 
         return {"encoder_output": encoder_output}
 
     @property
     def input_dtype(self):
-        return torch.bool
+        return torch.int32
 
     @property
     def input_shape(self) -> torch.Size:
-        return torch.Size([len(self.vocab)])
+        return torch.Size([self.max_set_size])
 
     @staticmethod
     def update_config_with_metadata(input_feature, feature_metadata, *args, **kwargs):
         input_feature["vocab"] = feature_metadata["idx2str"]
+        input_feature["max_set_size"] = feature_metadata["max_set_size"]
 
     @staticmethod
     def populate_defaults(input_feature):
@@ -195,6 +201,19 @@ class SetOutputFeature(SetFeatureMixin, OutputFeature):
         hidden = inputs[HIDDEN]
         return self.decoder_obj(hidden)
 
+    def train_loss(self, targets, predictions, feature_name):
+        return super().train_loss(self._targets_to_dense(targets), predictions, feature_name)
+
+    def eval_loss(self, targets, predictions):
+        return super().eval_loss(self._targets_to_dense(targets), predictions)
+
+    def update_metrics(self, targets, predictions):
+        super().update_metrics(self._targets_to_dense(targets), predictions)
+
+    def _targets_to_dense(self, targets):
+        # target sets are stored as lists of indices
+        return index_lists_to_dense(targets, self.num_classes) > 0
+
     def loss_kwargs(self):
         return self.loss
 
@@ -48,7 +48,9 @@ from ludwig.utils.misc_utils import set_default_value, set_default_values
 from ludwig.utils.strings_utils import (
     build_sequence_matrix,
     create_vocabulary,
+    get_token_id_cache,
     PADDING_SYMBOL,
+    pop_token_id_cache,
     SpecialSymbol,
     tokenizer_registry,
     UNKNOWN_SYMBOL,
@@ -79,6 +81,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             "unknown_symbol": UNKNOWN_SYMBOL,
             "padding": "right",
             "lowercase": True,
+            "cache_token_ids": False,
             "missing_value_strategy": FILL_WITH_CONST,
             "fill_value": UNKNOWN_SYMBOL,
         }
@@ -99,6 +102,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             "unknown_symbol": {"type": "string"},
             "padding": {"type": "string", "enum": ["right", "left"]},
             "lowercase": {"type": "boolean"},
+            "cache_token_ids": {"type": "boolean"},
             "missing_value_strategy": {"type": "string", "enum": MISSING_VALUE_STRATEGY_OPTIONS},
             "fill_value": {"type": "string"},
             "computed_fill_value": {"type": "string"},
@@ -109,7 +113,7 @@ class TextFeatureMixin(BaseFeatureMixin):
         return column
 
     @staticmethod
-    def feature_meta(column, preprocessing_parameters, backend):
+    def feature_meta(column, preprocessing_parameters, backend, char_token_cache=None, word_token_cache=None):
         (
             char_idx2str,
             char_str2idx,
@@ -127,6 +131,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             padding_symbol=preprocessing_parameters["padding_symbol"],
             pretrained_model_name_or_path=preprocessing_parameters["pretrained_model_name_or_path"],
             processor=backend.df_engine,
+            token_cache=char_token_cache,
         )
         (
             word_idx2str,
@@ -146,6 +151,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             padding_symbol=preprocessing_parameters["padding_symbol"],
             pretrained_model_name_or_path=preprocessing_parameters["pretrained_model_name_or_path"],
             processor=backend.df_engine,
+            token_cache=word_token_cache,
         )
         return (
             char_idx2str,
@@ -167,7 +173,17 @@ class TextFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters, backend):
         column = column.astype(str)
-        tf_meta = TextFeatureMixin.feature_meta(column, preprocessing_parameters, backend)
+        char_token_cache, word_token_cache = None, None
+        if preprocessing_parameters["cache_token_ids"]:
+            char_token_cache = get_token_id_cache(column.name, "characters")
+            word_token_cache = get_token_id_cache(column.name, preprocessing_parameters["word_tokenizer"])
+        tf_meta = TextFeatureMixin.feature_meta(
+            column,
+            preprocessing_parameters,
+            backend,
+            char_token_cache=char_token_cache,
+            word_token_cache=word_token_cache,
+        )
         (
             char_idx2str,
             char_str2idx,
@@ -219,6 +235,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             tokenizer_vocab_file=preprocessing_parameters["char_vocab_file"],
             pretrained_model_name_or_path=preprocessing_parameters["pretrained_model_name_or_path"],
             processor=backend.df_engine,
+            token_cache=pop_token_id_cache(column.name, preprocessing_parameters["char_tokenizer"]),
         )
         word_data = build_sequence_matrix(
             sequences=column,
@@ -232,6 +249,7 @@ class TextFeatureMixin(BaseFeatureMixin):
             tokenizer_vocab_file=preprocessing_parameters["word_vocab_file"],
             pretrained_model_name_or_path=preprocessing_parameters["pretrained_model_name_or_path"],
             processor=backend.df_engine,
+            token_cache=pop_token_id_cache(column.name, preprocessing_parameters["word_tokenizer"]),
         )
 
         return char_data, word_data
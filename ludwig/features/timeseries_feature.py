@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import functools
 import logging
 
 import numpy as np
@@ -35,6 +36,20 @@ from ludwig.utils.strings_utils import tokenizer_registry
 logger = logging.getLogger(__name__)
 
 
+def _tokenize_timeseries(timeseries, tokenizer):
+    return np.array(tokenizer(timeseries)).astype(np.float32)
+
+
+def _pad_timeseries(vector, max_length, padding_value, padding):
+    padded = np.full((max_length,), padding_value, dtype=np.float32)
+    limit = min(vector.shape[0], max_length)
+    if padding == "right":
+        padded[:limit] = vector[:limit]
+    else:  # if padding == 'left
+        padded[max_length - limit :] = vector[:limit]
+    return padded
+
+
 class TimeseriesFeatureMixin(BaseFeatureMixin):
     @staticmethod
     def type():
@@ -83,22 +98,16 @@ class TimeseriesFeatureMixin(BaseFeatureMixin):
     def build_matrix(timeseries, tokenizer_name, length_limit, padding_value, padding, backend):
         tokenizer = get_from_registry(tokenizer_name, tokenizer_registry)()
 
-        ts_vectors = backend.df_engine.map_objects(timeseries, lambda ts: np.array(tokenizer(ts)).astype(np.float32))
+        ts_vectors = backend.df_engine.map_objects(
+            timeseries, functools.partial(_tokenize_timeseries, tokenizer=tokenizer)
+        )
 
         max_length = backend.df_engine.compute(ts_vectors.map(len).max())
         if max_length < length_limit:
             logger.debug(f"max length of {tokenizer_name}: {max_length} < limit: {length_limit}")
         max_length = length_limit
 
-        def pad(vector):
-            padded = np.full((max_length,), padding_value, dtype=np.float32)
-            limit = min(vector.shape[0], max_length)
-            if padding == "right":
-                padded[:limit] = vector[:limit]
-            else:  # if padding == 'left
-                padded[max_length - limit :] = vector[:limit]
-            return padded
-
+        pad = functools.partial(_pad_timeseries, max_length=max_length, padding_value=padding_value, padding=padding)
         return backend.df_engine.map_objects(ts_vectors, pad)
 
     @staticmethod
@@ -45,6 +45,10 @@ from ludwig.utils.torch_utils import LudwigModule
 logger = logging.getLogger(__name__)
 
 
+def _str_to_vector(vector_str):
+    return np.array(vector_str.split(), dtype=np.float32)
+
+
 class _VectorPredict(PredictModule):
     def forward(self, inputs: Dict[str, torch.Tensor], feature_name: str) -> Dict[str, torch.Tensor]:
         logits = output_feature_utils.get_output_feature_tensor(inputs, feature_name, self.logits_key)
@@ -95,7 +99,7 @@ class VectorFeatureMixin:
         # Convert the string of features into a numpy array
         try:
             proc_df[feature_config[PROC_COLUMN]] = backend.df_engine.map_objects(
-                input_df[feature_config[COLUMN]], lambda x: np.array(x.split(), dtype=np.float32)
+                input_df[feature_config[COLUMN]], _str_to_vector
             )
         except ValueError:
             logger.error(
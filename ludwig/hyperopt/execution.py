@@ -1,25 +1,34 @@
 import copy
 import datetime
+import functools
 import glob
 import json
 import logging
+import multiprocessing
 import os
+import pickle
 import shutil
+import tempfile
 import threading
 import time
 import traceback
 import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
+import torch
+
 from ludwig.api import LudwigModel
 from ludwig.backend import initialize_backend, RAY
 from ludwig.callbacks import Callback
 from ludwig.constants import COLUMN, MAXIMIZE, TEST, TRAINER, TRAINING, TYPE, VALIDATION
+from ludwig.data.dataset.base import Dataset
+from ludwig.data.dataset.pandas import PandasDataset
 from ludwig.hyperopt.results import HyperoptResults, RayTuneResults, TrialResults
 from ludwig.hyperopt.sampling import HyperoptSampler, RayTuneSampler
-from ludwig.hyperopt.utils import load_json_values
+from ludwig.hyperopt.utils import get_preprocessing_key, load_json_values
 from ludwig.modules.metric_modules import get_best_function
 from ludwig.utils.data_utils import NumpyEncoder
 from ludwig.utils.defaults import default_random_seed
@@ -144,6 +153,24 @@ class HyperoptExecutor(ABC):
             hyperopt_results, key=lambda hp_res: hp_res.metric_score, reverse=self.hyperopt_sampler.goal == MAXIMIZE
         )
 
+    def _get_experiment_kwargs(self, config, parameters, preprocessed_data, **kwargs) -> dict:
+        """Returns the arguments of `run_experiment` for a trial of the sampled `parameters`, trained and evaluated
+        on the training, validation and test sets and metadata of `preprocessed_data`.
+
+        The other `kwargs` are the arguments of `execute` passed on to every trial.
+        """
+        training_set, validation_set, test_set, training_set_metadata = preprocessed_data
+        return dict(
+            config=config,
+            parameters=parameters,
+            training_set=training_set,
+            validation_set=validation_set,
+            test_set=test_set,
+            training_set_metadata=training_set_metadata,
+            eval_split=self.split,
+            **kwargs,
+        )
+
     @abstractmethod
     def execute(
         self,
@@ -218,63 +245,74 @@ class SerialExecutor(HyperoptExecutor):
         debug=False,
         **kwargs,
     ) -> HyperoptResults:
+        preprocess_trial_groups = TrialGroupPreprocessor(
+            dataset=dataset,
+            training_set=training_set,
+            validation_set=validation_set,
+            test_set=test_set,
+            training_set_metadata=training_set_metadata,
+            data_format=data_format,
+            experiment_name=experiment_name,
+            skip_save_processed_input=skip_save_processed_input,
+            gpus=gpus,
+            gpu_memory_limit=gpu_memory_limit,
+            allow_parallel_threads=allow_parallel_threads,
+            callbacks=callbacks,
+            backend=backend,
+            random_seed=random_seed,
+        )
+        get_trial_kwargs = functools.partial(
+            self._get_experiment_kwargs,
+            data_format=data_format,
+            model_name=model_name,
+            skip_save_training_description=skip_save_training_description,
+            skip_save_training_statistics=skip_save_training_statistics,
+            skip_save_model=skip_save_model,
+            skip_save_progress=skip_save_progress,
+            skip_save_log=skip_save_log,
+            skip_save_processed_input=skip_save_processed_input,
+            skip_save_unprocessed_output=skip_save_unprocessed_output,
+            skip_save_predictions=skip_save_predictions,
+            skip_save_eval_stats=skip_save_eval_stats,
+            output_directory=output_directory,
+            gpus=gpus,
+            gpu_memory_limit=gpu_memory_limit,
+            allow_parallel_threads=allow_parallel_threads,
+            callbacks=callbacks,
+            backend=backend,
+            random_seed=random_seed,
+            debug=debug,
+        )
         trial_results = []
         trials = 0
         while not self.hyperopt_sampler.finished():
             sampled_parameters = self.hyperopt_sampler.sample_batch()
-            metric_scores = []
-
-            for i, parameters in enumerate(sampled_parameters):
-                modified_config = substitute_parameters(copy.deepcopy(config), parameters)
-
-                trial_id = trials + i
-
-                model = LudwigModel(
-                    config=modified_config,
-                    backend=backend,
-                    gpus=gpus,
-                    gpu_memory_limit=gpu_memory_limit,
-                    allow_parallel_threads=allow_parallel_threads,
-                    callbacks=callbacks,
-                )
-                eval_stats, train_stats, _, _ = model.experiment(
-                    dataset=dataset,
-                    training_set=training_set,
-                    validation_set=validation_set,
-                    test_set=test_set,
-                    training_set_metadata=training_set_metadata,
-                    data_format=data_format,
-                    experiment_name=f"{experiment_name}_{trial_id}",
-                    model_name=model_name,
-                    # model_load_path=model_load_path,
-                    # model_resume_path=model_resume_path,
-                    eval_split=self.split,
-                    skip_save_training_description=skip_save_training_description,
-                    skip_save_training_statistics=skip_save_training_statistics,
-                    skip_save_model=skip_save_model,
-                    skip_save_progress=skip_save_progress,
-                    skip_save_log=skip_save_log,
-                    skip_save_processed_input=skip_save_processed_input,
-                    skip_save_unprocessed_output=skip_save_unprocessed_output,
-                    skip_save_predictions=skip_save_predictions,
-                    skip_save_eval_stats=skip_save_eval_stats,
-                    output_directory=output_directory,
-                    skip_collect_predictions=True,
-                    skip_collect_overall_stats=False,
-                    random_seed=random_seed,
-                    debug=debug,
-                )
-                metric_score = self.get_metric_score(train_stats)
-                metric_scores.append(metric_score)
+            trial_configs = [
+                substitute_parameters(copy.deepcopy(config), parameters) for parameters in sampled_parameters
+            ]
+            metric_scores = [None] * len(sampled_parameters)
+            batch_trial_results = [None] * len(sampled_parameters)
+
+            for trial_ids, preprocessed_data in preprocess_trial_groups(trial_configs):
+                for i in trial_ids:
+                    train_stats, eval_stats = run_experiment(
+                        **get_trial_kwargs(
+                            trial_configs[i],
+                            sampled_parameters[i],
+                            preprocessed_data,
+                            experiment_name=f"{experiment_name}_{trials + i}",
+                        )
+                    )
+                    metric_score = self.get_metric_score(train_stats)
+                    metric_scores[i] = metric_score
 
-                trial_results.append(
-                    TrialResults(
-                        parameters=parameters,
+                    batch_trial_results[i] = TrialResults(
+                        parameters=sampled_parameters[i],
                         metric_score=metric_score,
                         training_stats=train_stats,
                         eval_stats=eval_stats,
                     )
-                )
+            trial_results.extend(batch_trial_results)
             trials += len(sampled_parameters)
 
             self.hyperopt_sampler.update_batch(zip(sampled_parameters, metric_scores))
@@ -283,6 +321,209 @@ class SerialExecutor(HyperoptExecutor):
         return HyperoptResults(ordered_trials=ordered_trials)
 
 
+def _init_trial_worker(num_threads):
+    torch.set_num_threads(num_threads)
+
+
+def _check_picklable(name, obj):
+    try:
+        pickle.dumps(obj)
+    except Exception as e:
+        raise ValueError(
+            f"The {name} must be picklable to be sent to the worker processes of the parallel executor, but pickling "
+            f"failed with: {e}"
+        ) from e
+
+
+def _memory_map_data(preprocessed_data, data_dir):
+    """Returns the preprocessed training, validation and test sets memory-mapped from files in `data_dir`, so that
+    the trials sent to the worker processes only carry references to the files."""
+    training_set, validation_set, test_set, training_set_metadata = preprocessed_data
+    return (
+        *(
+            dataset.to_memory_mapped(os.path.join(data_dir, split)) if isinstance(dataset, PandasDataset) else dataset
+            for split, dataset in ((TRAINING, training_set), (VALIDATION, validation_set), (TEST, test_set))
+        ),
+        training_set_metadata,
+    )
+
+
+class ParallelExecutor(HyperoptExecutor):
+    """Runs each batch of sampled trials concurrently in a pool of local processes.
+
+    Each worker process limits torch to `num_threads_per_trial` threads, which defaults to splitting the CPUs of the
+    machine evenly between the `num_workers` processes. The preprocessed data is memory-mapped from temporary files in
+    the output directory, so that the workers read it from disk instead of receiving a copy of it with each trial.
+    """
+
+    def __init__(
+        self,
+        hyperopt_sampler: HyperoptSampler,
+        output_feature: str,
+        metric: str,
+        split: str,
+        num_workers: int = 2,
+        num_threads_per_trial: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        HyperoptExecutor.__init__(self, hyperopt_sampler, output_feature, metric, split)
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be a positive integer, got {num_workers}")
+        self.num_workers = num_workers
+        self.num_threads_per_trial = num_threads_per_trial or max(os.cpu_count() // num_workers, 1)
+
+    def execute(
+        self,
+        config,
+        dataset=None,
+        training_set=None,
+        validation_set=None,
+        test_set=None,
+        training_set_metadata=None,
+        data_format=None,
+        experiment_name="hyperopt",
+        model_name="run",
+        # model_load_path=None,
+        # model_resume_path=None,
+        skip_save_training_description=False,
+        skip_save_training_statistics=False,
+        skip_save_model=False,
+        skip_save_progress=False,
+        skip_save_log=False,
+        skip_save_processed_input=True,
+        skip_save_unprocessed_output=False,
+        skip_save_predictions=False,
+        skip_save_eval_stats=False,
+        output_directory="results",
+        gpus=None,
+        gpu_memory_limit=None,
+        allow_parallel_threads=True,
+        callbacks=None,
+        backend=None,
+        random_seed=default_random_seed,
+        debug=False,
+        **kwargs,
+    ) -> HyperoptResults:
+        # fail before preprocessing anything rather than when the first trial is submitted
+        _check_picklable("backend", backend)
+        _check_picklable("callbacks", callbacks)
+
+        preprocess_trial_groups = TrialGroupPreprocessor(
+            dataset=dataset,
+            training_set=training_set,
+            validation_set=validation_set,
+            test_set=test_set,
+            training_set_metadata=training_set_metadata,
+            data_format=data_format,
+            experiment_name=experiment_name,
+            skip_save_processed_input=skip_save_processed_input,
+            gpus=gpus,
+            gpu_memory_limit=gpu_memory_limit,
+            allow_parallel_threads=allow_parallel_threads,
+            callbacks=callbacks,
+            backend=backend,
+            random_seed=random_seed,
+        )
+        get_trial_kwargs = functools.partial(
+            self._get_experiment_kwargs,
+            data_format=data_format,
+            model_name=model_name,
+            skip_save_training_description=skip_save_training_description,
+            skip_save_training_statistics=skip_save_training_statistics,
+            skip_save_model=skip_save_model,
+            skip_save_progress=skip_save_progress,
+            skip_save_log=skip_save_log,
+            skip_save_processed_input=skip_save_processed_input,
+            skip_save_unprocessed_output=skip_save_unprocessed_output,
+            skip_save_predictions=skip_save_predictions,
+            skip_save_eval_stats=skip_save_eval_stats,
+            output_directory=output_directory,
+            gpus=gpus,
+            gpu_memory_limit=gpu_memory_limit,
+            allow_parallel_threads=allow_parallel_threads,
+            callbacks=callbacks,
+            backend=backend,
+            random_seed=random_seed,
+            debug=debug,
+        )
+        trial_results = []
+        trials = 0
+        # the preprocessed data of the last group of the previous batch, its memory-mapped copy and their directory
+        last_mapped_group = None
+        data_root = None if has_remote_protocol(output_directory) else output_directory
+        if data_root is not None:
+            os.makedirs(data_root, exist_ok=True)
+        # spawn rather than fork, as forking after torch has started its thread pools can deadlock
+        with tempfile.TemporaryDirectory(prefix="hyperopt_data_", dir=data_root) as data_dir, ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_trial_worker,
+            initargs=(self.num_threads_per_trial,),
+        ) as pool:
+            while not self.hyperopt_sampler.finished():
+                # samplers that suggest one trial at a time (e.g. pysot) are asked for one trial per worker
+                sampled_parameters = self.hyperopt_sampler.sample_batch(
+                    max(self.hyperopt_sampler.default_batch_size, self.num_workers)
+                )
+                trial_configs = [
+                    substitute_parameters(copy.deepcopy(config), parameters) for parameters in sampled_parameters
+                ]
+
+                futures = [None] * len(sampled_parameters)
+                batch_group_dirs = set()
+                mapped_group = None
+                for trial_ids, preprocessed_data in preprocess_trial_groups(trial_configs):
+                    # data that was already memory-mapped for the previous batch, like the data of its last group or
+                    # datasets that were preprocessed before running hyperopt, is not written again
+                    if last_mapped_group is not None and all(
+                        a is b for a, b in zip(last_mapped_group[0], preprocessed_data)
+                    ):
+                        mapped_group = last_mapped_group
+                    else:
+                        group_dir = tempfile.mkdtemp(dir=data_dir)
+                        mapped_group = (preprocessed_data, _memory_map_data(preprocessed_data, group_dir), group_dir)
+                    batch_group_dirs.add(mapped_group[2])
+
+                    for i in trial_ids:
+                        experiment_kwargs = get_trial_kwargs(
+                            trial_configs[i],
+                            sampled_parameters[i],
+                            mapped_group[1],
+                            experiment_name=f"{experiment_name}_{trials + i}",
+                        )
+                        futures[i] = pool.submit(_run_experiment_unary, experiment_kwargs)
+
+                metric_scores = []
+                for parameters, future in zip(sampled_parameters, futures):
+                    train_stats, eval_stats = future.result()
+                    metric_score = self.get_metric_score(train_stats)
+                    metric_scores.append(metric_score)
+
+                    trial_results.append(
+                        TrialResults(
+                            parameters=parameters,
+                            metric_score=metric_score,
+                            training_stats=train_stats,
+                            eval_stats=eval_stats,
+                        )
+                    )
+                trials += len(sampled_parameters)
+
+                # the trials of the batch are done, so only the data of its last group is kept to be reused
+                if last_mapped_group is not None:
+                    batch_group_dirs.add(last_mapped_group[2])
+                if mapped_group is not None:
+                    batch_group_dirs.discard(mapped_group[2])
+                for group_dir in batch_group_dirs:
+                    shutil.rmtree(group_dir)
+                last_mapped_group = mapped_group
+
+                self.hyperopt_sampler.update_batch(zip(sampled_parameters, metric_scores))
+
+        ordered_trials = self.sort_hyperopt_results(trial_results)
+        return HyperoptResults(ordered_trials=ordered_trials)
+
+
 class RayTuneExecutor(HyperoptExecutor):
     def __init__(
         self,
@@ -803,11 +1044,113 @@ class RayTuneExecutor(HyperoptExecutor):
         return RayTuneResults(ordered_trials=ordered_trials, experiment_analysis=analysis)
 
 
+class TrialGroupPreprocessor:
+    """Preprocesses the data once per group of trials that preprocess it in the same way.
+
+    Called with the configs of a batch of trials, yields the indices of the trials of each group together with their
+    preprocessed training, validation and test sets and training set metadata. The data is preprocessed right before
+    its group is yielded, so sampled parameters that do not change the preprocessing never cause the raw dataset to be
+    preprocessed again, and only one version of the preprocessed data needs to be held at a time. The data of the last
+    group is kept across batches, so samplers that suggest one trial at a time do not preprocess it again either.
+    """
+
+    def __init__(
+        self,
+        dataset=None,
+        training_set=None,
+        validation_set=None,
+        test_set=None,
+        training_set_metadata=None,
+        data_format=None,
+        experiment_name="hyperopt",
+        skip_save_processed_input=True,
+        gpus=None,
+        gpu_memory_limit=None,
+        allow_parallel_threads=True,
+        callbacks=None,
+        backend=None,
+        random_seed=default_random_seed,
+    ):
+        self.dataset = dataset
+        self.training_set = training_set
+        self.validation_set = validation_set
+        self.test_set = test_set
+        self.training_set_metadata = training_set_metadata
+        self.data_format = data_format
+        self.experiment_name = experiment_name
+        self.skip_save_processed_input = skip_save_processed_input
+        self.gpus = gpus
+        self.gpu_memory_limit = gpu_memory_limit
+        self.allow_parallel_threads = allow_parallel_threads
+        self.callbacks = callbacks
+        self.backend = backend
+        self.random_seed = random_seed
+
+        self._last_key = None
+        self._last_data = None
+
+    def __call__(self, trial_configs):
+        if isinstance(self.training_set, Dataset) and self.training_set_metadata is not None:
+            # the data was already preprocessed once for all the trials
+            yield list(range(len(trial_configs))), (
+                self.training_set,
+                self.validation_set,
+                self.test_set,
+                self.training_set_metadata,
+            )
+            return
+
+        trial_groups = {}
+        if self._last_key is not None:
+            # the group of the data that is still held goes first, so that it can be released after it
+            trial_groups[self._last_key] = []
+        for i, trial_config in enumerate(trial_configs):
+            trial_groups.setdefault(get_preprocessing_key(trial_config), []).append(i)
+
+        for key, trial_ids in trial_groups.items():
+            if not trial_ids:
+                continue
+            if key != self._last_key:
+                # the previous version of the data is released before preprocessing the next one
+                self._last_key, self._last_data = None, None
+                self._last_data = self._preprocess(trial_configs[trial_ids[0]])
+                self._last_key = key
+            yield trial_ids, self._last_data
+
+    def _preprocess(self, config):
+        for callback in self.callbacks or []:
+            callback.on_hyperopt_preprocessing_start(self.experiment_name)
+
+        model = LudwigModel(
+            config=config,
+            backend=self.backend,
+            gpus=self.gpus,
+            gpu_memory_limit=self.gpu_memory_limit,
+            allow_parallel_threads=self.allow_parallel_threads,
+            callbacks=self.callbacks,
+        )
+        preprocessed_data = model.preprocess(
+            dataset=self.dataset,
+            training_set=self.training_set,
+            validation_set=self.validation_set,
+            test_set=self.test_set,
+            training_set_metadata=self.training_set_metadata,
+            data_format=self.data_format,
+            skip_save_processed_input=self.skip_save_processed_input,
+            random_seed=self.random_seed,
+        )
+
+        for callback in self.callbacks or []:
+            callback.on_hyperopt_preprocessing_end(self.experiment_name)
+
+        return preprocessed_data
+
+
 def get_build_hyperopt_executor(executor_type):
     return get_from_registry(executor_type, executor_registry)
 
 
-executor_registry = {"serial": SerialExecutor, "ray": RayTuneExecutor}
+executor_registry = {"serial": SerialExecutor, "parallel": ParallelExecutor, "ray": RayTuneExecutor}
 
 
 def set_values(model_dict, name, parameters_dict):
@@ -929,5 +1272,5 @@ def run_experiment(
 
 
 def _run_experiment_unary(kwargs):
-    """Unary function is needed by Fiber to map a list of args."""
+    """Unary function is needed to map a list of args in a process pool."""
     return run_experiment(**kwargs)
@@ -2,9 +2,10 @@ import json
 import logging
 import os
 
-from ludwig.constants import HYPEROPT, PARAMETERS, PREPROCESSING
+from ludwig.constants import COLUMN, HYPEROPT, NAME, PARAMETERS, PREPROCESSING, TYPE
 from ludwig.hyperopt.results import HyperoptResults
 from ludwig.utils.data_utils import save_json
+from ludwig.utils.misc_utils import hash_dict
 from ludwig.utils.print_utils import print_boxed
 
 logger = logging.getLogger(__name__)
@@ -40,3 +41,15 @@ def should_tune_preprocessing(config):
         if f"{PREPROCESSING}." in param_name:
             return True
     return False
+
+
+def get_preprocessing_key(config):
+    """Returns a key that is the same for all the configs that preprocess the data in the same way."""
+    features = config["input_features"] + config["output_features"]
+    info = {
+        "global_preprocessing": config.get(PREPROCESSING, {}),
+        "features": [
+            [feature[NAME], feature[TYPE], feature.get(COLUMN), feature.get(PREPROCESSING, {})] for feature in features
+        ],
+    }
+    return hash_dict(info, max_length=None).decode("ascii")
@@ -16,6 +16,7 @@
 """This module contains the class and auxiliary methods of a model."""
 import gc
 import logging
+import math
 import os
 import os.path
 import signal
@@ -56,6 +57,9 @@ from ludwig.utils.misc_utils import set_random_seed
 
 logger = logging.getLogger(__name__)
 
+# Data types the forward pass and loss are autocast to for each mixed precision mode
+MIXED_PRECISION_DTYPES = {None: None, "bf16": torch.bfloat16, "fp16": torch.float16}
+
 
 class BaseTrainer(ABC):
     @abstractmethod
@@ -125,6 +129,9 @@ class Trainer(BaseTrainer):
         increase_batch_size_eval_metric=LOSS,
         increase_batch_size_eval_split=TRAINING,
         learning_rate_warmup_epochs=1,
+        prefetch_batches=0,
+        gradient_accumulation_steps=1,
+        mixed_precision=None,
         resume=False,
         skip_save_model=False,
         skip_save_progress=False,
@@ -203,6 +210,23 @@ class Trainer(BaseTrainer):
         :param learning_rate_warmup_epochs: The number of epochs to warmup the
                learning rate for.
         :type learning_rate_warmup_epochs: Integer
+        :param prefetch_batches: Number of training batches to assemble ahead
+               of time in background threads while the model trains on the
+               current batch. When training on GPU, prefetched batches are
+               also copied to pinned memory. 0 disables prefetching.
+        :type prefetch_batches: Integer
+        :param gradient_accumulation_steps: Number of batches whose gradients
+               are accumulated before each optimizer step, so that the
+               effective batch size is `batch_size` times this number while
+               only `batch_size` samples are in memory at once. Learning rate
+               warmup and decay are counted in optimizer steps.
+        :type gradient_accumulation_steps: Integer
+        :param mixed_precision: Runs the forward pass and the loss in lower
+               precision with `torch.autocast`, either `bf16` or `fp16`. With
+               `fp16` the loss is scaled to keep small gradients from
+               underflowing, which requires a CUDA device, otherwise `bf16` is
+               used. `None` trains in full precision.
+        :type mixed_precision: str
         :param resume: Resume training a model that was being trained.
         :type resume: Boolean
         :param skip_save_model: disables
@@ -272,6 +296,12 @@ class Trainer(BaseTrainer):
         self.increase_batch_size_eval_metric = increase_batch_size_eval_metric
         self.increase_batch_size_eval_split = increase_batch_size_eval_split
         self.learning_rate_warmup_epochs = learning_rate_warmup_epochs
+        self.prefetch_batches = prefetch_batches
+        if not isinstance(gradient_accumulation_steps, int) or gradient_accumulation_steps < 1:
+            raise ValueError(
+                f"Invalid gradient_accumulation_steps {gradient_accumulation_steps}, expected a positive integer"
+            )
+        self.gradient_accumulation_steps = gradient_accumulation_steps
         self.resume = resume
         self.skip_save_model = skip_save_model
         self.skip_save_progress = skip_save_progress
@@ -293,49 +323,88 @@ class Trainer(BaseTrainer):
             optimizer = {TYPE: "Adam"}
         # Most optimizers require 'lr' parameter.  set_optimizer_learning_rate will update this during training.
         optimizer = {**optimizer, "lr": base_learning_rate}
-        self.optimizer, self.clipper = create_optimizer_with_clipper(model, horovod=horovod, **optimizer)
+        self.optimizer, self.clipper = create_optimizer_with_clipper(
+            model, horovod=horovod, backward_passes_per_step=gradient_accumulation_steps, **optimizer
+        )
+
+        # ================ Mixed precision ================
+        if mixed_precision not in MIXED_PRECISION_DTYPES:
+            raise ValueError(
+                f"Invalid mixed_precision {mixed_precision}, expected one of "
+                f"{[k for k in MIXED_PRECISION_DTYPES if k is not None]} or None"
+            )
+        self.device_type = torch.device(self.device).type
+        if mixed_precision == "fp16" and self.device_type != "cuda":
+            logger.warning("fp16 mixed precision requires a CUDA device, training with bf16 mixed precision instead")
+            mixed_precision = "bf16"
+        self.mixed_precision = mixed_precision
+        self.autocast_dtype = MIXED_PRECISION_DTYPES[mixed_precision]
+        # when disabled, the scaler leaves the loss and gradients untouched and steps the optimizer as usual
+        self.scaler = torch.cuda.amp.GradScaler(enabled=self.autocast_dtype == torch.float16)
+
+        # number of batches whose gradients have been accumulated since the last optimizer step
+        self._accumulated_batches = 0
 
     def train_step(
-        self, inputs: Dict[str, torch.Tensor], targets: Dict[str, torch.Tensor]
+        self, inputs: Dict[str, torch.Tensor], targets: Dict[str, torch.Tensor], should_step: bool = True
     ) -> Tuple[torch.Tensor, Dict[str, torch.Tensor]]:
         """Performs a single training step.
 
         Params:
             inputs: A dictionary of input data, from feature name to tensor.
             targets: A dictionary of target data, from feature name to tensor.
+            should_step: Whether to update the weights after this batch, otherwise its gradients are accumulated
+                with the ones of the following batches.
 
         Returns:
             A tuple of the loss and a dictionary of metrics.
         """
-        self.optimizer.zero_grad()
+        if self._accumulated_batches == 0:
+            self.optimizer.zero_grad()
 
         # Obtain model predictions and loss
-        model_outputs = self.model((inputs, targets))
-        loss, all_losses = self.model.train_loss(
-            targets, model_outputs, self.regularization_type, self.regularization_lambda
-        )
+        with torch.autocast(self.device_type, dtype=self.autocast_dtype, enabled=self.autocast_dtype is not None):
+            model_outputs = self.model((inputs, targets))
+            loss, all_losses = self.model.train_loss(
+                targets, model_outputs, self.regularization_type, self.regularization_lambda
+            )
 
         # Begin the backward pass
         variables = self.model.parameters()
-        loss.backward()
+        self.scaler.scale(loss).backward()
+        self._accumulated_batches += 1
+        if not should_step:
+            return loss, all_losses
 
         if self.horovod:
             # Wait for gradient aggregation to complete before clipping the gradients
             self.optimizer.synchronize()
 
-        # Clip gradients
+        # Clip gradients, once unscaled so that the clipping thresholds apply to the actual gradients
+        self.scaler.unscale_(self.optimizer)
+        if self._accumulated_batches > 1:
+            # the gradients of the accumulated batches are summed, average them
+            for param in self.model.parameters():
+                if param.grad is not None:
+                    param.grad.div_(self._accumulated_batches)
+        self._accumulated_batches = 0
         self.clipper.clip_grads(variables)
 
-        # Apply gradient updates
+        # Apply gradient updates, skipped by the scaler if the scaled gradients overflowed
         if self.horovod:
             # Because we already synchronized above, we can doing so here
             with self.optimizer.skip_synchronize():
-                self.optimizer.step()
+                self.scaler.step(self.optimizer)
         else:
-            self.optimizer.step()
+            self.scaler.step(self.optimizer)
+        self.scaler.update()
 
         return loss, all_losses
 
+    def get_steps_per_epoch(self, batcher) -> int:
+        """Returns the number of optimizer steps in an epoch, each accumulating the gradients of several batches."""
+        return int(math.ceil(batcher.steps_per_epoch / self.gradient_accumulation_steps))
+
     def set_base_learning_rate(self, base_learning_rate):
         """Sets the target learning rate, and updates the optimizer learning rate."""
         if self.horovod:
@@ -717,6 +786,9 @@ class Trainer(BaseTrainer):
             should_shuffle=self.should_shuffle,
             seed=self.random_seed,
             horovod=self.horovod,
+            prefetch_batches=self.prefetch_batches,
+            # pinning only pays off when batches are copied in the background while the model trains
+            pin_memory=self.prefetch_batches > 0 and torch.device(self.device).type == "cuda",
         ) as batcher:
 
             # ================ Training Loop ================
@@ -740,7 +812,7 @@ class Trainer(BaseTrainer):
                 if self.is_coordinator():
                     progress_bar = tqdm(
                         desc="Training",
-                        total=batcher.steps_per_epoch,
+                        total=self.get_steps_per_epoch(batcher),
                         file=sys.stdout,
                         disable=is_progressbar_disabled(),
                     )
@@ -882,10 +954,12 @@ class Trainer(BaseTrainer):
         )
 
     def _train_loop(self, batcher, progress_tracker, save_path, train_summary_writer, progress_bar):
+        steps_per_epoch = self.get_steps_per_epoch(batcher)
         while not batcher.last_batch():
             self.callback(lambda c: c.on_batch_start(self, progress_tracker, save_path))
 
-            # Set learning rate for this batch
+            # Set learning rate for this batch, warmup and decay advance with optimizer steps rather than batches
+            step = batcher.step // self.gradient_accumulation_steps
             current_learning_rate = progress_tracker.learning_rate
 
             if self.decay:
@@ -904,8 +978,8 @@ class Trainer(BaseTrainer):
                         progress_tracker.epoch,
                         self.learning_rate_warmup_epochs,
                         self.horovod.size(),
-                        batcher.step,
-                        batcher.steps_per_epoch,
+                        step,
+                        steps_per_epoch,
                     )
                     * self.horovod.size()
                 )
@@ -914,21 +988,22 @@ class Trainer(BaseTrainer):
                     current_learning_rate,
                     progress_tracker.epoch,
                     self.learning_rate_warmup_epochs,
-                    batcher.step,
-                    batcher.steps_per_epoch,
+                    step,
+                    steps_per_epoch,
                 )
             self.set_optimizer_learning_rate(current_learning_rate)
 
             # obtain batch
             batch = batcher.next_batch()
 
-            # Move tensors to cuda here.
+            # Move tensors to cuda here. Batches pinned by the batcher are tensors
+            # already, whose copy to the device overlaps with the training step.
             inputs = {
-                i_feat.feature_name: torch.from_numpy(batch[i_feat.proc_column]).to(self.device)
+                i_feat.feature_name: torch.as_tensor(batch[i_feat.proc_column]).to(self.device, non_blocking=True)
                 for i_feat in self.model.input_features.values()
             }
             targets = {
-                o_feat.feature_name: torch.from_numpy(batch[o_feat.proc_column]).to(self.device)
+                o_feat.feature_name: torch.as_tensor(batch[o_feat.proc_column]).to(self.device, non_blocking=True)
                 for o_feat in self.model.output_features.values()
             }
 
@@ -936,10 +1011,16 @@ class Trainer(BaseTrainer):
             # if first_batch and self.is_coordinator() and not skip_save_log:
             #    tf.summary.trace_on(graph=True, profiler=True)
 
+            # the weights are updated once enough batches are accumulated, and at the end of the epoch
+            should_step = batcher.step % self.gradient_accumulation_steps == 0 or batcher.last_batch()
             loss, all_losses = self.train_step(
                 inputs,
                 targets,
+                should_step=should_step,
             )
+            if not should_step:
+                self.callback(lambda c: c.on_batch_end(self, progress_tracker, save_path))
+                continue
 
             # Reintroduce for tensorboard graph
             # if first_batch and self.is_coordinator() and not skip_save_log:
@@ -979,7 +1060,7 @@ class Trainer(BaseTrainer):
             # training step loop
             progress_bar = tqdm(
                 desc="Training online",
-                total=batcher.steps_per_epoch,
+                total=self.get_steps_per_epoch(batcher),
                 file=sys.stdout,
                 disable=is_progressbar_disabled(),
             )
@@ -995,12 +1076,15 @@ class Trainer(BaseTrainer):
                     for o_feat in self.model.output_features.values()
                 }
 
+                should_step = batcher.step % self.gradient_accumulation_steps == 0 or batcher.last_batch()
                 self.train_step(
                     inputs,
                     targets,
+                    should_step=should_step,
                 )
 
-                progress_bar.update(1)
+                if should_step:
+                    progress_bar.update(1)
 
             progress_bar.close()
         return self.model
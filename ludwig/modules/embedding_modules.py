@@ -21,13 +21,32 @@ from torch import nn
 from ludwig.constants import TYPE
 from ludwig.modules.initializer_modules import get_initializer
 from ludwig.utils.data_utils import load_pretrained_embeddings
-from ludwig.utils.torch_utils import LudwigModule
+from ludwig.utils.torch_utils import index_lists_to_dense, LudwigModule
 
 logger = logging.getLogger(__name__)
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
 
+class OneHotEmbedding(nn.Module):
+    """Embeds indices as one-hot vectors, equivalent to a frozen nn.Embedding initialized to the identity matrix
+    but without storing it."""
+
+    def __init__(self, num_embeddings: int):
+        super().__init__()
+        self.num_embeddings = num_embeddings
+        self.embedding_dim = num_embeddings
+
+    def forward(self, inputs: torch.Tensor) -> torch.Tensor:
+        return nn.functional.one_hot(inputs.long(), self.num_embeddings).float()
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # models saved before sparse embeddings were computed on the fly stored the identity matrix as the weight of
+        # an nn.Embedding, which is dropped so that they can still be loaded
+        state_dict.pop(prefix + "weight", None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+
+
 def embedding_matrix(
     vocab: List[str],
     embedding_size: int,
@@ -37,7 +56,8 @@ def embedding_matrix(
     force_embedding_size: bool = False,
     embedding_initializer: Optional[Union[str, Dict]] = None,
 ) -> Tuple[nn.Module, int]:
-    """Returns initialized torch.nn.Embedding module and embedding size."""
+    """Returns initialized torch.nn.Embedding module (OneHotEmbedding for sparse representations) and embedding
+    size."""
 
     vocab_size = len(vocab)
     if representation == "dense":
@@ -74,9 +94,9 @@ def embedding_matrix(
         embeddings = embedding_initializer_obj
 
     elif representation == "sparse":
-        embedding_size = vocab_size
-        embeddings = get_initializer("identity")([vocab_size, embedding_size])
-        embeddings.requires_grad = False
+        # one-hot encodings are computed on the fly, as a vocab_size x vocab_size identity matrix does not fit in
+        # memory for large vocabularies
+        return OneHotEmbedding(vocab_size), vocab_size
     else:
         raise Exception(f"Embedding representation {representation} not supported.")
 
@@ -186,6 +206,7 @@ class EmbedSet(LudwigModule):
         self.supports_masking = True
 
         self.vocab_size = len(vocab)
+        self.representation = representation
         self.embeddings, self.embedding_size = embedding_matrix_on_device(
             vocab,
             embedding_size,
@@ -202,12 +223,9 @@ class EmbedSet(LudwigModule):
         else:
             self.dropout = None
 
-        if aggregation_function == "sum":
-            self.aggregation_function = torch.sum
-        elif aggregation_function == "avg":
-            self.aggregation_function = torch.mean
-        else:
+        if aggregation_function not in {"sum", "avg"}:
             raise ValueError(f"Unsupported aggregation function {aggregation_function}")
+        self.aggregation_function = aggregation_function
 
         self.register_buffer("vocab_indices", torch.arange(self.vocab_size))
 
@@ -219,12 +237,17 @@ class EmbedSet(LudwigModule):
         """
         # Convert multi-hot input to input of indices
         inputs = inputs.int() * self.vocab_indices
-        embedded = self.embeddings(inputs.long())
         # Mask out the 0th embedding
-        mask = torch.unsqueeze(inputs, -1)
-        embedded = embedded * mask
-        # Sum over all positive tokens
-        embedded = self.aggregation_function(embedded, dim=1)
+        mask = (inputs != 0).float()
+        if self.representation == "sparse":
+            # One-hot embeddings of the positive tokens sum up to the masked multi-hot input
+            embedded = mask
+        else:
+            embedded = self.embeddings(inputs.long())
+            # Sum over all positive tokens
+            embedded = torch.sum(embedded * torch.unsqueeze(mask, -1), dim=1)
+        if self.aggregation_function == "avg":
+            embedded = embedded / self.vocab_size
         if self.dropout:
             embedded = self.dropout(embedded)
         return embedded
@@ -270,6 +293,7 @@ class EmbedWeighted(LudwigModule):
             embedding_initializer=embedding_initializer,
         )
         self.vocab_size = len(vocab)
+        self.representation = representation
 
         if dropout > 0:
             self.dropout = nn.Dropout(dropout)
@@ -284,15 +308,19 @@ class EmbedWeighted(LudwigModule):
             inputs: Tensor of frequencies, where inputs[b, i] represents
                     frequency of token i in sample b of batch.
         """
-        # Convert to multi-hot input
-        signed_input = (inputs != 0).type(torch.int32)
-        multiple_hot_indexes = signed_input * self.vocab_indices
-        embedded = self.embeddings(multiple_hot_indexes)
-        # Mask out the 0th embedding
-        mask = torch.unsqueeze(inputs, -1)
-        weighted_embedded = embedded * mask
-        # Sum over the all the positive indices
-        embedded_reduced = torch.sum(weighted_embedded, dim=1)
+        if self.representation == "sparse":
+            # One-hot embeddings weighted by the token frequencies sum up to the frequencies themselves
+            embedded_reduced = inputs.float()
+        else:
+            # Convert to multi-hot input
+            signed_input = (inputs != 0).type(torch.int32)
+            multiple_hot_indexes = signed_input * self.vocab_indices
+            embedded = self.embeddings(multiple_hot_indexes)
+            # Mask out the 0th embedding
+            mask = torch.unsqueeze(inputs, -1)
+            weighted_embedded = embedded * mask
+            # Sum over the all the positive indices
+            embedded_reduced = torch.sum(weighted_embedded, dim=1)
         if self.dropout:
             embedded_reduced = self.dropout(embedded_reduced)
         return embedded_reduced
@@ -306,6 +334,96 @@ class EmbedWeighted(LudwigModule):
         return torch.Size([self.embedding_size])
 
 
+class EmbedBag(LudwigModule):
+    """Module to embed Set and Bag data types with torch.nn.EmbeddingBag, works on padded lists of token indices.
+
+    Unlike EmbedSet and EmbedWeighted, no [batch x vocab_size x embedding_size] intermediate is created: only the
+    embeddings of the tokens present in each sample are looked up and reduced.
+    """
+
+    def __init__(
+        self,
+        vocab: List[str],
+        embedding_size: int,
+        representation: str = "dense",
+        embeddings_trainable: bool = True,
+        pretrained_embeddings: Optional[str] = None,
+        force_embedding_size: bool = False,
+        embeddings_on_cpu: bool = False,
+        dropout: float = 0.0,
+        embedding_initializer: Optional[Union[str, Dict]] = None,
+        aggregation_function: str = "sum",
+        max_set_size: int = 1,
+    ):
+        super().__init__()
+        self.supports_masking = True
+
+        if aggregation_function == "sum":
+            mode = "sum"
+        elif aggregation_function == "avg":
+            mode = "mean"
+        else:
+            raise ValueError(f"Unsupported aggregation function {aggregation_function}")
+        self.mode = mode
+
+        self.vocab_size = len(vocab)
+        self.max_set_size = max_set_size
+        embeddings, self.embedding_size = embedding_matrix_on_device(
+            vocab,
+            embedding_size,
+            representation=representation,
+            embeddings_trainable=embeddings_trainable,
+            pretrained_embeddings=pretrained_embeddings,
+            force_embedding_size=force_embedding_size,
+            embeddings_on_cpu=embeddings_on_cpu,
+            embedding_initializer=embedding_initializer,
+        )
+        if representation == "sparse":
+            # the one-hot embeddings of a bag of tokens reduce to its (normalized) token counts
+            self.embeddings = None
+        else:
+            self.embeddings = nn.EmbeddingBag.from_pretrained(
+                embeddings.weight, freeze=not embeddings.weight.requires_grad, mode=mode
+            )
+
+        if dropout > 0:
+            self.dropout = nn.Dropout(dropout)
+        else:
+            self.dropout = None
+
+    def forward(self, inputs: torch.Tensor, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Params:
+            inputs: Tensor of token indices of size [batch x max_set_size], padded with -1. Repeated
+                    indices (as stored for bags) are counted once per occurrence.
+        """
+        valid = inputs >= 0
+        lengths = valid.sum(dim=1)
+        if self.embeddings is None:
+            embedded = index_lists_to_dense(inputs, self.vocab_size)
+            if self.mode == "mean":
+                embedded = embedded / torch.clamp(lengths, min=1).unsqueeze(-1)
+        else:
+            # Flatten the padded lists into the (indices, offsets) form consumed by EmbeddingBag
+            offsets = torch.cumsum(lengths, dim=0) - lengths
+            embedded = self.embeddings(inputs[valid].long(), offsets)
+        if self.dropout:
+            embedded = self.dropout(embedded)
+        return embedded
+
+    @property
+    def input_shape(self) -> torch.Size:
+        return torch.Size([self.max_set_size])
+
+    @property
+    def output_shape(self) -> torch.Size:
+        return torch.Size([self.embedding_size])
+
+    @property
+    def input_dtype(self):
+        return torch.int32
+
+
 # TODO(shreya): Implement sparse embedding lookup.
 # class EmbedSparse(LudwigModule):
 #     def __init__(
@@ -50,19 +50,28 @@ class Clipper:
 
 
 def create_optimizer_with_clipper(
-    model, type="sgd", clipglobalnorm=5.0, clipnorm=None, clipvalue=None, horovod=None, **kwargs
+    model,
+    type="sgd",
+    clipglobalnorm=5.0,
+    clipnorm=None,
+    clipvalue=None,
+    horovod=None,
+    backward_passes_per_step=1,
+    **kwargs,
 ):
     optimizer_cls = get_from_registry(type.lower(), optimizers_registry)
-    optimizer = create_optimizer(optimizer_cls, model, horovod, **kwargs)
+    optimizer = create_optimizer(optimizer_cls, model, horovod, backward_passes_per_step, **kwargs)
     clipper = Clipper(clipglobalnorm=clipglobalnorm, clipnorm=clipnorm, clipvalue=clipvalue)
     return optimizer, clipper
 
 
-def create_optimizer(optimizer_cls, model, horovod=None, **kwargs):
+def create_optimizer(optimizer_cls, model, horovod=None, backward_passes_per_step=1, **kwargs):
     optimizer = optimizer_cls(params=model.parameters(), **kwargs)
     if horovod:
+        # gradients accumulated over several backward passes are only reduced across workers once per step
         optimizer = horovod.DistributedOptimizer(
             optimizer,
             named_parameters=model.named_parameters(),
+            backward_passes_per_step=backward_passes_per_step,
         )
     return optimizer
@@ -14,19 +14,24 @@
 # limitations under the License.
 # ==============================================================================
 import argparse
+import asyncio
+import copy
+import functools
 import io
 import json
 import logging
-import os
+import multiprocessing
 import sys
-import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import pandas as pd
 import torch
 from torchvision.io import decode_image
 
 from ludwig.api import LudwigModel
-from ludwig.constants import AUDIO, COLUMN
+from ludwig.constants import AUDIO, BINARY, CATEGORY, COLUMN, NAME, NUMBER, TYPE
 from ludwig.contrib import add_contrib_callback_args
 from ludwig.globals import LUDWIG_VERSION
 from ludwig.utils.print_utils import logging_level_registry, print_ludwig
@@ -39,8 +44,8 @@ try:
     from starlette.datastructures import UploadFile
     from starlette.middleware import Middleware
     from starlette.middleware.cors import CORSMiddleware
-    from starlette.requests import Request
-    from starlette.responses import JSONResponse
+    from starlette.requests import ClientDisconnect, Request
+    from starlette.responses import JSONResponse, StreamingResponse
 except ImportError as e:
     logger.error(e)
     logger.error(
@@ -55,13 +60,310 @@ ALL_FEATURES_PRESENT_ERROR = {"error": "entry must contain all input features"}
 
 COULD_NOT_RUN_INFERENCE_ERROR = {"error": "Unexpected Error: could not run inference on model"}
 
+COULD_NOT_PARSE_NDJSON_ERROR = {"error": "could not parse request body as newline-delimited JSON"}
 
-def server(model, allowed_origins=None):
+THREAD = "thread"
+PROCESS = "process"
+WORKER_TYPES = [THREAD, PROCESS]
+
+TORCHSCRIPT_INPUT_TYPES = {BINARY, CATEGORY, NUMBER}
+
+
+class RequestBatcher:
+    """Coalesces concurrent single-row prediction requests into batched predictions.
+
+    Requests are queued until either `max_batch_size` requests are pending or the oldest pending request has waited
+    `max_batch_latency_ms`, then all pending requests are predicted with a single call to the `predict_fn` coroutine
+    function and the results are fanned back out to the callers. If predicting the batch fails, its requests are
+    predicted one by one, so that a malformed request only fails itself.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_batch_latency_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_batch_latency_ms = max_batch_latency_ms
+
+        self._pending = []
+        self._flush_handle = None
+        # the event loop only keeps weak references to tasks, so running batches are referenced here until done
+        self._tasks = set()
+
+        # metrics
+        self.queue_depth = 0
+        self.num_requests = 0
+        self.num_batches = 0
+        self.batch_sizes = Counter()
+
+    async def predict(self, entry):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((entry, future))
+        self.queue_depth += 1
+        self.num_requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_batch_latency_ms / 1000.0, self._flush)
+        return await future
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "num_requests": self.num_requests,
+            "num_batches": self.num_batches,
+            "mean_batch_size": (self.num_requests - len(self._pending)) / self.num_batches if self.num_batches else 0.0,
+            "batch_sizes": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+        }
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            self.num_batches += 1
+            self.batch_sizes[len(batch)] += 1
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            results = await self._predict_batch([entry for entry, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self.queue_depth -= len(batch)
+
+    async def _predict_batch(self, entries):
+        """Returns the result of each entry, or the exception raised predicting it."""
+        try:
+            return await self.predict_fn(entries)
+        except Exception as e:
+            if len(entries) == 1:
+                return [e]
+            logger.warning(f"Failed to predict a batch of {len(entries)} requests, predicting them one by one: {e}")
+
+        results = await asyncio.gather(*(self.predict_fn([entry]) for entry in entries), return_exceptions=True)
+        return [result if isinstance(result, Exception) else result[0] for result in results]
+
+
+def _predict(model, dataset, data_format=None, orient="records"):
+    resp, _ = model.predict(dataset=dataset, data_format=data_format)
+    return resp.to_dict(orient)
+
+
+async def iter_ndjson_chunks(byte_stream, chunk_size):
+    """Yields lists of at most `chunk_size` records parsed from an async stream of newline-delimited JSON bytes.
+
+    Only one chunk of records is held in memory at a time, however large the stream is.
+    """
+    buffer = b""
+    chunk = []
+    async for data in byte_stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if buffer.strip():
+        chunk.append(json.loads(buffer))
+    if chunk:
+        yield chunk
+
+
+class TorchscriptPredictor:
+    """Predicts with the scripted `InferenceModule` of a model, without going through pandas.
+
+    Parsed request rows are converted column by column into the inputs of the scripted module, and its outputs are
+    flattened into the same `<feature>_<output>` keys returned by `LudwigModel.predict`. Only the predictions and
+    probabilities are returned, and only binary, category and number input features are supported.
+    """
+
+    def __init__(self, model):
+        unsupported = {f[TYPE] for f in model.config["input_features"]} - TORCHSCRIPT_INPUT_TYPES
+        if unsupported:
+            raise ValueError(
+                f"TorchScript serving does not support input features of type {sorted(unsupported)}. "
+                f"Supported types are: {sorted(TORCHSCRIPT_INPUT_TYPES)}"
+            )
+        self.input_features = [(f[COLUMN], f[NAME], f[TYPE]) for f in model.config["input_features"]]
+        self.inference_module = model.to_torchscript()
+
+    def __call__(self, dataset, data_format=None, orient="records"):
+        # dataset is always a list of records, as parsed from the request
+        inputs = {}
+        for column, name, feature_type in self.input_features:
+            values = [row[column] for row in dataset]
+            if feature_type == NUMBER:
+                inputs[name] = torch.tensor([float(v) for v in values], dtype=torch.float32)
+            else:
+                inputs[name] = [str(v) for v in values]
+
+        outputs = {}
+        for feature_name, feature_outputs in self.inference_module(inputs).items():
+            for output_name, values in feature_outputs.items():
+                outputs[f"{feature_name}_{output_name}"] = values.tolist() if torch.is_tensor(values) else values
+
+        columns = list(outputs)
+        rows = [[outputs[c][i] for c in columns] for i in range(len(dataset))]
+        if orient == "split":
+            return {"index": list(range(len(rows))), "columns": columns, "data": rows}
+        return [dict(zip(columns, row)) for row in rows]
+
+
+class ThreadWorkerPool(ThreadPoolExecutor):
+    """Thread pool in which each thread predicts with its own replica of the model.
+
+    `LudwigModel.predict` is not safe to call concurrently on one model, so with more than one thread each thread
+    predicts with a copy of `model`. Torch shares its intra-op thread pool across all threads of a process, so
+    `intra_op_threads` is applied to the whole process while the pool is running and restored on shutdown.
+    """
+
+    def __init__(self, model, num_workers=1, intra_op_threads=None, torchscript=False):
+        self._local = threading.local()
+        self._previous_num_threads = None
+        if intra_op_threads is not None:
+            self._previous_num_threads = torch.get_num_threads()
+            torch.set_num_threads(intra_op_threads)
+        super().__init__(
+            max_workers=num_workers, initializer=self._init_worker, initargs=(model, num_workers > 1, torchscript)
+        )
+
+    def _init_worker(self, model, replicate, torchscript):
+        if replicate:
+            model = copy.deepcopy(model)
+        self._local.predict_fn = TorchscriptPredictor(model) if torchscript else functools.partial(_predict, model)
+
+    def predict(self, dataset, data_format=None, orient="records"):
+        return self._local.predict_fn(dataset, data_format=data_format, orient=orient)
+
+    def shutdown(self, *args, **kwargs):
+        super().shutdown(*args, **kwargs)
+        if self._previous_num_threads is not None:
+            torch.set_num_threads(self._previous_num_threads)
+            self._previous_num_threads = None
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """A `StreamingResponse` whose content is generated while the body of the request is still being read.
+
+    `StreamingResponse` listens for the client disconnecting by receiving messages concurrently with streaming the
+    content, which swallows the request body messages the content has yet to read. Here the content reads the body
+    through `Request.stream()`, which raises `ClientDisconnect` itself if the client goes away.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+# predict function owned by each process of a process worker pool
+_worker_predict_fn = None
+
+
+def _init_process_worker(model_path, intra_op_threads, torchscript):
+    global _worker_predict_fn
+    if intra_op_threads is not None:
+        torch.set_num_threads(intra_op_threads)
+    model = LudwigModel.load(model_path, backend="local")
+    _worker_predict_fn = TorchscriptPredictor(model) if torchscript else functools.partial(_predict, model)
+
+
+def _predict_in_process_worker(dataset, data_format=None, orient="records"):
+    return _worker_predict_fn(dataset, data_format=data_format, orient=orient)
+
+
+def create_worker_pool(
+    model, worker_type=THREAD, num_workers=1, intra_op_threads=None, model_path=None, torchscript=False
+):
+    """Creates the executor that runs inference off the event loop, and the function it runs.
+
+    With `thread` workers, each thread predicts with its own replica of `model`, and `intra_op_threads` sets the
+    number of threads torch uses for each operation in this process until the pool is shut down. With `process`
+    workers, each process loads its own replica of the model from `model_path` and uses `intra_op_threads` torch
+    threads. With `torchscript`, the workers predict with the scripted model through a `TorchscriptPredictor` instead
+    of `LudwigModel.predict`.
+    """
+    if worker_type == THREAD:
+        executor = ThreadWorkerPool(
+            model, num_workers=num_workers, intra_op_threads=intra_op_threads, torchscript=torchscript
+        )
+        return executor, executor.predict
+    elif worker_type == PROCESS:
+        if model_path is None:
+            raise ValueError("model_path is required to serve with process workers")
+        # spawn rather than fork, as forking after torch has started its thread pools can deadlock
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+            initargs=(model_path, intra_op_threads, torchscript),
+        )
+        return executor, _predict_in_process_worker
+    raise ValueError(f"Invalid worker type: {worker_type}. Valid types are: {WORKER_TYPES}")
+
+
+def server(
+    model,
+    allowed_origins=None,
+    enable_batching=False,
+    max_batch_size=32,
+    max_batch_latency_ms=5.0,
+    worker_type=THREAD,
+    num_workers=1,
+    intra_op_threads=None,
+    model_path=None,
+    torchscript=False,
+    stream_chunk_size=1000,
+):
     middleware = [Middleware(CORSMiddleware, allow_origins=allowed_origins)] if allowed_origins else None
     app = FastAPI(middleware=middleware)
 
     input_features = {f[COLUMN] for f in model.config["input_features"]}
 
+    executor, predict_fn = create_worker_pool(
+        model,
+        worker_type=worker_type,
+        num_workers=num_workers,
+        intra_op_threads=intra_op_threads,
+        model_path=model_path,
+        torchscript=torchscript,
+    )
+
+    async def run_predict(dataset, data_format=None, orient="records"):
+        # run the blocking prediction on the worker pool so the event loop
+        # keeps serving other connections in the meantime
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, predict_fn, dataset, data_format, orient)
+
+    @app.on_event("shutdown")
+    def shutdown_worker_pool():
+        executor.shutdown(wait=False)
+
+    request_batcher = None
+    if enable_batching:
+        request_batcher = RequestBatcher(
+            lambda entries: run_predict(entries, data_format=dict),
+            max_batch_size=max_batch_size,
+            max_batch_latency_ms=max_batch_latency_ms,
+        )
+
+        @app.get("/metrics")
+        def metrics():
+            return JSONResponse(request_batcher.metrics())
+
     @app.get("/")
     def check_health():
         return JSONResponse({"message": "Ludwig server is up"})
@@ -70,56 +372,95 @@ def server(model, allowed_origins=None):
     async def predict(request: Request):
         try:
             form = await request.form()
-            entry, files = convert_input(form, model.model.input_features)
+            entry = convert_input(form, model.model.input_features)
         except Exception:
             logger.exception("Failed to parse predict form")
             return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR, status_code=500)
 
+        if (entry.keys() & input_features) != input_features:
+            return JSONResponse(ALL_FEATURES_PRESENT_ERROR, status_code=400)
         try:
-            if (entry.keys() & input_features) != input_features:
-                return JSONResponse(ALL_FEATURES_PRESENT_ERROR, status_code=400)
-            try:
-                resp, _ = model.predict(dataset=[entry], data_format=dict)
-                resp = resp.to_dict("records")[0]
-                return JSONResponse(resp)
-            except Exception as exc:
-                logger.exception(f"Failed to run predict: {exc}")
-                return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR, status_code=500)
-        finally:
-            for f in files:
-                os.remove(f.name)
+            if request_batcher is not None:
+                resp = await request_batcher.predict(entry)
+            else:
+                resp = (await run_predict([entry], data_format=dict))[0]
+            return JSONResponse(resp)
+        except Exception as exc:
+            logger.exception(f"Failed to run predict: {exc}")
+            return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR, status_code=500)
 
     @app.post("/batch_predict")
     async def batch_predict(request: Request):
         try:
             form = await request.form()
-            data, files = convert_batch_input(form, model.model.input_features)
-            data_df = pd.DataFrame.from_records(data["data"], index=data.get("index"), columns=data["columns"])
+            data = convert_batch_input(form, model.model.input_features)
+            if torchscript:
+                dataset = [dict(zip(data["columns"], row)) for row in data["data"]]
+            else:
+                dataset = pd.DataFrame.from_records(data["data"], index=data.get("index"), columns=data["columns"])
         except Exception:
             logger.exception("Failed to parse batch_predict form")
             return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR, status_code=500)
 
-        if (set(data_df.columns) & input_features) != input_features:
+        if (set(data["columns"]) & input_features) != input_features:
             return JSONResponse(ALL_FEATURES_PRESENT_ERROR, status_code=400)
         try:
-            resp, _ = model.predict(dataset=data_df)
-            resp = resp.to_dict("split")
+            resp = await run_predict(dataset, orient="split")
+            if torchscript and data.get("index") is not None:
+                resp["index"] = data["index"]
             return JSONResponse(resp)
         except Exception:
             logger.exception("Failed to run batch_predict: {}")
             return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR, status_code=500)
 
+    @app.post("/batch_predict_stream")
+    async def batch_predict_stream(request: Request):
+        # rows are read, predicted and written back one chunk at a time
+        chunks = iter_ndjson_chunks(request.stream(), stream_chunk_size)
+        try:
+            first_chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            first_chunk = []
+        except Exception:
+            logger.exception("Failed to parse batch_predict_stream body")
+            return JSONResponse(COULD_NOT_PARSE_NDJSON_ERROR, status_code=400)
+
+        if any((entry.keys() & input_features) != input_features for entry in first_chunk):
+            return JSONResponse(ALL_FEATURES_PRESENT_ERROR, status_code=400)
+
+        async def stream_predictions():
+            chunk = first_chunk
+            while chunk:
+                if any((entry.keys() & input_features) != input_features for entry in chunk):
+                    yield json.dumps(ALL_FEATURES_PRESENT_ERROR) + "\n"
+                    return
+                try:
+                    resp = await run_predict(chunk, data_format=dict)
+                except Exception:
+                    logger.exception("Failed to run batch_predict_stream")
+                    yield json.dumps(COULD_NOT_RUN_INFERENCE_ERROR) + "\n"
+                    return
+                yield "".join(json.dumps(row) + "\n" for row in resp)
+
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    chunk = None
+                except ClientDisconnect:
+                    return
+                except Exception:
+                    logger.exception("Failed to parse batch_predict_stream body")
+                    yield json.dumps(COULD_NOT_PARSE_NDJSON_ERROR) + "\n"
+                    return
+
+        return RequestStreamingResponse(stream_predictions(), media_type="application/x-ndjson")
+
     return app
 
 
-def _write_file(v, files):
-    # Convert UploadFile to a NamedTemporaryFile to ensure it's on the disk
-    suffix = os.path.splitext(v.filename)[1]
-    named_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    files.append(named_file)
-    named_file.write(v.file.read())
-    named_file.close()
-    return named_file.name
+def _read_audio_buffer(v):
+    # audio features decode the raw bytes of the file in memory
+    return v.file.read()
 
 
 def _read_image_buffer(v):
@@ -130,27 +471,27 @@ def _read_image_buffer(v):
     return image  # channels, height, width
 
 
+def _read_file_buffer(v, input_feature):
+    if input_feature.type() == AUDIO:
+        return _read_audio_buffer(v)
+    return _read_image_buffer(v)
+
+
 def convert_input(form, input_features):
-    """Returns a new input and a list of files to be cleaned up."""
+    """Returns a new input with uploaded files decoded in memory."""
     new_input = {}
-    files = []
     for k, v in form.multi_items():
         if type(v) == UploadFile:
-            # check if audio or image file
-            if input_features[k].type() == AUDIO:
-                new_input[k] = _write_file(v, files)
-            else:
-                new_input[k] = _read_image_buffer(v)
+            new_input[k] = _read_file_buffer(v, input_features[k])
         else:
             new_input[k] = v
 
-    return new_input, files
+    return new_input
 
 
 def convert_batch_input(form, input_features):
-    """Returns a new input and a list of files to be cleaned up."""
+    """Returns a new input with uploaded files decoded in memory."""
     file_index = {}
-    files = []
     for k, v in form.multi_items():
         if type(v) == UploadFile:
             file_index[v.filename] = v
@@ -160,12 +501,9 @@ def convert_batch_input(form, input_features):
         for i in range(len(row)):
             if row[i] in file_index:
                 feature_name = data["columns"][i]
-                if input_features[feature_name].type() == AUDIO:
-                    row[i] = _write_file(file_index[row[i]], files)
-                else:
-                    row[i] = _read_image_buffer(file_index[row[i]])
+                row[i] = _read_file_buffer(file_index[row[i]], input_features[feature_name])
 
-    return data, files
+    return data
 
 
 def run_server(
@@ -173,6 +511,14 @@ def run_server(
     host: str,
     port: int,
     allowed_origins: list,
+    enable_batching: bool = False,
+    max_batch_size: int = 32,
+    max_batch_latency_ms: float = 5.0,
+    worker_type: str = THREAD,
+    num_workers: int = 1,
+    intra_op_threads: int = None,
+    torchscript: bool = False,
+    stream_chunk_size: int = 1000,
 ) -> None:
     """Loads a pre-trained model and serve it on an http server.
 
@@ -182,6 +528,26 @@ def run_server(
     :param host: (str, default: `0.0.0.0`) host ip address for the server to use.
     :param port: (int, default: `8000`) port number for the server to use.
     :param allowed_origins: (list) list of origins allowed to make cross-origin requests.
+    :param enable_batching: (bool, default: `False`) coalesce concurrent
+        `/predict` requests into batched predictions.
+    :param max_batch_size: (int, default: `32`) maximum number of requests
+        predicted together when batching is enabled.
+    :param max_batch_latency_ms: (float, default: `5.0`) maximum time in
+        milliseconds a request waits for other requests to batch with.
+    :param worker_type: (str, default: `thread`) run inference on a pool of
+        `thread` workers each predicting with a copy of the model, or of
+        `process` workers each loading their own replica of the model.
+    :param num_workers: (int, default: `1`) number of inference workers.
+    :param intra_op_threads: (int, default: `None`) number of threads torch
+        uses within each operation, per process. Defaults to torch's own
+        setting.
+    :param torchscript: (bool, default: `False`) predict with the model
+        scripted to TorchScript, feeding the parsed request data to it
+        directly instead of going through pandas. Only models with binary,
+        category and number input features are supported, and only
+        predictions and probabilities are returned.
+    :param stream_chunk_size: (int, default: `1000`) number of rows
+        predicted at a time by the `/batch_predict_stream` endpoint.
 
     # Return
 
@@ -189,7 +555,19 @@ def run_server(
     """
     # Use local backend for serving to use pandas DataFrames.
     model = LudwigModel.load(model_path, backend="local")
-    app = server(model, allowed_origins)
+    app = server(
+        model,
+        allowed_origins,
+        enable_batching=enable_batching,
+        max_batch_size=max_batch_size,
+        max_batch_latency_ms=max_batch_latency_ms,
+        worker_type=worker_type,
+        num_workers=num_workers,
+        intra_op_threads=intra_op_threads,
+        model_path=model_path,
+        torchscript=torchscript,
+        stream_chunk_size=stream_chunk_size,
+    )
     uvicorn.run(app, host=host, port=port)
 
 
@@ -232,6 +610,61 @@ def cli(sys_argv):
         'Use "*" to allow any origin. See https://www.starlette.io/middleware/#corsmiddleware.',
     )
 
+    parser.add_argument(
+        "--enable_batching",
+        action="store_true",
+        help="coalesce concurrent /predict requests into batched predictions",
+    )
+
+    parser.add_argument(
+        "--max_batch_size",
+        help="maximum number of requests predicted together when batching is enabled (default: 32)",
+        default=32,
+        type=int,
+    )
+
+    parser.add_argument(
+        "--max_batch_latency_ms",
+        help="maximum time in milliseconds a request waits for other requests to batch with (default: 5)",
+        default=5.0,
+        type=float,
+    )
+
+    parser.add_argument(
+        "--worker_type",
+        help="run inference on threads or on processes, each with its own replica of the model (default: thread)",
+        default=THREAD,
+        choices=WORKER_TYPES,
+    )
+
+    parser.add_argument(
+        "--num_workers",
+        help="number of inference workers (default: 1)",
+        default=1,
+        type=int,
+    )
+
+    parser.add_argument(
+        "--intra_op_threads",
+        help="number of threads torch uses within each operation, per process (default: torch default)",
+        default=None,
+        type=int,
+    )
+
+    parser.add_argument(
+        "--torchscript",
+        action="store_true",
+        help="predict with the model scripted to TorchScript, bypassing pandas "
+        "(binary, category and number input features only)",
+    )
+
+    parser.add_argument(
+        "--stream_chunk_size",
+        help="number of rows predicted at a time by /batch_predict_stream (default: 1000)",
+        default=1000,
+        type=int,
+    )
+
     add_contrib_callback_args(parser)
     args = parser.parse_args(sys_argv)
 
@@ -246,7 +679,20 @@ def cli(sys_argv):
 
     print_ludwig("Serve", LUDWIG_VERSION)
 
-    run_server(args.model_path, args.host, args.port, args.allowed_origins)
+    run_server(
+        args.model_path,
+        args.host,
+        args.port,
+        args.allowed_origins,
+        enable_batching=args.enable_batching,
+        max_batch_size=args.max_batch_size,
+        max_batch_latency_ms=args.max_batch_latency_ms,
+        worker_type=args.worker_type,
+        num_workers=args.num_workers,
+        intra_op_threads=args.intra_op_threads,
+        torchscript=args.torchscript,
+        stream_chunk_size=args.stream_chunk_size,
+    )
 
 
 if __name__ == "__main__":
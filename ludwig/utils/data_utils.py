@@ -28,10 +28,12 @@ from typing import Dict, List, Tuple
 import numpy as np
 import pandas as pd
 import yaml
+from fsspec.implementations.local import LocalFileSystem
 from pandas.errors import ParserError
 from sklearn.model_selection import KFold
 
-from ludwig.utils.fs_utils import download_h5, open_file, upload_h5
+from ludwig.data.dataframe.tensor import TensorArray
+from ludwig.utils.fs_utils import download_h5, get_fs_and_path, makedirs, open_file, upload_h5
 from ludwig.utils.misc_utils import get_from_registry
 
 try:
@@ -51,6 +53,8 @@ DATASET_SPLIT_URL = "dataset_{}_fp"
 DATA_PROCESSED_CACHE_DIR = "data_processed_cache_dir"
 DATA_TRAIN_HDF5_FP = "data_train_hdf5_fp"
 HDF5_COLUMNS_KEY = "columns"
+NUMPY_COLUMNS_FNAME = "columns.json"
+NUMPY_HDF5_FNAME = "data.hdf5"
 DICT_FORMATS = {"dict", "dictionary", dict}
 DATAFRAME_FORMATS = {"dataframe", "df", pd.DataFrame} | DASK_DF_FORMATS
 CSV_FORMATS = {"csv"}
@@ -68,6 +72,7 @@ SAS_FORMATS = {"sas"}
 SPSS_FORMATS = {"spss"}
 STATA_FORMATS = {"stata"}
 HDF5_FORMATS = {"hdf5", "h5"}
+NUMPY_COLUMNS_FORMATS = {"npy"}
 CACHEABLE_FORMATS = set.union(
     *(
         CSV_FORMATS,
@@ -304,7 +309,9 @@ def unflatten_df(df, column_shapes, backend):
 def to_numpy_dataset(df):
     dataset = {}
     for col in df.columns:
-        dataset[col] = np.stack(df[col].to_numpy())
+        values = df[col].array
+        # tensor columns are handed over as the array backing them instead of being stacked again
+        dataset[col] = values.to_tensor() if isinstance(values, TensorArray) else np.stack(df[col].to_numpy())
     return dataset
 
 
@@ -331,6 +338,33 @@ def save_hdf5(data_fp, data):
             h5_file.create_dataset(column, data=numpy_dataset[column])
 
 
+def read_hdf5_rows(h5_dataset, idx) -> np.ndarray:
+    """Reads the rows at the given indices of an HDF5 dataset.
+
+    Indices may be unsorted and contain duplicates. Runs of consecutive indices are coalesced so that each run is read
+    with a single contiguous slab read instead of a point selection per row.
+    """
+    idx = np.asarray(idx)
+    unique_idx, inverse = np.unique(idx, return_inverse=True)
+    rows = np.empty((len(unique_idx),) + h5_dataset.shape[1:], dtype=h5_dataset.dtype)
+    if len(unique_idx) == 0:
+        return rows
+
+    run_starts = np.flatnonzero(np.diff(unique_idx) != 1) + 1
+    run_starts = np.concatenate(([0], run_starts))
+    run_ends = np.concatenate((run_starts[1:], [len(unique_idx)]))
+    for start, end in zip(run_starts, run_ends):
+        h5_dataset.read_direct(
+            rows,
+            source_sel=np.s_[unique_idx[start] : unique_idx[end - 1] + 1],
+            dest_sel=np.s_[start:end],
+        )
+
+    if len(unique_idx) == len(idx) and np.array_equal(unique_idx, idx):
+        return rows
+    return rows[inverse]
+
+
 def load_hdf5(data_fp, clean_cols: bool = False):
     with download_h5(data_fp) as hdf5_data:
         columns = [s.decode("utf-8") for s in hdf5_data[HDF5_COLUMNS_KEY][()].tolist()]
@@ -344,6 +378,36 @@ def load_hdf5(data_fp, clean_cols: bool = False):
     return from_numpy_dataset(numpy_dataset)
 
 
+def save_numpy_columns(data_dir, data):
+    """Saves each column of a dataframe, or of a dict of column arrays, as a separate .npy file in `data_dir`."""
+    numpy_dataset = data if isinstance(data, dict) else to_numpy_dataset(data)
+    makedirs(data_dir, exist_ok=True)
+    for column, values in numpy_dataset.items():
+        with open_file(os.path.join(data_dir, f"{column}.npy"), "wb") as f:
+            np.save(f, values, allow_pickle=False)
+    save_json(os.path.join(data_dir, NUMPY_COLUMNS_FNAME), list(numpy_dataset))
+
+
+def load_numpy_columns(data_dir, mmap_mode="r") -> Dict[str, np.ndarray]:
+    """Loads a dataset saved by `save_numpy_columns` as a dict of column arrays.
+
+    Local columns are memory-mapped, so loading takes constant time and rows are only read from disk when they are
+    indexed. Remote columns are downloaded and loaded in memory.
+    """
+    columns = load_json(os.path.join(data_dir, NUMPY_COLUMNS_FNAME))
+
+    numpy_dataset = {}
+    for column in columns:
+        column_fp = os.path.join(data_dir, f"{column}.npy")
+        fs, column_path = get_fs_and_path(column_fp)
+        if mmap_mode is not None and isinstance(fs, LocalFileSystem):
+            numpy_dataset[column] = np.load(column_path, mmap_mode=mmap_mode, allow_pickle=False)
+        else:
+            with open_file(column_fp, "rb") as f:
+                numpy_dataset[column] = np.load(f, allow_pickle=False)
+    return numpy_dataset
+
+
 def load_object(object_fp):
     with open_file(object_fp, "rb") as f:
         return pickle.load(f)
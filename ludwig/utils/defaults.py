@@ -52,11 +52,13 @@ default_random_seed = 42
 default_preprocessing_force_split = False
 default_preprocessing_split_probabilities = (0.7, 0.1, 0.2)
 default_preprocessing_stratify = None
+default_preprocessing_cache_checksum = "metadata"
 
 default_preprocessing_parameters = {
     "force_split": default_preprocessing_force_split,
     "split_probabilities": default_preprocessing_split_probabilities,
     "stratify": default_preprocessing_stratify,
+    "cache_checksum": default_preprocessing_cache_checksum,
 }
 default_preprocessing_parameters.update(
     {name: base_type.preprocessing_defaults() for name, base_type in base_type_registry.items()}
@@ -89,6 +91,9 @@ default_training_params = {
     "validation_metric": LOSS,
     "bucketing_field": None,
     "learning_rate_warmup_epochs": 1,
+    "prefetch_batches": 0,
+    "gradient_accumulation_steps": 1,
+    "mixed_precision": None,
 }
 
 default_optimizer_params_registry = {
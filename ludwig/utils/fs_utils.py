@@ -133,10 +133,19 @@ def open_file(url, *args, **kwargs):
         yield f
 
 
+def open_h5(url, **kwargs):
+    """Opens an HDF5 file for reading, downloading it first if it is remote.
+
+    Unlike `download_h5`, the caller owns the returned file handle and is responsible for closing it. Keyword arguments
+    are passed to `h5py.File`, e.g. `rdcc_nbytes` to size the chunk cache.
+    """
+    local_path = fsspec.open_local(url)
+    return h5py.File(local_path, "r", **kwargs)
+
+
 @contextlib.contextmanager
 def download_h5(url):
-    local_path = fsspec.open_local(url)
-    with h5py.File(local_path, "r") as f:
+    with open_h5(url) as f:
         yield f
 
 
@@ -13,14 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
-import logging
+import contextlib
+import contextvars
+import functools
+import itertools
 import re
 import unicodedata
 from collections import Counter
 from enum import Enum
-from typing import List, Set, Union
+from typing import List, Optional, Set, Union
 
 import numpy as np
+import pandas as pd
 
 from ludwig.data.dataframe.pandas import PANDAS
 from ludwig.utils.fs_utils import open_file
@@ -188,6 +192,8 @@ def create_vocabulary(
     stop_symbol: str = STOP_SYMBOL,
     pretrained_model_name_or_path: str = None,
     processor: str = PANDAS,
+    chunk_size: int = 10000,
+    token_cache: "TokenIdCache" = None,
 ):
     """Computes a vocabulary over the provided data frame.
 
@@ -211,6 +217,10 @@ def create_vocabulary(
         stop_symbol: String representation for the STOP symbol.
         pretrained_model_name_or_path: Name/path to huggingface model.
         processor: Which processor to use to process data.
+        chunk_size: Number of rows tokenized at a time when the data is not partitioned, so that only the token counts
+            and not the tokens of the whole column are held in memory.
+        token_cache: If provided, and the data is not partitioned, the tokens of every row are kept in this cache so
+            that `build_sequence_matrix` does not need to tokenize the data again.
 
     Returns:
         Tuple of:
@@ -258,11 +268,30 @@ def create_vocabulary(
     elif vocab_file is not None:
         vocab = load_vocabulary(vocab_file)
 
-    processed_lines = data.map(lambda line: tokenizer(line.lower() if lowercase else line))
-    processed_counts = processed_lines.explode().value_counts(sort=False)
-    processed_counts = processor.compute(processed_counts)
-    unit_counts = Counter(dict(processed_counts))
-    max_line_length = processor.compute(processed_lines.map(len).max())
+    if processor.partitioned:
+        processed_lines = data.map(lambda line: tokenizer(line.lower() if lowercase else line))
+        processed_counts = processed_lines.explode().value_counts(sort=False)
+        processed_counts = processor.compute(processed_counts)
+        unit_counts = Counter(dict(processed_counts))
+        max_line_length = processor.compute(processed_lines.map(len).max())
+    else:
+        if tokenizer_type == "hf_tokenizer":
+            # huggingface tokenizers already produce ids
+            token_cache = None
+        if token_cache is not None:
+            token_cache.reset(data, tokenizer_type, lowercase)
+
+        unit_counts = Counter()
+        max_line_length = 0
+        for processed_lines in _iter_token_chunks(data, tokenizer, lowercase, chunk_size):
+            if token_cache is not None:
+                token_cache.add(processed_lines)
+            else:
+                unit_counts.update(itertools.chain.from_iterable(processed_lines))
+            max_line_length = max(max_line_length, max(map(len, processed_lines), default=0))
+
+        if token_cache is not None:
+            unit_counts = token_cache.counts()
 
     if vocab is None:
         vocab = [unit for unit, count in unit_counts.most_common(num_most_frequent)]
@@ -287,29 +316,182 @@ def create_vocabulary(
     return vocab, str2idx, str2freq, max_line_length, pad_idx, padding_symbol, unknown_symbol
 
 
-def _get_sequence_vector(
-    sequence, tokenizer, tokenizer_type, format_dtype, unit_to_id, lowercase=True, unknown_symbol=UNKNOWN_SYMBOL
-) -> np.ndarray:
-    unit_sequence = tokenizer(sequence.lower() if lowercase else sequence)
+class TokenIdCache:
+    """Keeps the tokens of a column from the pass that builds its vocabulary, so the column is only tokenized once.
+
+    Tokens are stored as compact ids into the list of distinct tokens, and mapped to their vocabulary ids by
+    `build_sequence_matrix` once the vocabulary is known.
+    """
+
+    def __init__(self):
+        self.reset(None, None, None)
+
+    def reset(self, data, tokenizer_type, lowercase):
+        self.index = data.index if data is not None else None
+        self.tokenizer_type = tokenizer_type
+        self.lowercase = lowercase
+        self.token_to_id = {}
+        self.ids = []
+        self.lengths = []
+
+    def add(self, token_sequences):
+        lengths, tokens = _flatten_token_sequences(token_sequences)
+        token_to_id = self.token_to_id
+        self.ids.append(
+            np.fromiter(
+                (token_to_id.setdefault(token, len(token_to_id)) for token in tokens),
+                dtype=np.int32,
+                count=int(lengths.sum()),
+            )
+        )
+        self.lengths.append(lengths)
+
+    def counts(self) -> Counter:
+        counts = np.zeros(len(self.token_to_id), dtype=np.int64)
+        for ids in self.ids:
+            counts += np.bincount(ids, minlength=len(self.token_to_id))
+        return Counter(dict(zip(self.token_to_id, counts.tolist())))
+
+    def matches(self, data, tokenizer_type, lowercase) -> bool:
+        return (
+            self.index is not None
+            and self.tokenizer_type == tokenizer_type
+            and self.lowercase == lowercase
+            and self.index.equals(data.index)
+        )
+
+    def iter_chunks(self, unit_to_id, unknown_symbol, format_dtype):
+        """Yields the vocabulary ids of the tokens of each cached chunk of rows, flattened, and its row lengths."""
+        remap = np.fromiter(
+            map(unit_to_id.get, self.token_to_id, itertools.repeat(unit_to_id[unknown_symbol])),
+            dtype=format_dtype,
+            count=len(self.token_to_id),
+        )
+        for ids, lengths in zip(self.ids, self.lengths):
+            yield remap[ids], lengths
+
+
+# caches of the columns being preprocessed, only set within `token_id_caching`
+_token_id_caches = contextvars.ContextVar("token_id_caches", default=None)
+
+
+@contextlib.contextmanager
+def token_id_caching():
+    """Within this context, the tokens of a column can be kept from its vocabulary pass to the building of its data.
+
+    The caches are local to the context, and dropped when leaving it.
+    """
+    reset_token = _token_id_caches.set({})
+    try:
+        yield
+    finally:
+        _token_id_caches.reset(reset_token)
+
+
+def get_token_id_cache(column_name, tokenizer_type) -> Optional[TokenIdCache]:
+    """Returns a new cache for the tokens of a column, or None outside of `token_id_caching`."""
+    caches = _token_id_caches.get()
+    if caches is None:
+        return None
+    caches[(column_name, tokenizer_type)] = TokenIdCache()
+    return caches[(column_name, tokenizer_type)]
+
+
+def pop_token_id_cache(column_name, tokenizer_type) -> Optional[TokenIdCache]:
+    """Returns the cache of the tokens of a column and releases it, or None if the column has no cache."""
+    caches = _token_id_caches.get()
+    if caches is None:
+        return None
+    return caches.pop((column_name, tokenizer_type), None)
+
+
+def _iter_token_chunks(data, tokenizer, lowercase, chunk_size):
+    """Yields the lists of tokens of the rows of `data`, `chunk_size` rows at a time."""
+    for start in range(0, len(data), chunk_size):
+        chunk = data.iloc[start : start + chunk_size]
+        yield [tokenizer(line.lower() if lowercase else line) for line in chunk]
 
-    unit_indices_vector = np.empty(len(unit_sequence), dtype=format_dtype)
-    for i in range(len(unit_sequence)):
-        curr_unit = unit_sequence[i]
-        if tokenizer_type == "hf_tokenizer":
-            unit_indices_vector[i] = curr_unit
-        else:
-            if curr_unit in unit_to_id:
-                unit_indices_vector[i] = unit_to_id[curr_unit]
-            else:
-                unit_indices_vector[i] = unit_to_id[unknown_symbol]
+
+def _flatten_token_sequences(token_sequences):
+    lengths = np.fromiter(map(len, token_sequences), dtype=np.int64, count=len(token_sequences))
+    return lengths, itertools.chain.from_iterable(token_sequences)
+
+
+def _encode_token_sequences(token_sequences, tokenizer_type, format_dtype, unit_to_id, unknown_symbol):
+    """Returns the ids of all tokens, flattened, and the number of tokens of each sequence."""
+    lengths, tokens = _flatten_token_sequences(token_sequences)
+    if tokenizer_type == "hf_tokenizer":
+        ids = np.fromiter(tokens, dtype=format_dtype, count=int(lengths.sum()))
+    else:
+        unknown_id = unit_to_id[unknown_symbol]
+        ids = np.fromiter(
+            map(unit_to_id.get, tokens, itertools.repeat(unknown_id)), dtype=format_dtype, count=int(lengths.sum())
+        )
+    return ids, lengths
+
+
+def _fill_padded_sequence_matrix(matrix, ids, lengths, tokenizer_type, unit_to_id, padding):
+    """Writes flattened sequences of ids, with start and stop symbols, into the rows of a matrix filled with padding.
+
+    Sequences longer than the rows of the matrix are truncated.
+    """
+    max_length = matrix.shape[1]
 
     # Add start and stop symbols.
     # Huggingface's pretrained tokenizers take care of this implicitly:
     # https://huggingface.co/docs/transformers/preprocessing
-    if tokenizer_type != "hf_tokenizer":
-        unit_indices_vector = np.append(unit_indices_vector, unit_to_id[STOP_SYMBOL])
-        unit_indices_vector = np.insert(unit_indices_vector, 0, unit_to_id[START_SYMBOL])
-    return unit_indices_vector
+    num_markers = 0 if tokenizer_type == "hf_tokenizer" else 2
+
+    full_lengths = lengths + num_markers
+    ends = np.cumsum(full_lengths)
+    starts = ends - full_lengths
+
+    full_ids = np.empty(int(ends[-1]) if len(ends) else 0, dtype=matrix.dtype)
+    if num_markers:
+        is_marker = np.zeros(len(full_ids), dtype=bool)
+        is_marker[starts] = True
+        is_marker[ends - 1] = True
+        full_ids[starts] = unit_to_id[START_SYMBOL]
+        full_ids[ends - 1] = unit_to_id[STOP_SYMBOL]
+        full_ids[~is_marker] = ids
+    else:
+        full_ids[:] = ids
+
+    # scatter every id to its (row, column) in the matrix, dropping those past max_length
+    rows = np.repeat(np.arange(len(lengths)), full_lengths)
+    columns = np.arange(len(full_ids)) - np.repeat(starts, full_lengths)
+    keep = columns < max_length
+    if padding != "right":  # if padding == 'left
+        columns += np.repeat(max_length - np.minimum(full_lengths, max_length), full_lengths)
+
+    matrix[rows[keep], columns[keep]] = full_ids[keep]
+
+
+def _build_sequence_rows(
+    chunks, num_rows, index, length_limit, format_dtype, padding_id, tokenizer_type, unit_to_id, padding
+):
+    # sequences are written a chunk of rows at a time into a single preallocated matrix, whose rows are returned
+    matrix = np.full((num_rows, length_limit), padding_id, dtype=format_dtype)
+    start = 0
+    for ids, lengths in chunks:
+        rows = matrix[start : start + len(lengths)]
+        _fill_padded_sequence_matrix(rows, ids, lengths, tokenizer_type, unit_to_id, padding)
+        start += len(lengths)
+    return pd.Series(list(matrix), index=index, dtype=object)
+
+
+def _build_sequence_partition(partition, tokenizer, lowercase, chunk_size, unknown_symbol, **matrix_kwargs):
+    chunks = (
+        _encode_token_sequences(
+            token_sequences,
+            matrix_kwargs["tokenizer_type"],
+            matrix_kwargs["format_dtype"],
+            matrix_kwargs["unit_to_id"],
+            unknown_symbol,
+        )
+        for token_sequences in _iter_token_chunks(partition, tokenizer, lowercase, chunk_size)
+    )
+    return _build_sequence_rows(chunks, len(partition), partition.index, **matrix_kwargs)
 
 
 def build_sequence_matrix(
@@ -324,39 +506,35 @@ def build_sequence_matrix(
     tokenizer_vocab_file=None,
     pretrained_model_name_or_path=None,
     processor=PANDAS,
+    token_cache=None,
+    chunk_size=10000,
 ) -> np.ndarray:
+    format_dtype = int_type(len(inverse_vocabulary) - 1)
+    matrix_kwargs = dict(
+        length_limit=length_limit,
+        format_dtype=format_dtype,
+        padding_id=inverse_vocabulary[padding_symbol],
+        tokenizer_type=tokenizer_type,
+        unit_to_id=inverse_vocabulary,
+        padding=padding,
+    )
+
+    if token_cache is not None and token_cache.matches(sequences, tokenizer_type, lowercase):
+        chunks = token_cache.iter_chunks(inverse_vocabulary, unknown_symbol, format_dtype)
+        return _build_sequence_rows(chunks, len(sequences), sequences.index, **matrix_kwargs)
+
     tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)(
         vocab_file=tokenizer_vocab_file,
         pretrained_model_name_or_path=pretrained_model_name_or_path,
     )
 
-    format_dtype = int_type(len(inverse_vocabulary) - 1)
-
-    unit_vectors = sequences.map(
-        lambda sequence: _get_sequence_vector(
-            sequence,
-            tokenizer,
-            tokenizer_type,
-            format_dtype,
-            inverse_vocabulary,
-            lowercase=lowercase,
-            unknown_symbol=unknown_symbol,
-        )
+    # partitions are built by a partial of a module level function, which can be pickled to the workers of the engine
+    build_partition = functools.partial(
+        _build_sequence_partition,
+        tokenizer=tokenizer,
+        lowercase=lowercase,
+        chunk_size=chunk_size,
+        unknown_symbol=unknown_symbol,
+        **matrix_kwargs,
     )
-
-    max_length = processor.compute(unit_vectors.map(len).max())
-    if max_length < length_limit:
-        logging.debug(f"max length of {format}: {max_length} < limit: {length_limit}")
-    max_length = length_limit
-
-    def pad(vector):
-        sequence = np.full((int(max_length),), inverse_vocabulary[padding_symbol], dtype=format_dtype)
-        limit = min(vector.shape[0], max_length)
-        if padding == "right":
-            sequence[:limit] = vector[:limit]
-        else:  # if padding == 'left
-            sequence[max_length - limit :] = vector[:limit]
-        return sequence
-
-    padded = processor.map_objects(unit_vectors, pad)
-    return padded
+    return processor.map_partitions(sequences, build_partition)
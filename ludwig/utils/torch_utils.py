@@ -62,6 +62,24 @@ def sequence_mask(lengths: torch.Tensor, maxlen: Optional[int] = None, dtype: to
     return mask
 
 
+def index_lists_to_dense(indices: torch.Tensor, size: int, dtype: torch.dtype = torch.float32) -> torch.Tensor:
+    """Converts index lists padded with -1 to dense vectors counting the occurrences of each index.
+
+    :param indices: (torch.Tensor) An integer tensor of shape [batch size x max list size].
+    :param size: (int) The size of the dense vectors, indices must be smaller than it.
+    :param dtype: (type) The type to output.
+
+    # Return
+    :returns: (torch.Tensor) A tensor of shape [batch size x size].
+    """
+    padding = indices < 0
+    # padding is counted in an extra trailing slot that is dropped afterwards
+    indices = indices.long().masked_fill(padding, size)
+    dense = torch.zeros((indices.shape[0], size + 1), dtype=dtype, device=indices.device)
+    dense.scatter_add_(1, indices, torch.ones_like(indices, dtype=dtype))
+    return dense[:, :size]
+
+
 def periodic(inputs: torch.Tensor, period: int) -> torch.Tensor:
     """Returns periodic representation assuming 0 is start of period."""
     return torch.cos(inputs * 2 * math.pi / period)
@@ -1,14 +1,34 @@
 import os
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from ludwig.constants import CHECKSUM, META, TEST, TRAINING, VALIDATION
-from ludwig.data.cache.manager import alphanum, CacheManager
+from ludwig.api import LudwigModel
+from ludwig.constants import CHECKSUM, META, NAME, PROC_COLUMN, TEST, TRAINER, TRAINING, VALIDATION
+from ludwig.cache import cli as cache_cli
+from ludwig.data.cache.manager import (
+    alphanum,
+    CACHE_DIR_MARKER,
+    CacheManager,
+    FeatureCache,
+    mark_cache_directory,
+    parse_size,
+)
+from ludwig.data.cache.util import calculate_checksum, fingerprint, full_checksum
 from ludwig.data.dataset.pandas import PandasDatasetManager
+from ludwig.utils.data_utils import DATA_TRAIN_HDF5_FP, NUMPY_HDF5_FNAME
 from ludwig.globals import TRAINING_PREPROC_FILE_NAME
-from tests.integration_tests.utils import category_feature, LocalTestBackend, sequence_feature
+from tests.integration_tests.utils import (
+    category_feature,
+    generate_data,
+    image_feature,
+    LocalTestBackend,
+    number_feature,
+    sequence_feature,
+    text_feature,
+)
 
 
 @pytest.mark.parametrize("use_split", [True, False], ids=["split", "no_split"])
@@ -79,3 +99,285 @@ def test_cache_dataset(use_cache_dir, use_split, tmpdir):
 
     for cache_path in cache_map.values():
         assert not os.path.exists(cache_path)
+
+
+def test_cache_npy_format(tmpdir):
+    input_features = [number_feature(), sequence_feature(reduce_output="sum")]
+    output_features = [category_feature(vocab_size=2)]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=100)
+    config = {"input_features": input_features, "output_features": output_features, TRAINER: {"epochs": 1}}
+
+    def preprocess():
+        model = LudwigModel(config, backend=LocalTestBackend(cache_format="npy"))
+        return model.preprocess(dataset=data_csv, skip_save_processed_input=False)
+
+    training_set, validation_set, test_set, training_set_metadata = preprocess()
+    cache_path = os.path.join(tmpdir, "dataset.training.npy")
+    assert os.path.isdir(cache_path)
+
+    # the second run loads the memory-mapped columns written by the first one
+    cached_training_set, _, _, _ = preprocess()
+    assert len(cached_training_set) == len(training_set)
+    for proc_column, column in cached_training_set.dataset.items():
+        assert isinstance(column, np.memmap)
+        assert np.array_equal(column, training_set.dataset[proc_column])
+
+    idx = np.array([3, 0, 7])
+    for feature in input_features + output_features:
+        rows = cached_training_set.get(feature[PROC_COLUMN], idx)
+        assert not isinstance(rows, np.memmap)
+        assert np.array_equal(rows, training_set.get(feature[PROC_COLUMN], idx))
+
+    model = LudwigModel(config, backend=LocalTestBackend(cache_format="npy"))
+    model.train(dataset=data_csv, output_directory=os.path.join(tmpdir, "results"))
+
+    with pytest.raises(ValueError):
+        PandasDatasetManager(backend=LocalTestBackend(), cache_format="unknown")
+
+
+def test_cache_npy_format_not_in_memory(tmpdir):
+    input_features = [
+        image_feature(
+            folder=os.path.join(tmpdir, "generated_images"),
+            encoder="stacked_cnn",
+            preprocessing={"in_memory": False, "height": 12, "width": 12, "num_channels": 3},
+            output_size=16,
+            num_filters=8,
+        )
+    ]
+    output_features = [category_feature(vocab_size=2)]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=20)
+    config = {"input_features": input_features, "output_features": output_features}
+    cache_dir = os.path.join(tmpdir, "cache")
+
+    backend = LocalTestBackend(cache_dir=cache_dir, cache_format="npy")
+    model = LudwigModel(config, backend=backend)
+    training_set, _, _, training_set_metadata = model.preprocess(dataset=data_csv, skip_save_processed_input=False)
+
+    # the images are written within the directory of the columns, not next to it
+    (training_dir,) = [
+        os.path.join(cache_dir, fname) for fname in os.listdir(cache_dir) if fname.endswith(".training.npy")
+    ]
+    assert training_set_metadata[DATA_TRAIN_HDF5_FP] == os.path.join(training_dir, NUMPY_HDF5_FNAME)
+    assert not any(fname.endswith(".hdf5") for fname in os.listdir(cache_dir))
+    images = training_set.get(input_features[0][PROC_COLUMN], np.arange(3))
+    assert images.shape == (3, 3, 12, 12)
+
+    # only the feature cache entries remain once the dataset is deleted
+    backend.cache.get_dataset_cache(model.config, data_csv).delete()
+    assert all(fname == CACHE_DIR_MARKER or ".feature_" in fname for fname in os.listdir(cache_dir))
+
+
+@pytest.mark.parametrize("cache_format", ["hdf5", "npy"])
+def test_feature_cache(cache_format, tmpdir, monkeypatch):
+    input_features = [text_feature(), number_feature()]
+    output_features = [category_feature(vocab_size=3)]
+    dataset = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=50)
+    cache_dir = os.path.join(tmpdir, "cache")
+
+    built_features = []
+    put = FeatureCache.put
+
+    def spy_put(self, feature_config, *args):
+        built_features.append(feature_config[NAME])
+        return put(self, feature_config, *args)
+
+    monkeypatch.setattr(FeatureCache, "put", spy_put)
+
+    def preprocess(config, cache_dir=cache_dir):
+        model = LudwigModel(config, backend=LocalTestBackend(cache_dir=cache_dir, cache_format=cache_format))
+        training_set, _, _, metadata = model.preprocess(dataset, skip_save_processed_input=False)
+        return training_set, metadata
+
+    # features are only cached in a dedicated cache_dir, not next to the dataset
+    config = {"input_features": input_features, "output_features": output_features}
+    preprocess(config, cache_dir=None)
+    assert not built_features
+    assert not any(".feature_" in fname for fname in os.listdir(tmpdir))
+
+    training_set, metadata = preprocess(config)
+    assert sorted(built_features) == sorted(feature[NAME] for feature in input_features + output_features)
+    feature_data = [fname for fname in os.listdir(cache_dir) if ".feature_data." in fname]
+    assert len(feature_data) == len(built_features)
+    assert all(fname.endswith(f".feature_data.{cache_format}") for fname in feature_data)
+
+    # only the feature whose preprocessing changed is built again, although the dataset cache misses
+    built_features.clear()
+    changed_input_features = [{**input_features[0], "preprocessing": {"lowercase": False}}, input_features[1]]
+    config = {"input_features": changed_input_features, "output_features": output_features}
+    cached_training_set, cached_metadata = preprocess(config)
+    assert built_features == [input_features[0][NAME]]
+
+    for feature in input_features[1:] + output_features:
+        assert cached_metadata[feature[NAME]] == metadata[feature[NAME]]
+        proc_column = feature[PROC_COLUMN]
+        assert np.array_equal(cached_training_set.dataset[proc_column], training_set.dataset[proc_column])
+
+    # dropping rows on missing values of one feature, or splitting differently, changes the rows of every feature
+    all_features = [feature[NAME] for feature in changed_input_features + output_features]
+    built_features.clear()
+    drop_row_input_features = [
+        changed_input_features[0],
+        {**input_features[1], "preprocessing": {"missing_value_strategy": "drop_row"}},
+    ]
+    preprocess({"input_features": drop_row_input_features, "output_features": output_features})
+    assert sorted(built_features) == sorted(all_features)
+
+    built_features.clear()
+    preprocess(
+        {
+            "input_features": changed_input_features,
+            "output_features": output_features,
+            "preprocessing": {"split_probabilities": [0.6, 0.2, 0.2]},
+        }
+    )
+    assert sorted(built_features) == sorted(all_features)
+
+
+@pytest.mark.parametrize("checksum_method", ["metadata", "fingerprint", "full"])
+def test_cache_checksum_method(checksum_method, tmpdir):
+    config = {"input_features": [number_feature()], "preprocessing": {"cache_checksum": checksum_method}}
+    df = pd.DataFrame({"a": np.arange(100000), "b": np.random.rand(100000)})
+
+    csv_path = os.path.join(tmpdir, "dataset.csv")
+    df.to_csv(csv_path)
+    parquet_path = os.path.join(tmpdir, "dataset.parquet")
+    df.to_parquet(parquet_path)
+
+    for path in [csv_path, parquet_path]:
+        key = calculate_checksum(path, config)
+        assert key == calculate_checksum(path, config)
+        assert key != calculate_checksum(path, {**config, "input_features": [number_feature()]})
+
+    # the same content at another path
+    os.makedirs(os.path.join(tmpdir, "copy"))
+    copy_path = os.path.join(tmpdir, "copy", "dataset.csv")
+    df.to_csv(copy_path)
+    assert full_checksum(copy_path) == full_checksum(csv_path)
+    assert fingerprint(copy_path) != fingerprint(csv_path)
+
+    with pytest.raises(ValueError):
+        calculate_checksum(csv_path, {**config, "preprocessing": {"cache_checksum": "unknown"}})
+
+
+def test_fingerprint_content(tmpdir):
+    path = os.path.join(tmpdir, "dataset.csv")
+    data = np.random.RandomState(0).bytes(10 * 1024 * 1024)
+    with open(path, "wb") as f:
+        f.write(data)
+    stat = os.stat(path)
+    fingerprint_before, full_before = fingerprint(path), full_checksum(path)
+
+    # same size and modification time, different sampled content
+    with open(path, "r+b") as f:
+        f.write(b"x" * 16)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert fingerprint(path) != fingerprint_before
+    assert full_checksum(path) != full_before
+
+    # parquet files are fingerprinted from their footer
+    parquet_path = os.path.join(tmpdir, "dataset.parquet")
+    pd.DataFrame({"a": np.arange(10)}).to_parquet(parquet_path)
+    parquet_fingerprint = fingerprint(parquet_path)
+    pd.DataFrame({"a": np.arange(10) + 1}).to_parquet(parquet_path)
+    assert fingerprint(parquet_path) != parquet_fingerprint
+
+
+def _write_entry(cache_dir, key, sizes, last_access):
+    for suffix, size in sizes.items():
+        path = os.path.join(cache_dir, f"{key}.{suffix}")
+        if suffix.endswith(".parquet"):
+            # parquet entries can be directories
+            os.makedirs(path)
+            path = os.path.join(path, "part.0.parquet")
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        os.utime(path, (last_access, last_access))
+        os.utime(os.path.join(cache_dir, f"{key}.{suffix}"), (last_access, last_access))
+
+
+def test_cache_eviction(tmpdir):
+    cache_dir = str(tmpdir)
+    # keys are checksums, or uuids for in-memory datasets
+    a, b, c, d = "a" * 22, "b" * 22, "c" * 22, "d" * 32
+    _write_entry(cache_dir, a, {"meta.json": 10, "training.hdf5": 1000, "test.hdf5": 200}, last_access=1000)
+    _write_entry(cache_dir, b, {"meta.json": 10, "training.parquet": 500}, last_access=3000)
+    _write_entry(cache_dir, c, {"feature_meta.json": 10, "feature_data.hdf5": 300}, last_access=2000)
+    _write_entry(cache_dir, d, {"meta.json": 10, "training.hdf5": 100}, last_access=500)
+    # files that do not belong to the cache are never listed nor evicted, whatever their extension
+    _write_entry(cache_dir, "dataset", {"csv": 5000}, last_access=0)
+    _write_entry(cache_dir, "iris", {"training.csv": 5000, "test.csv": 5000, "meta.json": 10}, last_access=0)
+
+    manager = CacheManager(None, cache_dir, max_size="1K")
+    entries = manager.list_entries(cache_dir)
+    assert [entry["key"] for entry in entries] == [b, c, a, d]
+    assert [entry["size"] for entry in entries] == [510, 310, 1210, 110]
+
+    # only directories the cache wrote to as its cache_dir are evicted from
+    with pytest.raises(ValueError):
+        manager.evict(cache_dir)
+    with pytest.raises(ValueError):
+        cache_cli(["prune", cache_dir, "--max_size", "0"])
+    assert len(manager.list_entries(cache_dir)) == 4
+    mark_cache_directory(cache_dir)
+
+    # "d" is the least recently used, but is kept
+    evicted = manager.evict(cache_dir, keep=[os.path.join(cache_dir, f"{d}.meta.json")])
+    assert [entry["key"] for entry in evicted] == [a]
+    assert [entry["key"] for entry in manager.list_entries(cache_dir)] == [b, c, d]
+
+    assert CacheManager(None, cache_dir).evict(cache_dir) == []
+    cache_cli(["prune", cache_dir, "--max_size", "0"])
+    assert sorted(os.listdir(cache_dir)) == [
+        ".lock_preprocessing",
+        CACHE_DIR_MARKER,
+        "dataset.csv",
+        "iris.meta.json",
+        "iris.test.csv",
+        "iris.training.csv",
+    ]
+
+
+def test_cache_max_size_requires_cache_dir(tmpdir):
+    input_features = [number_feature()]
+    output_features = [category_feature(vocab_size=3)]
+    config = {"input_features": input_features, "output_features": output_features}
+    dataset = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=50)
+    neighbour = os.path.join(tmpdir, "dataset.training.csv")
+    Path(neighbour).write_text("a,b\n1,2\n")
+
+    # without a cache_dir, the processed data is written next to the dataset, and nothing is ever evicted from there
+    backend = LocalTestBackend(cache_max_size=1)
+    LudwigModel(config, backend=backend).preprocess(dataset, skip_save_processed_input=False)
+    assert backend.cache.max_size is None
+    assert os.path.exists(neighbour)
+    assert os.path.exists(os.path.join(tmpdir, "dataset.training.hdf5"))
+
+
+def test_cache_max_size(tmpdir):
+    input_features = [number_feature()]
+    output_features = [category_feature(vocab_size=3)]
+    config = {"input_features": input_features, "output_features": output_features}
+    cache_dir = os.path.join(tmpdir, "cache")
+
+    def preprocess(dataset_name):
+        dataset = generate_data(input_features, output_features, os.path.join(tmpdir, dataset_name), num_examples=50)
+        backend = LocalTestBackend(cache_dir=cache_dir, cache_max_size=1)
+        LudwigModel(config, backend=backend).preprocess(dataset, skip_save_processed_input=False)
+        return CacheManager(None, cache_dir).list_entries(cache_dir)
+
+    # the entry of the last preprocessed dataset survives, although it exceeds the max size
+    first_entries = preprocess("first.csv")
+    entries = preprocess("second.csv")
+    assert entries[0]["key"] not in {entry["key"] for entry in first_entries}
+    assert entries[0]["size"] > 1
+    assert len([entry for entry in entries if any(f.endswith(".meta.json") for f in entry["files"])]) == 1
+
+
+def test_parse_size():
+    assert parse_size(123) == 123
+    assert parse_size("10") == 10
+    assert parse_size("1.5K") == 1536
+    assert parse_size("20GB") == 20 * 1024**3
+    with pytest.raises(ValueError):
+        parse_size("ten gigabytes")
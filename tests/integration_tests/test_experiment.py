@@ -651,6 +651,19 @@ def test_experiment_various_feature_types(csv_filename):
     run_experiment(input_features, output_features, dataset=rel_path)
 
 
+@pytest.mark.parametrize("aggregation_function", ["sum", "avg"])
+def test_experiment_embedding_bag_encoders(aggregation_function, csv_filename):
+    input_features = [
+        set_feature(encoder="embedding_bag", aggregation_function=aggregation_function),
+        bag_feature(encoder="embedding_bag", aggregation_function=aggregation_function),
+    ]
+    output_features = [binary_feature()]
+
+    # Generate test data
+    rel_path = generate_data(input_features, output_features, csv_filename)
+    run_experiment(input_features, output_features, dataset=rel_path)
+
+
 def test_experiment_timeseries(csv_filename):
     input_features = [timeseries_feature()]
     output_features = [binary_feature()]
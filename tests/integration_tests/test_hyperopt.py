@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import json
 import logging
 import os.path
 
 import pytest
 import torch
 
+from ludwig.callbacks import Callback
 from ludwig.constants import ACCURACY, TRAINER
 from ludwig.hyperopt.execution import get_build_hyperopt_executor
 from ludwig.hyperopt.results import HyperoptResults
@@ -125,6 +127,128 @@ def test_hyperopt_executor_with_metric(csv_filename):
     )
 
 
+class NumThreadsCallback(Callback):
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def on_hyperopt_trial_start(self, parameters):
+        with open(os.path.join(self.output_dir, f"{os.getpid()}.json"), "w") as f:
+            json.dump({"num_threads": torch.get_num_threads()}, f)
+
+
+@pytest.mark.distributed
+def test_hyperopt_executor_parallel(csv_filename, tmpdir):
+    input_features = [category_feature(vocab_size=2, reduce_input="sum")]
+    output_features = [category_feature(vocab_size=2, reduce_input="sum")]
+
+    rel_path = generate_data(input_features, output_features, csv_filename)
+
+    config = merge_with_defaults(
+        {
+            "input_features": input_features,
+            "output_features": output_features,
+            TRAINER: {"epochs": 1},
+        }
+    )
+
+    parameters = {"trainer.learning_rate": {"type": "float", "low": 0.0001, "high": 0.1, "space": "log"}}
+    hyperopt_sampler = get_build_hyperopt_sampler("random")("minimize", parameters, num_samples=4)
+    hyperopt_executor = get_build_hyperopt_executor("parallel")(
+        hyperopt_sampler, "combined", "loss", "validation", num_workers=2, num_threads_per_trial=1
+    )
+
+    callbacks_dir = tmpdir.mkdir("callbacks")
+    hyperopt_results = hyperopt_executor.execute(
+        config,
+        dataset=rel_path,
+        output_directory=os.path.join(tmpdir, "results"),
+        callbacks=[NumThreadsCallback(str(callbacks_dir))],
+    )
+
+    assert len(hyperopt_results.ordered_trials) == 4
+    scores = [trial.metric_score for trial in hyperopt_results.ordered_trials]
+    assert scores == sorted(scores)
+
+    # trials ran in the worker processes, each limited to a single thread
+    worker_files = os.listdir(callbacks_dir)
+    assert 0 < len(worker_files) <= 2
+    for worker_file in worker_files:
+        with open(os.path.join(callbacks_dir, worker_file)) as f:
+            assert json.load(f)["num_threads"] == 1
+
+    # the memory-mapped copies of the preprocessed data are deleted
+    assert not any(fname.startswith("hyperopt_data_") for fname in os.listdir(os.path.join(tmpdir, "results")))
+
+
+class CountPreprocessingCallback(Callback):
+    def __init__(self):
+        self.num_preprocessing = 0
+
+    def on_hyperopt_preprocessing_start(self, experiment_name):
+        self.num_preprocessing += 1
+
+
+@pytest.mark.distributed
+@pytest.mark.parametrize("batch_size", [None, 1])
+def test_hyperopt_executor_shares_preprocessing(batch_size, csv_filename, tmpdir):
+    input_features = [category_feature(vocab_size=3, reduce_input="sum")]
+    output_features = [category_feature(vocab_size=2, reduce_input="sum")]
+
+    rel_path = generate_data(input_features, output_features, csv_filename)
+
+    config = merge_with_defaults(
+        {
+            "input_features": input_features,
+            "output_features": output_features,
+            TRAINER: {"epochs": 1},
+        }
+    )
+
+    parameters = {
+        "trainer.learning_rate": {"type": "category", "values": [0.001, 0.01]},
+        "preprocessing.category.most_common": {"type": "category", "values": [2, 10000]},
+    }
+    hyperopt_sampler = get_build_hyperopt_sampler("grid")("minimize", parameters)
+    if batch_size is not None:
+        # trials with the same preprocessing are sampled in consecutive batches
+        hyperopt_sampler.default_batch_size = batch_size
+    hyperopt_executor = get_build_hyperopt_executor("serial")(hyperopt_sampler, "combined", "loss", "validation")
+
+    callback = CountPreprocessingCallback()
+    hyperopt_results = hyperopt_executor.execute(
+        config, dataset=rel_path, output_directory=os.path.join(tmpdir, "results"), callbacks=[callback]
+    )
+
+    # the dataset is preprocessed once per value of the preprocessing parameter, not once per trial
+    assert len(hyperopt_results.ordered_trials) == 4
+    assert callback.num_preprocessing == 2
+
+
+class UnpicklableCallback(CountPreprocessingCallback):
+    def __init__(self):
+        super().__init__()
+        self.get_num_preprocessing = lambda: self.num_preprocessing
+
+
+@pytest.mark.distributed
+def test_hyperopt_executor_parallel_unpicklable_callbacks(csv_filename, tmpdir):
+    input_features = [category_feature(vocab_size=2, reduce_input="sum")]
+    output_features = [category_feature(vocab_size=2, reduce_input="sum")]
+    rel_path = generate_data(input_features, output_features, csv_filename)
+    config = merge_with_defaults({"input_features": input_features, "output_features": output_features})
+
+    parameters = {"trainer.learning_rate": {"type": "float", "low": 0.0001, "high": 0.1, "space": "log"}}
+    hyperopt_sampler = get_build_hyperopt_sampler("random")("minimize", parameters, num_samples=2)
+    hyperopt_executor = get_build_hyperopt_executor("parallel")(hyperopt_sampler, "combined", "loss", "validation")
+
+    callback = UnpicklableCallback()
+    with pytest.raises(ValueError, match="callbacks must be picklable"):
+        hyperopt_executor.execute(
+            config, dataset=rel_path, output_directory=os.path.join(tmpdir, "results"), callbacks=[callback]
+        )
+    assert callback.get_num_preprocessing() == 0
+
+
 @pytest.mark.distributed
 @pytest.mark.parametrize("samplers", SAMPLERS)
 def test_hyperopt_run_hyperopt(csv_filename, samplers):
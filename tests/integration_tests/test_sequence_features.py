@@ -1,7 +1,10 @@
 import contextlib
 import copy
+import json
 from io import StringIO
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 import pytest
 import torch
@@ -9,9 +12,10 @@ import torch
 from ludwig.api import LudwigModel
 from ludwig.constants import LOGITS
 from ludwig.data.dataset_synthesizer import build_synthetic_dataset
-from ludwig.data.preprocessing import preprocess_for_training
+from ludwig.data.preprocessing import build_dataset, preprocess_for_training
 from ludwig.features.feature_registries import update_config_with_metadata
-from tests.integration_tests.utils import generate_data, run_experiment, sequence_feature
+from ludwig.utils import strings_utils
+from tests.integration_tests.utils import generate_data, run_experiment, sequence_feature, text_feature
 
 #
 # this test is focused on testing input sequence features with all encoders
@@ -156,3 +160,26 @@ def test_sequence_generator(enc_encoder, enc_cell_type, dec_cell_type, csv_filen
 
     # run the experiment
     run_experiment(input_features, output_features, dataset=rel_path)
+
+
+def test_cache_token_ids(csv_filename):
+    input_features = [sequence_feature(min_len=1, max_len=20), text_feature(min_len=1, max_len=20)]
+    df = pd.read_csv(generate_data(input_features, [], csv_filename, num_examples=50))
+
+    proc_data = {}
+    for cache_token_ids in [False, True]:
+        features = copy.deepcopy(input_features)
+        for feature in features:
+            feature["preprocessing"] = {"cache_token_ids": cache_token_ids}
+        with mock.patch.object(
+            strings_utils.TokenIdCache, "iter_chunks", autospec=True, side_effect=strings_utils.TokenIdCache.iter_chunks
+        ) as iter_chunks:
+            proc_data[cache_token_ids], metadata = build_dataset(df.copy(), features, {}, metadata={})
+
+        # the sequence, text char and text word columns are built from their cached tokens
+        assert iter_chunks.call_count == (3 if cache_token_ids else 0)
+        # the cached tokens never end up in the saved metadata
+        json.dumps(metadata)
+
+    for column in proc_data[False].columns:
+        assert all(np.array_equal(a, b) for a, b in zip(proc_data[False][column], proc_data[True][column]))
@@ -12,20 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import asyncio
 import json
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
+import torch
 
 from ludwig.api import LudwigModel
 from ludwig.constants import TRAINER
-from ludwig.serve import ALL_FEATURES_PRESENT_ERROR, server
+from ludwig.serve import ALL_FEATURES_PRESENT_ERROR, RequestBatcher, server, TorchscriptPredictor
 from ludwig.utils.data_utils import read_csv
 from tests.integration_tests.utils import (
     audio_feature,
+    binary_feature,
     category_feature,
     generate_data,
     image_feature,
@@ -241,3 +246,264 @@ def test_server_integration_with_audio(single_record, tmpdir):
         model_output, _ = model.predict(dataset=data_df)
         model_output = model_output.to_dict("split")
         assert model_output == server_response
+
+
+def test_server_integration_with_batching(tmpdir):
+    input_features = [
+        text_feature(encoder="embed", min_len=1),
+        number_feature(normalization="zscore"),
+    ]
+    output_features = [category_feature(vocab_size=4), number_feature()]
+
+    rel_path = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=20)
+    model = train_and_predict_model(input_features, output_features, data_csv=rel_path, output_directory=tmpdir)
+
+    app = server(model, enable_batching=True, max_batch_size=8, max_batch_latency_ms=50)
+    data_df = read_csv(rel_path)
+    entries = [data_df.T.to_dict()[i] for i in range(len(data_df))]
+
+    with TestClient(app) as client:
+        response = client.post("/predict")
+        assert response.status_code == 400
+        assert response.json() == ALL_FEATURES_PRESENT_ERROR
+
+        with ThreadPoolExecutor(max_workers=len(entries)) as executor:
+            responses = list(
+                executor.map(lambda entry: client.post("/predict", data=convert_to_form(entry)[0]), entries)
+            )
+
+        metrics = client.get("/metrics").json()
+
+    assert all(response.status_code == 200 for response in responses)
+    model_output, _ = model.predict(dataset=entries, data_format=dict)
+    for expected, response in zip(model_output.to_dict("records"), responses):
+        response = response.json()
+        assert sorted(response.keys()) == sorted(output_keys_for(output_features))
+        for key, value in expected.items():
+            if isinstance(value, str):
+                assert value == response[key]
+            else:
+                assert np.allclose(value, response[key], atol=1e-5)
+
+    assert metrics["queue_depth"] == 0
+    assert metrics["num_requests"] == len(entries)
+    assert metrics["num_batches"] < len(entries)
+    assert max(int(size) for size in metrics["batch_sizes"]) <= 8
+
+
+def test_request_batcher_fails_only_malformed_requests():
+    predicted_batches = []
+
+    async def predict_fn(entries):
+        predicted_batches.append(len(entries))
+        if any("x" not in entry for entry in entries):
+            raise KeyError("x")
+        return [{"y": entry["x"] * 2} for entry in entries]
+
+    async def send_requests():
+        batcher = RequestBatcher(predict_fn, max_batch_size=4, max_batch_latency_ms=1000)
+        entries = [{"x": 1}, {"z": 2}, {"x": 3}, {"x": 4}]
+        results = await asyncio.gather(*(batcher.predict(entry) for entry in entries), return_exceptions=True)
+        return batcher, results
+
+    batcher, results = asyncio.run(send_requests())
+
+    assert results[0] == {"y": 2}
+    assert isinstance(results[1], KeyError)
+    assert results[2:] == [{"y": 6}, {"y": 8}]
+    # the batch failed, then each of its requests was predicted on its own
+    assert predicted_batches == [4, 1, 1, 1, 1]
+    assert batcher.queue_depth == 0
+    assert not batcher._tasks
+
+
+@pytest.mark.parametrize("worker_type", ["thread", "process"])
+def test_server_integration_with_worker_pool(worker_type, tmpdir):
+    input_features = [
+        text_feature(encoder="embed", min_len=1),
+        number_feature(normalization="zscore"),
+    ]
+    output_features = [category_feature(vocab_size=4), number_feature()]
+
+    rel_path = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=10)
+    model = train_and_predict_model(input_features, output_features, data_csv=rel_path, output_directory=tmpdir)
+    model_path = os.path.join(tmpdir, "saved_model")
+    model.save(model_path)
+
+    num_threads = torch.get_num_threads()
+    app = server(model, worker_type=worker_type, num_workers=2, intra_op_threads=1, model_path=model_path)
+    data_df = read_csv(rel_path)
+    entries = [data_df.T.to_dict()[i] for i in range(len(data_df))]
+
+    with TestClient(app) as client:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(
+                executor.map(lambda entry: client.post("/predict", data=convert_to_form(entry)[0]), entries)
+            )
+        batch_response = client.post("/batch_predict", files=convert_to_batch_form(data_df))
+
+    # the torch threads of this process are restored once the server shuts down
+    assert torch.get_num_threads() == num_threads
+
+    model_output, _ = model.predict(dataset=entries, data_format=dict)
+    for expected, response in zip(model_output.to_dict("records"), responses):
+        assert response.status_code == 200
+        response = response.json()
+        assert sorted(response.keys()) == sorted(output_keys_for(output_features))
+        for key, value in expected.items():
+            if isinstance(value, str):
+                assert value == response[key]
+            else:
+                assert np.allclose(value, response[key], atol=1e-5)
+
+    assert batch_response.status_code == 200
+    assert len(batch_response.json()["data"]) == len(data_df)
+
+
+def test_server_integration_with_torchscript(tmpdir):
+    input_features = [
+        binary_feature(),
+        number_feature(normalization="zscore"),
+        category_feature(vocab_size=3),
+    ]
+    output_features = [category_feature(vocab_size=4), number_feature(), binary_feature()]
+
+    rel_path = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=20)
+    model = train_and_predict_model(input_features, output_features, data_csv=rel_path, output_directory=tmpdir)
+
+    data_df = read_csv(rel_path)
+    entries = [data_df.T.to_dict()[i] for i in range(len(data_df))]
+
+    def collect_responses(app):
+        with TestClient(app) as client:
+            # warm up, as the first calls to a scripted module also optimize it
+            for entry in entries[:3]:
+                client.post("/predict", data=convert_to_form(entry)[0])
+            start = time.perf_counter()
+            responses = [client.post("/predict", data=convert_to_form(entry)[0]) for entry in entries]
+            latency_ms = (time.perf_counter() - start) * 1000 / len(entries)
+            batch_response = client.post("/batch_predict", files=convert_to_batch_form(data_df))
+        return responses, batch_response, latency_ms
+
+    pandas_responses, pandas_batch_response, pandas_latency_ms = collect_responses(server(model))
+    ts_responses, ts_batch_response, ts_latency_ms = collect_responses(server(model, torchscript=True))
+    logger.info(f"/predict latency: pandas {pandas_latency_ms:.2f}ms, torchscript {ts_latency_ms:.2f}ms")
+
+    def assert_outputs_match(expected, actual):
+        # the torchscript path only returns predictions and probabilities
+        assert set(actual.keys()) <= set(expected.keys())
+        for key, value in actual.items():
+            if isinstance(value, str) or isinstance(expected[key], str):
+                assert value == expected[key], key
+            else:
+                assert np.allclose(value, expected[key], atol=1e-5), key
+
+    for expected, actual in zip(pandas_responses, ts_responses):
+        assert actual.status_code == 200
+        assert_outputs_match(expected.json(), actual.json())
+
+    assert ts_batch_response.status_code == 200
+    expected_batch, actual_batch = pandas_batch_response.json(), ts_batch_response.json()
+    assert actual_batch["index"] == expected_batch["index"]
+    for expected_row, actual_row in zip(expected_batch["data"], actual_batch["data"]):
+        assert_outputs_match(
+            dict(zip(expected_batch["columns"], expected_row)), dict(zip(actual_batch["columns"], actual_row))
+        )
+
+    text_model = LudwigModel(
+        {"input_features": [text_feature()], "output_features": [number_feature()]}, backend=LocalTestBackend()
+    )
+    with pytest.raises(ValueError):
+        TorchscriptPredictor(text_model)
+
+
+async def post_body_chunks(app, path, chunks):
+    """Sends a request to `app` with its body split across one ASGI message per chunk, as real servers do.
+
+    The test client reads the whole request body into a single message, which hides bugs in reading request bodies
+    incrementally.
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/x-ndjson")],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    response_complete = asyncio.Event()
+    response = {"body": b""}
+
+    async def receive():
+        # yield to the other tasks of the app between messages, like a server waiting on the network
+        await asyncio.sleep(0.001)
+        if messages:
+            return messages.pop(0)
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status_code"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return response
+
+
+def test_server_integration_with_streaming(tmpdir):
+    input_features = [
+        text_feature(encoder="embed", min_len=1),
+        number_feature(normalization="zscore"),
+    ]
+    output_features = [category_feature(vocab_size=4), number_feature()]
+
+    rel_path = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=25)
+    model = train_and_predict_model(input_features, output_features, data_csv=rel_path, output_directory=tmpdir)
+
+    app = server(model, stream_chunk_size=4)
+    data_df = read_csv(rel_path)
+    entries = data_df.to_dict("records")
+
+    def ndjson_body():
+        # split lines across request body chunks to exercise the line buffering
+        body = "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    with TestClient(app) as client:
+        response = client.post("/batch_predict_stream", content=ndjson_body())
+        chunked_response = asyncio.run(post_body_chunks(app, "/batch_predict_stream", list(ndjson_body())))
+        missing_response = client.post("/batch_predict_stream", content=json.dumps({"foo": 1}) + "\n")
+        invalid_response = client.post("/batch_predict_stream", content="not json\n")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == len(entries)
+
+    model_output, _ = model.predict(dataset=entries, data_format=dict)
+    for expected, actual in zip(model_output.to_dict("records"), rows):
+        assert sorted(actual.keys()) == sorted(output_keys_for(output_features))
+        for key, value in expected.items():
+            if isinstance(value, str):
+                assert value == actual[key]
+            else:
+                assert np.allclose(value, actual[key], atol=1e-5)
+
+    assert chunked_response["status_code"] == 200
+    assert [json.loads(line) for line in chunked_response["body"].decode().splitlines()] == rows
+
+    assert missing_response.status_code == 400
+    assert missing_response.json() == ALL_FEATURES_PRESENT_ERROR
+    assert invalid_response.status_code == 400
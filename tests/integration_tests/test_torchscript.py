@@ -75,7 +75,9 @@ def test_torchscript(csv_filename, should_load_model):
             date_feature(),
             h3_feature(),
             set_feature(vocab_size=3),
+            set_feature(vocab_size=3, encoder="embedding_bag"),
             bag_feature(vocab_size=3),
+            bag_feature(vocab_size=3, encoder="embedding_bag"),
         ]
 
         output_features = [
@@ -2,9 +2,20 @@ import os
 import shutil
 import tempfile
 
+import numpy as np
+import pytest
+import torch
+
 from ludwig.api import LudwigModel
-from ludwig.constants import BATCH_SIZE, EVAL_BATCH_SIZE, LEARNING_RATE, TRAINER
-from tests.integration_tests.utils import category_feature, generate_data, LocalTestBackend, sequence_feature
+from ludwig.constants import BATCH_SIZE, EVAL_BATCH_SIZE, LEARNING_RATE, TRAINER, TRAINING
+from ludwig.models.ecd import ECD
+from tests.integration_tests.utils import (
+    category_feature,
+    generate_data,
+    LocalTestBackend,
+    number_feature,
+    sequence_feature,
+)
 
 
 def test_tune_batch_size_and_lr(tmpdir):
@@ -60,3 +71,90 @@ def test_tune_batch_size_and_lr(tmpdir):
 
         # loaded model should retain the tuned params
         check_postconditions(model)
+
+
+@pytest.mark.parametrize("mixed_precision", [None, "bf16", "fp16"])
+def test_mixed_precision(mixed_precision, tmpdir, monkeypatch):
+    input_features = [sequence_feature(reduce_output="sum"), number_feature()]
+    output_features = [category_feature(vocab_size=2, reduce_input="sum")]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "training.csv"))
+
+    config = {
+        "input_features": input_features,
+        "output_features": output_features,
+        TRAINER: {"epochs": 2, "mixed_precision": mixed_precision},
+    }
+
+    autocast_states = []
+    train_loss = ECD.train_loss
+
+    def record_autocast(self, *args, **kwargs):
+        autocast_states.append((torch.is_autocast_cpu_enabled(), torch.get_autocast_cpu_dtype()))
+        return train_loss(self, *args, **kwargs)
+
+    monkeypatch.setattr(ECD, "train_loss", record_autocast)
+
+    model = LudwigModel(config, backend=LocalTestBackend())
+    train_stats, _, _ = model.train(dataset=data_csv, output_directory=os.path.join(tmpdir, "output"))
+
+    assert autocast_states
+    if mixed_precision is None:
+        assert not any(enabled for enabled, _ in autocast_states)
+    else:
+        # fp16 falls back to bf16 without a CUDA device
+        assert all(enabled and dtype == torch.bfloat16 for enabled, dtype in autocast_states)
+    assert np.isfinite(train_stats[TRAINING]["combined"]["loss"]).all()
+
+    # parameters stay in full precision
+    assert all(param.dtype == torch.float32 for param in model.model.parameters())
+
+
+def test_mixed_precision_invalid(tmpdir):
+    input_features = [number_feature()]
+    output_features = [category_feature(vocab_size=2)]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "training.csv"))
+
+    config = {
+        "input_features": input_features,
+        "output_features": output_features,
+        TRAINER: {"epochs": 1, "mixed_precision": "fp8"},
+    }
+    model = LudwigModel(config, backend=LocalTestBackend())
+    with pytest.raises(ValueError):
+        model.train(dataset=data_csv, output_directory=os.path.join(tmpdir, "output"))
+
+
+def test_gradient_accumulation(tmpdir):
+    input_features = [number_feature(), number_feature()]
+    output_features = [category_feature(vocab_size=3)]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "training.csv"), num_examples=160)
+
+    def train(batch_size, gradient_accumulation_steps):
+        config = {
+            "input_features": input_features,
+            "output_features": output_features,
+            "combiner": {"type": "concat", "num_fc_layers": 1, "output_size": 8},
+            TRAINER: {
+                "epochs": 2,
+                "batch_size": batch_size,
+                "gradient_accumulation_steps": gradient_accumulation_steps,
+                "optimizer": {"type": "sgd"},
+                "learning_rate": 0.1,
+            },
+        }
+        model = LudwigModel(config, backend=LocalTestBackend())
+        model.train(
+            training_set=data_csv,
+            output_directory=os.path.join(tmpdir, f"output_{batch_size}_{gradient_accumulation_steps}"),
+            skip_save_processed_input=True,
+        )
+        return model
+
+    # two accumulated batches of 8 are one step on a batch of 16, including the learning rate warmup
+    model = train(16, 1)
+    accumulated_model = train(8, 2)
+    for param, accumulated_param in zip(model.model.parameters(), accumulated_model.model.parameters()):
+        assert torch.allclose(param, accumulated_param, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        train(8, 0)
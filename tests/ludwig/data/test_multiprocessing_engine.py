@@ -0,0 +1,136 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.api import LudwigModel
+from ludwig.backend import create_backend
+from ludwig.data.dataframe.pandas import _is_picklable, MultiprocessingEngine, PANDAS, PandasEngine
+from tests.integration_tests.utils import (
+    bag_feature,
+    category_feature,
+    date_feature,
+    generate_data,
+    h3_feature,
+    LocalTestBackend,
+    number_feature,
+    sequence_feature,
+    set_feature,
+    text_feature,
+    timeseries_feature,
+    vector_feature,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {"a": np.arange(1003), "b": [f"token_{i}" for i in range(1003)]},
+        index=np.random.RandomState(42).permutation(1003),
+    )
+
+
+def add_offset(x, offset):
+    return x + offset
+
+
+def split(series):
+    return series.str.split("_")
+
+
+def stack_row(row):
+    return np.array([row["a"], len(row["b"])])
+
+
+def get_pids(series):
+    return pd.Series([os.getpid()] * len(series), index=series.index)
+
+
+@pytest.fixture
+def engine():
+    engine = MultiprocessingEngine(parallelism=2, min_partition_size=10)
+    yield engine
+    engine.close()
+
+
+def test_multiprocessing_engine_matches_pandas(df, engine):
+    map_fn = functools.partial(add_offset, offset=7)
+    pd.testing.assert_series_equal(engine.map_objects(df["a"], map_fn), PANDAS.map_objects(df["a"], map_fn))
+
+    pd.testing.assert_series_equal(engine.map_partitions(df["b"], split), PANDAS.map_partitions(df["b"], split))
+
+    expected = PANDAS.apply_objects(df, stack_row)
+    actual = engine.apply_objects(df, stack_row)
+    assert actual.index.equals(expected.index)
+    assert all(np.array_equal(x, y) for x, y in zip(actual, expected))
+
+
+def test_multiprocessing_engine_partitions(df, engine):
+    pids = engine.map_partitions(df["a"], get_pids)
+    assert pids.index.equals(df.index)
+    assert os.getpid() not in set(pids)
+
+    # fewer rows than min_partition_size per worker are mapped in the calling process
+    assert set(engine.map_partitions(df["a"].iloc[:15], get_pids)) == {os.getpid()}
+
+    # functions that cannot be pickled to the workers too
+    pids = engine.map_partitions(df["a"], lambda series: get_pids(series))
+    assert set(pids) == {os.getpid()}
+
+
+def test_local_backend_processor():
+    assert create_backend("local").df_engine is PANDAS
+
+    backend = create_backend("local", processor={"type": "pandas"})
+    assert isinstance(backend.df_engine, PandasEngine)
+
+    backend = create_backend("local", processor={"type": "multiprocessing", "parallelism": 3})
+    assert isinstance(backend.df_engine, MultiprocessingEngine)
+    assert backend.df_engine.parallelism == 3
+
+    with pytest.raises(ValueError):
+        create_backend("local", processor={"type": "dask"})
+
+
+def test_preprocessing_maps_features_in_workers(tmpdir, monkeypatch):
+    input_features = [
+        number_feature(),
+        text_feature(),
+        sequence_feature(),
+        set_feature(),
+        bag_feature(),
+        vector_feature(),
+        h3_feature(),
+        date_feature(),
+        timeseries_feature(),
+    ]
+    output_features = [category_feature(vocab_size=3)]
+    data_csv = generate_data(input_features, output_features, os.path.join(tmpdir, "dataset.csv"), num_examples=100)
+    config = {"input_features": input_features, "output_features": output_features}
+
+    # the feature transforms are all sent to the workers, none of them is mapped serially for not being picklable
+    mapped_fns = []
+    serial_fns = []
+
+    def spy_is_picklable(obj):
+        mapped_fns.append(obj)
+        picklable = _is_picklable(obj)
+        if not picklable:
+            serial_fns.append(obj)
+        return picklable
+
+    monkeypatch.setattr("ludwig.data.dataframe.pandas._is_picklable", spy_is_picklable)
+
+    backend = LocalTestBackend(processor={"type": "multiprocessing", "parallelism": 2, "min_partition_size": 10})
+    try:
+        training_set, _, _, _ = LudwigModel(config, backend=backend).preprocess(dataset=data_csv)
+    finally:
+        backend.df_engine.close()
+    assert len(mapped_fns) >= len(input_features)
+    assert not serial_fns
+
+    expected_training_set, _, _, _ = LudwigModel(config, backend=LocalTestBackend()).preprocess(dataset=data_csv)
+    for proc_column, expected in expected_training_set.dataset.items():
+        np.testing.assert_array_equal(training_set.dataset[proc_column], expected)
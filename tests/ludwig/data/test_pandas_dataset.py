@@ -0,0 +1,90 @@
+import os
+import pickle
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from ludwig.constants import PREPROCESSING
+from ludwig.data.dataset.pandas import PandasDataset
+from ludwig.utils.data_utils import load_numpy_columns, save_numpy_columns
+
+
+def test_lazy_load_reuses_h5_handle(tmpdir):
+    h5_fp = os.path.join(tmpdir, "dataset.hdf5")
+    images = np.random.randint(0, 255, size=(20, 3, 4, 4), dtype=np.uint8)
+    with h5py.File(h5_fp, "w") as h5_file:
+        h5_file.create_dataset("image_data", data=images)
+
+    df = pd.DataFrame({"image": np.arange(20)[::-1]})
+    features = {"image": {PREPROCESSING: {"in_memory": False}}}
+    dataset = PandasDataset(df, features, h5_fp, hdf5_chunk_cache_size=1024 * 1024)
+
+    idx = np.array([3, 0, 7, 7, 12])
+    assert np.array_equal(dataset.get("image", idx), images[19 - idx])
+    h5_file = dataset._get_h5_file()
+    assert np.array_equal(dataset.get("image", slice(2, 6)), images[17:13:-1])
+    assert dataset._get_h5_file() is h5_file
+
+    # handles are not carried over to copies of the dataset in other processes
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert restored._h5_file is None
+    assert np.array_equal(restored.get("image", idx), images[19 - idx])
+
+
+def test_h5_file_closed_with_batchers(tmpdir):
+    h5_fp = os.path.join(tmpdir, "dataset.hdf5")
+    images = np.random.randint(0, 255, size=(10, 3, 4, 4), dtype=np.uint8)
+    with h5py.File(h5_fp, "w") as h5_file:
+        h5_file.create_dataset("image_data", data=images)
+
+    features = {"image": {PREPROCESSING: {"in_memory": False}}}
+    dataset = PandasDataset(pd.DataFrame({"image": np.arange(10)}), features, h5_fp)
+
+    with dataset.initialize_batcher(batch_size=4, should_shuffle=False) as batcher:
+        h5_file = dataset._get_h5_file()
+        # nested batchers, like evaluating the training set while training on it, keep the file open
+        with dataset.initialize_batcher(batch_size=4, should_shuffle=False) as eval_batcher:
+            assert np.array_equal(eval_batcher.next_batch()["image"], images[:4])
+        assert h5_file.id.valid
+        assert np.array_equal(batcher.next_batch()["image"], images[:4])
+    assert not h5_file.id.valid
+    assert dataset._h5_file is None
+
+    # the file is opened again when read after being closed
+    assert np.array_equal(dataset.get("image", [1, 2]), images[1:3])
+    h5_file = dataset._get_h5_file()
+    dataset.close()
+    assert not h5_file.id.valid
+
+
+def test_pickle_memory_mapped_columns(tmpdir):
+    data_dir = os.path.join(tmpdir, "dataset.training.npy")
+    df = pd.DataFrame({"a": np.arange(10000), "b": [np.full(3, i, dtype=np.float32) for i in range(10000)]})
+    save_numpy_columns(data_dir, df)
+    dataset = PandasDataset(load_numpy_columns(data_dir), {"a": {}, "b": {}}, None)
+
+    # memory-mapped columns are pickled as references to their files rather than copies of their content
+    serialized = pickle.dumps(dataset)
+    assert len(serialized) < df["a"].values.nbytes
+    restored = pickle.loads(serialized)
+    for column in ["a", "b"]:
+        assert isinstance(restored.dataset[column], np.memmap)
+        assert np.array_equal(restored.get(column), dataset.get(column))
+
+
+def test_to_memory_mapped(tmpdir):
+    ragged = np.empty(10000, dtype=object)
+    ragged[:] = [[i] * (i % 3) for i in range(10000)]
+    dataset = PandasDataset({"a": np.arange(10000), "b": ragged}, {"a": {}, "b": {}}, None)
+
+    mapped = dataset.to_memory_mapped(os.path.join(tmpdir, "mapped"))
+    assert isinstance(mapped.dataset["a"], np.memmap)
+    # columns of Python objects are kept in memory, as they cannot be memory-mapped
+    assert mapped.dataset["b"] is dataset.dataset["b"]
+    assert np.array_equal(mapped.get("a"), dataset.get("a"))
+    assert len(pickle.dumps(mapped)) < len(pickle.dumps(dataset)) - dataset.dataset["a"].nbytes // 2
+
+    # datasets that are already memory-mapped are not written again
+    assert mapped.to_memory_mapped(os.path.join(tmpdir, "remapped")) is mapped
+    assert not os.path.exists(os.path.join(tmpdir, "remapped"))
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.data.dataset.pandas import PandasDataset
+from ludwig.data.sampler import DistributedSampler
+
+
+class FakeHorovod:
+    def __init__(self, size, rank):
+        self._size = size
+        self._rank = rank
+
+    def size(self):
+        return self._size
+
+    def rank(self):
+        return self._rank
+
+
+def _concat_batches(batches, dataset_size):
+    return np.concatenate([np.arange(dataset_size)[b] for b in batches])
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("num_replicas", [1, 3])
+@pytest.mark.parametrize("batch_size", [1, 4, 7, 100])
+def test_iter_batches_matches_iter(shuffle, num_replicas, batch_size):
+    dataset_size = 23
+    for rank in range(num_replicas):
+        horovod = FakeHorovod(num_replicas, rank) if num_replicas > 1 else None
+        sampler = DistributedSampler(dataset_size, shuffle=shuffle, seed=42, horovod=horovod)
+        sampler.set_epoch(2)
+
+        batches = list(sampler.iter_batches(batch_size))
+        assert len(batches) == int(np.ceil(len(sampler) / batch_size))
+        assert all(len(np.arange(dataset_size)[b]) <= batch_size for b in batches)
+        assert _concat_batches(batches, dataset_size).tolist() == list(sampler)
+
+
+def test_iter_batches_unshuffled_slices():
+    sampler = DistributedSampler(10, shuffle=False)
+    batches = list(sampler.iter_batches(4))
+    assert batches == [slice(0, 4, 1), slice(4, 8, 1), slice(8, 10, 1)]
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("ignore_last", [True, False])
+def test_random_access_batcher(shuffle, ignore_last):
+    df = pd.DataFrame({"a": np.arange(50), "b": [np.full(3, i, dtype=np.float32) for i in range(50)]})
+    dataset = PandasDataset(df, {"a": {}, "b": {}}, None)
+
+    with dataset.initialize_batcher(batch_size=8, should_shuffle=shuffle, ignore_last=ignore_last) as batcher:
+        for epoch in range(2):
+            batcher.set_epoch(epoch, 8)
+            seen = []
+            while not batcher.last_batch():
+                batch = batcher.next_batch()
+                assert np.all(batch["b"][:, 0] == batch["a"])
+                seen.extend(batch["a"].tolist())
+
+            if ignore_last:
+                assert len(seen) == 48
+            else:
+                assert sorted(seen) == list(range(50))
+
+
+@pytest.mark.parametrize("prefetch_batches", [1, 3])
+def test_random_access_batcher_prefetch(prefetch_batches):
+    df = pd.DataFrame({"a": np.arange(50), "b": [np.full(3, i, dtype=np.float32) for i in range(50)]})
+    dataset = PandasDataset(df, {"a": {}, "b": {}}, None)
+
+    def collect_epoch(batcher, epoch, batch_size):
+        batcher.set_epoch(epoch, batch_size)
+        batches = []
+        while not batcher.last_batch():
+            batches.append(batcher.next_batch())
+        return batches
+
+    with dataset.initialize_batcher(batch_size=8, should_shuffle=True) as batcher:
+        expected = [collect_epoch(batcher, epoch, 8 * (epoch + 1)) for epoch in range(3)]
+
+    with dataset.initialize_batcher(batch_size=8, should_shuffle=True, prefetch_batches=prefetch_batches) as batcher:
+        # an epoch is interrupted halfway to check that stale prefetched batches are discarded
+        batcher.next_batch()
+        actual = [collect_epoch(batcher, epoch, 8 * (epoch + 1)) for epoch in range(3)]
+        assert batcher.executor is not None
+    assert batcher.executor is None
+
+    for expected_epoch, actual_epoch in zip(expected, actual):
+        assert len(expected_epoch) == len(actual_epoch)
+        for expected_batch, actual_batch in zip(expected_epoch, actual_epoch):
+            for key in expected_batch:
+                assert np.array_equal(expected_batch[key], actual_batch[key])
+
+
+def test_random_access_batcher_pins_only_when_prefetching():
+    df = pd.DataFrame({"a": np.arange(10)})
+    dataset = PandasDataset(df, {"a": {}}, None)
+
+    with dataset.initialize_batcher(batch_size=4, pin_memory=True) as batcher:
+        assert not batcher.pin_memory
+    with dataset.initialize_batcher(batch_size=4, pin_memory=True, prefetch_batches=2) as batcher:
+        assert batcher.pin_memory
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.constants import SPLIT
+from ludwig.data.preprocessing import get_split
+
+
+def test_get_split_random():
+    df = pd.DataFrame({"a": np.arange(100000)}, index=np.arange(100000) * 3)
+    split = get_split(df, split_probabilities=(0.7, 0.1, 0.2), random_seed=42)
+
+    assert split.dtype == np.int8
+    assert split.index.equals(df.index)
+    assert np.allclose(np.bincount(split) / len(df), [0.7, 0.1, 0.2], atol=0.01)
+    assert split.equals(get_split(df, split_probabilities=(0.7, 0.1, 0.2), random_seed=42))
+    assert not split.equals(get_split(df, split_probabilities=(0.7, 0.1, 0.2), random_seed=43))
+
+
+@pytest.mark.parametrize("index", [None, "shuffled"])
+def test_get_split_stratified(index):
+    rs = np.random.RandomState(0)
+    df = pd.DataFrame({"label": rs.choice(["a", "b", "c"], 10000, p=[0.9, 0.09, 0.01])})
+    if index == "shuffled":
+        df.index = rs.permutation(len(df)) + 100
+    split = get_split(df, split_probabilities=(0.6, 0.2, 0.2), stratify="label", random_seed=42)
+
+    assert split.index.equals(df.index)
+    for _, group in split.groupby(df["label"]):
+        # every class is divided in the requested proportions up to rounding
+        counts = np.bincount(group, minlength=3)
+        assert np.all(np.abs(counts - len(group) * np.array([0.6, 0.2, 0.2])) <= 1)
+
+
+def test_get_split_existing_column():
+    df = pd.DataFrame({"a": np.arange(10), SPLIT: [0, 1, 2, 0, 0, 1, 2, 0, 0, 0]})
+    assert get_split(df).equals(df[SPLIT])
+    assert not get_split(df, force_split=True, random_seed=1).equals(df[SPLIT])
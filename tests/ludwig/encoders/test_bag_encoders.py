@@ -3,7 +3,7 @@ from typing import List
 import pytest
 import torch
 
-from ludwig.encoders.bag_encoders import BagEmbedWeightedEncoder
+from ludwig.encoders.bag_encoders import BagEmbedBagEncoder, BagEmbedWeightedEncoder
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -20,3 +20,19 @@ def test_set_encoder(vocab: List[str], embedding_size: int, representation: str)
     inputs = torch.randint(0, 9, size=(2, len(vocab))).to(DEVICE)
     outputs = bag_encoder(inputs)
     assert outputs.shape[1:] == bag_encoder.output_shape
+
+
+@pytest.mark.parametrize("vocab", [["a", "b", "c", "d", "e", "f", "g", "h"]])
+@pytest.mark.parametrize("embedding_size", [10])
+@pytest.mark.parametrize("representation", ["dense", "sparse"])
+def test_bag_embed_bag_encoder(vocab: List[str], embedding_size: int, representation: str):
+    bag_encoder = BagEmbedBagEncoder(
+        vocab=vocab,
+        representation=representation,
+        embedding_size=embedding_size,
+        max_set_size=5,
+    ).to(DEVICE)
+    # bags are stored as their indices repeated by frequency, padded with -1
+    inputs = torch.tensor([[1, 3, 3, -1, -1], [0, 2, 4, 6, 7], [-1, -1, -1, -1, -1]], dtype=torch.int32).to(DEVICE)
+    outputs = bag_encoder(inputs)
+    assert outputs.shape[1:] == bag_encoder.output_shape
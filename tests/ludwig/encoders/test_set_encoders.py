@@ -3,7 +3,7 @@ from typing import List
 import pytest
 import torch
 
-from ludwig.encoders.set_encoders import SetSparseEncoder
+from ludwig.encoders.set_encoders import SetEmbedBagEncoder, SetSparseEncoder
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -16,3 +16,16 @@ def test_set_encoder(vocab: List[str], embedding_size: int, representation: str)
     inputs = torch.randint(0, 2, size=(2, len(vocab))).bool().to(DEVICE)
     outputs = set_encoder(inputs)
     assert outputs.shape[1:] == set_encoder.output_shape
+
+
+@pytest.mark.parametrize("vocab", [["a", "b", "c", "d", "e", "f", "g", "h"]])
+@pytest.mark.parametrize("embedding_size", [10])
+@pytest.mark.parametrize("representation", ["dense", "sparse"])
+def test_set_embed_bag_encoder(vocab: List[str], embedding_size: int, representation: str):
+    set_encoder = SetEmbedBagEncoder(
+        vocab=vocab, representation=representation, embedding_size=embedding_size, max_set_size=3
+    ).to(DEVICE)
+    # sets are stored as their distinct indices, padded with -1
+    inputs = torch.tensor([[0, 3, 5], [2, -1, -1], [-1, -1, -1]], dtype=torch.int32).to(DEVICE)
+    outputs = set_encoder(inputs)
+    assert outputs.shape[1:] == set_encoder.output_shape
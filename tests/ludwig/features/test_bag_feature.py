@@ -9,7 +9,6 @@ from ludwig.features.bag_feature import BagInputFeature
 
 BATCH_SIZE = 2
 SEQ_SIZE = 20
-BAG_W_SIZE = 256
 EMBEDDING_SIZE = 5
 
 CHARS = ascii_uppercase + ascii_lowercase + digits
@@ -33,6 +32,7 @@ def bag_config():
 def test_bag_input_feature(bag_config: Dict, encoder: str) -> None:
     bag_config.update({"encoder": encoder})
     bag_input_feature = BagInputFeature(bag_config).to(DEVICE)
-    bag_tensor = torch.randn([BATCH_SIZE, SEQ_SIZE, BAG_W_SIZE], dtype=torch.float32).to(DEVICE)
+    # bags are lists of vocab indices, repeated as many times as they occur and padded with -1
+    bag_tensor = torch.randint(-1, len(VOCAB), [BATCH_SIZE, SEQ_SIZE], dtype=torch.int32).to(DEVICE)
     encoder_output = bag_input_feature(bag_tensor)
-    assert encoder_output["encoder_output"].shape[1:][1:] == bag_input_feature.output_shape
+    assert encoder_output["encoder_output"].shape == (BATCH_SIZE, *bag_input_feature.output_shape)
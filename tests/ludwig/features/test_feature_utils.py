@@ -1,5 +1,8 @@
+import numpy as np
+import pandas as pd
 import torch
 
+from ludwig.backend import LOCAL_BACKEND
 from ludwig.features import feature_utils
 
 
@@ -23,3 +26,14 @@ def test_ludwig_feature_dict():
 
     assert len(feature_dict) == 3
     assert [key for key in feature_dict] == ["to", "type", "1"]
+
+
+def test_pad_index_lists():
+    column = pd.Series([np.array([3, 1], dtype=np.int32), np.array([], dtype=np.int32), np.array([2, 2, 5])])
+    padded = feature_utils.pad_index_lists(column, LOCAL_BACKEND)
+    assert np.array_equal(np.stack(padded), [[3, 1, -1], [-1, -1, -1], [2, 2, 5]])
+    assert all(row.dtype == np.int32 for row in padded)
+
+    # empty index lists still take one slot per row
+    padded = feature_utils.pad_index_lists(pd.Series([np.array([], dtype=np.int32)]), LOCAL_BACKEND)
+    assert np.array_equal(np.stack(padded), [[-1]])
@@ -1,10 +1,18 @@
+import os
 from copy import deepcopy
 from typing import Dict
 
+import h5py
+import numpy as np
+import pandas as pd
 import pytest
 import torch
 
-from ludwig.features.image_feature import ImageInputFeature
+from ludwig.backend import LocalBackend
+from ludwig.constants import CHECKSUM, NAME, PREPROCESSING, PROC_COLUMN, SRC
+from ludwig.data.dataframe.tensor import TensorArray
+from ludwig.features import image_feature
+from ludwig.features.image_feature import ImageFeatureMixin, ImageInputFeature
 from ludwig.models.ecd import build_single_input
 
 BATCH_SIZE = 2
@@ -99,3 +107,74 @@ def test_image_input_feature(image_config: Dict, encoder: str, height: int, widt
     #         raise RuntimeError(
     #             f'no parameter update for {a[0]}'
     #         )
+
+
+@pytest.mark.parametrize("num_processes", [1, 2])
+def test_image_preprocessing_hdf5_slabs(tmpdir, monkeypatch, num_processes):
+    # small slabs so that the images are written in several blocks, the last one partial
+    monkeypatch.setattr(image_feature, "IMAGE_HDF5_SLAB_BYTES", 3 * 3 * 12 * 12)
+    images = [torch.randint(0, 255, (3, 12, 12), dtype=torch.uint8) for _ in range(10)]
+
+    feature_config = {NAME: "image", "column": "image", PROC_COLUMN: "image_proc"}
+    preprocessing_parameters = {
+        **ImageFeatureMixin.preprocessing_defaults(),
+        "in_memory": False,
+        "num_processes": num_processes,
+        "height": 12,
+        "width": 12,
+        "num_channels": 3,
+    }
+    metadata = {SRC: None, CHECKSUM: "images", "image": {PREPROCESSING: {}}}
+    backend = LocalBackend(cache_dir=str(tmpdir))
+
+    proc_df = ImageFeatureMixin.add_feature_data(
+        feature_config, pd.DataFrame({"image": images}), {}, metadata, preprocessing_parameters, backend, False
+    )
+
+    assert np.array_equal(proc_df["image_proc"], np.arange(10))
+    with h5py.File(os.path.join(tmpdir, "images.training.hdf5"), "r") as h5_file:
+        assert np.array_equal(h5_file["image_proc_data"][:], torch.stack(images).numpy())
+
+
+@pytest.mark.parametrize("num_processes", [1, 2])
+def test_image_preprocessing_in_memory(num_processes):
+    images = [torch.randint(0, 255, (3, 12, 12), dtype=torch.uint8) for _ in range(10)]
+
+    feature_config = {NAME: "image", "column": "image", PROC_COLUMN: "image_proc"}
+    preprocessing_parameters = {
+        **ImageFeatureMixin.preprocessing_defaults(),
+        "in_memory": True,
+        "num_processes": num_processes,
+        "height": 12,
+        "width": 12,
+        "num_channels": 3,
+    }
+    metadata = {"image": {PREPROCESSING: {}}}
+
+    proc_df = ImageFeatureMixin.add_feature_data(
+        feature_config, pd.DataFrame({"image": images}), {}, metadata, preprocessing_parameters, LocalBackend(), False
+    )
+
+    processed = proc_df["image_proc"]
+    assert len(processed) == 10
+    assert all(image.dtype == np.uint8 for image in processed)
+    assert np.array_equal(np.stack(processed), torch.stack(images).numpy())
+    if num_processes > 1:
+        assert isinstance(processed.array, TensorArray)
+        assert np.array_equal(processed.array.to_tensor(), torch.stack(images).numpy())
+
+
+def _read_every_third_image_as_missing(i):
+    return None if i % 3 == 0 else np.full((1, 2, 2), i, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("num_processes", [1, 3])
+def test_read_images_into_array(num_processes):
+    default_image = np.full((1, 2, 2), 128, dtype=np.uint8)
+    images = image_feature._read_images_into_array(
+        _read_every_third_image_as_missing, list(range(20)), num_processes, default_image
+    )
+
+    assert images.shape == (20, 1, 2, 2)
+    expected = [128 if i % 3 == 0 else i for i in range(20)]
+    assert images[:, 0, 0, 0].tolist() == expected
@@ -53,8 +53,8 @@ def test_set_input_feature(
     # ensure no exceptions raised during build
     input_feature_obj = build_single_input(set_def, None).to(DEVICE)
 
-    # check one forward pass through input feature
-    input_tensor = torch.randint(0, 2, size=(BATCH_SIZE, len(set_def["vocab"])), dtype=torch.int64).to(DEVICE)
+    # check one forward pass through input feature, sets are lists of vocab indices padded with -1
+    input_tensor = torch.tensor([[0, 2, -1], [1, -1, -1]], dtype=torch.int32).to(DEVICE)
 
     encoder_output = input_feature_obj(input_tensor)
     assert encoder_output["encoder_output"].shape == (BATCH_SIZE, *input_feature_obj.output_shape)
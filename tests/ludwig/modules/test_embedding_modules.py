@@ -3,7 +3,14 @@ from typing import List
 import pytest
 import torch
 
-from ludwig.modules.embedding_modules import Embed, EmbedSequence, EmbedSet, EmbedWeighted, TokenAndPositionEmbedding
+from ludwig.modules.embedding_modules import (
+    Embed,
+    EmbedBag,
+    EmbedSequence,
+    EmbedSet,
+    EmbedWeighted,
+    TokenAndPositionEmbedding,
+)
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -58,6 +65,40 @@ def test_embed_weighted(
     assert outputs.shape[1:] == embed_weighted.output_shape
 
 
+@pytest.mark.parametrize("vocab", [["a", "b", "c", "d", "e", "f", "g", "h"]])
+@pytest.mark.parametrize("embedding_size", [5, 10])
+@pytest.mark.parametrize("representation", ["dense", "sparse"])
+@pytest.mark.parametrize("aggregation_function", ["sum", "avg"])
+def test_embed_bag(
+    vocab: List[str],
+    embedding_size: int,
+    representation: str,
+    aggregation_function: str,
+):
+    embed_bag = EmbedBag(
+        vocab=vocab,
+        embedding_size=embedding_size,
+        representation=representation,
+        aggregation_function=aggregation_function,
+        max_set_size=4,
+    ).to(DEVICE)
+    inputs = torch.tensor([[1, 3, 3, -1], [-1, -1, -1, -1]], dtype=torch.int32).to(DEVICE)
+    outputs = embed_bag(inputs)
+    assert outputs.shape[1:] == embed_bag.output_shape
+
+    if representation == "sparse":
+        weight = torch.eye(len(vocab), device=outputs.device)
+    else:
+        weight = embed_bag.embeddings.weight
+    if aggregation_function == "sum":
+        expected = weight[1] + 2 * weight[3]
+    else:
+        expected = (weight[1] + 2 * weight[3]) / 3
+    assert torch.allclose(outputs[0], expected)
+    # empty sets are embedded as zeros
+    assert torch.all(outputs[1] == 0)
+
+
 @pytest.mark.parametrize("vocab", [["a", "b", "c"]])
 @pytest.mark.parametrize("embedding_size", [2])
 @pytest.mark.parametrize("representation", ["dense", "sparse"])
@@ -94,3 +135,40 @@ def test_token_and_position_embedding(
     inputs = torch.randint(0, 2, size=(2, 10)).to(DEVICE)
     outputs = embed(inputs)
     assert outputs.shape[1:] == embed.output_shape
+
+
+def test_sparse_representation_is_one_hot():
+    # large enough that a vocab_size x vocab_size identity matrix would take 160GB
+    vocab = [str(i) for i in range(200000)]
+    embed = Embed(vocab=vocab, embedding_size=10, representation="sparse")
+    assert embed.embedding_size == len(vocab)
+    assert sum(p.numel() for p in embed.parameters()) == 0
+    outputs = embed(torch.tensor([[3], [0]]))
+    assert outputs.shape == (2, len(vocab))
+    assert outputs[0, 3] == 1 and outputs[1, 0] == 1
+    assert outputs.sum() == 2
+
+    vocab = ["a", "b", "c", "d"]
+    embed_sequence = EmbedSequence(vocab=vocab, embedding_size=2, max_sequence_length=3, representation="sparse")
+    inputs = torch.tensor([[1, 2, 0]])
+    assert torch.equal(embed_sequence(inputs), torch.eye(len(vocab))[inputs])
+
+    embed_set = EmbedSet(vocab=vocab, embedding_size=2, representation="sparse")
+    inputs = torch.tensor([[True, True, False, True]])
+    # the 0th embedding is masked out
+    assert torch.equal(embed_set(inputs), torch.tensor([[0.0, 1.0, 0.0, 1.0]]))
+
+    embed_weighted = EmbedWeighted(vocab=vocab, embedding_size=2, representation="sparse")
+    inputs = torch.tensor([[1.0, 2.0, 0.0, 3.0]])
+    assert torch.equal(embed_weighted(inputs), inputs)
+
+
+def test_sparse_representation_loads_legacy_state_dict():
+    vocab = ["a", "b", "c", "d"]
+    embed_sequence = EmbedSequence(vocab=vocab, embedding_size=2, max_sequence_length=3, representation="sparse")
+    # sparse embeddings used to be stored as the identity weight of an nn.Embedding
+    legacy_state_dict = {**embed_sequence.state_dict(), "embeddings.weight": torch.eye(len(vocab))}
+    embed_sequence.load_state_dict(legacy_state_dict)
+
+    inputs = torch.tensor([[1, 2, 0]])
+    assert torch.equal(embed_sequence(inputs), torch.eye(len(vocab))[inputs])
@@ -12,9 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+
+import h5py
+import numpy as np
 import pandas as pd
 
-from ludwig.utils.data_utils import add_sequence_feature_column, get_abs_path
+from ludwig.data.dataframe.tensor import TensorArray
+from ludwig.utils.data_utils import (
+    add_sequence_feature_column,
+    get_abs_path,
+    load_numpy_columns,
+    read_hdf5_rows,
+    save_numpy_columns,
+    to_numpy_dataset,
+)
 
 
 def test_add_sequence_feature_column():
@@ -57,3 +69,55 @@ def test_add_sequence_feature_column():
 def test_get_abs_path():
     assert get_abs_path("a", "b.jpg") == "a/b.jpg"
     assert get_abs_path(None, "b.jpg") == "b.jpg"
+
+
+def test_read_hdf5_rows(tmpdir):
+    data = np.arange(40, dtype=np.uint8).reshape(10, 2, 2)
+    with h5py.File(os.path.join(tmpdir, "data.h5"), "w") as h5_file:
+        h5_file.create_dataset("data", data=data, chunks=(3, 2, 2))
+
+    with h5py.File(os.path.join(tmpdir, "data.h5"), "r") as h5_file:
+        for idx in [[0, 1, 2], [7, 2, 3, 9, 1], [4, 4, 0, 9, 9], [5], []]:
+            assert np.array_equal(read_hdf5_rows(h5_file["data"], idx), data[idx])
+
+
+def test_save_load_numpy_columns(tmpdir):
+    df = pd.DataFrame(
+        {
+            "a": np.arange(10),
+            "b": [np.full((2, 3), i, dtype=np.float32) for i in range(10)],
+            "c": np.arange(10) % 2 == 0,
+        }
+    )
+    data_dir = os.path.join(tmpdir, "dataset.training.npy")
+    save_numpy_columns(data_dir, df)
+
+    numpy_dataset = load_numpy_columns(data_dir)
+    assert list(numpy_dataset) == ["a", "b", "c"]
+    for column in df.columns:
+        assert isinstance(numpy_dataset[column], np.memmap)
+        assert np.array_equal(numpy_dataset[column], np.stack(df[column]))
+    assert numpy_dataset["b"].shape == (10, 2, 3)
+
+    in_memory_dataset = load_numpy_columns(data_dir, mmap_mode=None)
+    assert not isinstance(in_memory_dataset["b"], np.memmap)
+    assert np.array_equal(in_memory_dataset["b"], numpy_dataset["b"])
+
+
+def test_to_numpy_dataset_tensor_column():
+    images = np.arange(5 * 2 * 3, dtype=np.uint8).reshape(5, 2, 3)
+    df = pd.DataFrame({"image": pd.Series(TensorArray(images)), "number": np.arange(5)})
+    assert [image.shape for image in df["image"]] == [(2, 3)] * 5
+
+    # the column is backed by the array itself, handed over without a copy
+    numpy_dataset = to_numpy_dataset(df)
+    assert numpy_dataset["image"] is images
+    assert np.array_equal(numpy_dataset["number"], np.arange(5))
+
+    # rows left after dropping and splitting keep the column backed by a single array
+    df["split"] = [0, 1, 0, 2, 0]
+    subset = df.dropna()
+    subset = subset[subset["split"] == 0].reset_index()
+    assert isinstance(subset["image"].array, TensorArray)
+    assert np.array_equal(to_numpy_dataset(subset)["image"], images[[0, 2, 4]])
+    assert np.array_equal(to_numpy_dataset(df.iloc[[3, 0, 4]])["image"], images[[3, 0, 4]])
@@ -1,9 +1,17 @@
+import itertools
+import logging
+import time
+from collections import Counter
+
 import numpy as np
 import pandas as pd
 import pytest
 
 from ludwig.features.text_feature import TextFeatureMixin
 from ludwig.utils import strings_utils
+from ludwig.utils.tokenizers import tokenizer_registry
+
+logger = logging.getLogger(__name__)
 
 
 def test_is_numerical():
@@ -153,3 +161,84 @@ def test_build_sequence_matrix():
     assert not (
         sequence_matrix.tolist() - np.array([[1, 4, 5, 6, 0, 2, 2, 2, 2, 2], [1, 6, 5, 4, 0, 2, 2, 2, 2, 2]])
     ).any()
+
+
+def _build_sequence_matrix_rowwise(sequences, inverse_vocabulary, tokenizer_type, length_limit, padding="right"):
+    # reference implementation that encodes and pads one sequence at a time
+    tokenizer = tokenizer_registry[tokenizer_type]()
+    rows = []
+    for sequence in sequences:
+        ids = [inverse_vocabulary.get(token, inverse_vocabulary["<UNK>"]) for token in tokenizer(sequence.lower())]
+        ids = [inverse_vocabulary["<SOS>"]] + ids + [inverse_vocabulary["<EOS>"]]
+        ids = ids[:length_limit]
+        pad = [inverse_vocabulary["<PAD>"]] * (length_limit - len(ids))
+        rows.append(ids + pad if padding == "right" else pad + ids)
+    return np.array(rows)
+
+
+def _random_sequences(num_sequences, vocab, max_tokens, seed=0):
+    rs = np.random.RandomState(seed)
+    return pd.Series(
+        [" ".join(rs.choice(vocab, size=rs.randint(0, max_tokens + 1))) for _ in range(num_sequences)], dtype=object
+    )
+
+
+@pytest.mark.parametrize("padding", ["right", "left"])
+@pytest.mark.parametrize("tokenizer_type", ["space", "characters"])
+def test_build_sequence_matrix_matches_rowwise(padding, tokenizer_type):
+    vocab = ["a", "b", "c", "dd", "Ee", "zz"]
+    inverse_vocabulary = {"<EOS>": 0, "<SOS>": 1, "<PAD>": 2, "<UNK>": 3, "a": 4, "b": 5, "c": 6, "dd": 7, "ee": 8}
+    # includes empty sequences, unknown tokens and sequences longer than the limit
+    sequences = _random_sequences(200, vocab, max_tokens=12)
+    sequences.index = np.arange(100, 300)
+
+    sequence_matrix = strings_utils.build_sequence_matrix(
+        sequences, inverse_vocabulary, tokenizer_type=tokenizer_type, length_limit=10, padding=padding, chunk_size=7
+    )
+
+    assert sequence_matrix.index.equals(sequences.index)
+    expected = _build_sequence_matrix_rowwise(sequences, inverse_vocabulary, tokenizer_type, 10, padding=padding)
+    assert np.array_equal(np.stack(sequence_matrix.values), expected)
+
+
+def test_build_sequence_matrix_benchmark():
+    vocab = [f"word{i}" for i in range(1000)]
+    inverse_vocabulary = {"<EOS>": 0, "<SOS>": 1, "<PAD>": 2, "<UNK>": 3}
+    inverse_vocabulary.update({word: i + 4 for i, word in enumerate(vocab[:900])})
+    sequences = _random_sequences(20000, vocab, max_tokens=40)
+
+    start = time.perf_counter()
+    strings_utils.build_sequence_matrix(sequences, inverse_vocabulary, tokenizer_type="space", length_limit=32)
+    vectorized_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _build_sequence_matrix_rowwise(sequences, inverse_vocabulary, "space", 32)
+    rowwise_s = time.perf_counter() - start
+
+    logger.info(f"build_sequence_matrix on {len(sequences)} sequences: {vectorized_s:.3f}s (row-wise {rowwise_s:.3f}s)")
+
+
+@pytest.mark.parametrize("tokenizer_type", ["space", "characters"])
+def test_create_vocabulary_chunked(tokenizer_type):
+    sequences = _random_sequences(101, ["a", "b", "c", "dd", "Ee", "zz"], max_tokens=12)
+    expected_counts = Counter(itertools.chain.from_iterable(map(tokenizer_registry[tokenizer_type](), sequences)))
+
+    for token_cache in [None, strings_utils.TokenIdCache()]:
+        vocab, str2idx, str2freq, max_length, _, _, _ = strings_utils.create_vocabulary(
+            sequences, tokenizer_type, lowercase=False, chunk_size=10, token_cache=token_cache
+        )
+        assert {unit: str2freq[unit] for unit in expected_counts} == dict(expected_counts)
+        assert max_length == max(len(tokenizer_registry[tokenizer_type]()(s)) for s in sequences)
+
+    # the cached tokens give the same matrix as tokenizing again
+    sequence_matrix = strings_utils.build_sequence_matrix(
+        sequences, str2idx, tokenizer_type=tokenizer_type, length_limit=10, lowercase=False
+    )
+    cached_sequence_matrix = strings_utils.build_sequence_matrix(
+        sequences, str2idx, tokenizer_type=tokenizer_type, length_limit=10, lowercase=False, token_cache=token_cache
+    )
+    assert np.array_equal(np.stack(sequence_matrix.values), np.stack(cached_sequence_matrix.values))
+
+    # the cache is not used for other data
+    assert not token_cache.matches(sequences.iloc[1:], tokenizer_type, False)
+    assert not token_cache.matches(sequences, tokenizer_type, True)
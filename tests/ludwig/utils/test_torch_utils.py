@@ -9,6 +9,7 @@ import torch
 from ludwig.utils.torch_utils import (
     _get_torch_init_params,
     _set_torch_init_params,
+    index_lists_to_dense,
     initialize_pytorch,
     sequence_length_2D,
     sequence_length_3D,
@@ -31,6 +32,12 @@ def test_sequence_length_3D(input_sequence: List[List[List[int]]], expected_outp
     assert torch.equal(expected_output, output_seq_length)
 
 
+def test_index_lists_to_dense():
+    indices = torch.tensor([[2, 0, 2, -1], [-1, -1, -1, -1], [3, 1, -1, -1]], dtype=torch.int32)
+    expected_output = torch.tensor([[1, 0, 2, 0], [0, 0, 0, 0], [0, 1, 0, 1]], dtype=torch.float32)
+    assert torch.equal(index_lists_to_dense(indices, 4), expected_output)
+
+
 @contextlib.contextmanager
 def clean_params():
     prev = _get_torch_init_params()